@@ -0,0 +1,44 @@
+# --- LLM answer validation for the interviewer ---
+# Fallback for answers the local fast path (fast_validators) cannot decide.
+# Verdicts are cached per normalized (field, answer, options) in validation_cache.
+import llm_gateway
+import metrics
+from validation_cache import get_cache as get_validation_cache, make_key as make_cache_key, match_option
+
+
+# --- GPT Validator ---
+@metrics.timed("validate_answer")
+def validate_answer(question_text, user_input, options, field=None):
+    # An answer that is one of the offered options needs no model round trip
+    if match_option(user_input, options):
+        return "✅"
+
+    cache = get_validation_cache()
+    cache_key = make_cache_key(field or question_text, user_input, options)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    prompt = f"""
+You are a helpful EA assistant conducting an interview.
+Question: '{question_text}'
+User's answer: '{user_input}'
+Examples (if needed): {', '.join(options) if options else 'N/A'}
+
+Rules:
+- If the answer is asking for help (e.g., "give me examples", "what are the options", "can you clarify"), return: ❌EXAMPLE
+- If the user asks for help, give example values.
+- If unclear, say "I didn't understand" and give examples.
+- If valid, reply ONLY with: ✅
+"""
+    metrics.inc("validate_answer_llm_calls")
+    try:
+        verdict = llm_gateway.chat(
+            "gpt-3.5-turbo",
+            [{"role": "system", "content": prompt}],
+            temperature=0
+        ).strip()
+        cache.put(cache_key, verdict)
+        return verdict
+    except Exception as e:
+        return f"⚠️ GPT error: {e}"
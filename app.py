@@ -1,14 +1,11 @@
 # streamlit_app_title: Stakeholders Interviewer
 import streamlit as st
-from openai import OpenAI
-import time
-import os
 import json
-from datetime import datetime
-import os
-from openai import OpenAI
-# --- Replace with your OpenAI API key ---
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from interview_persistence import new_token, save_interview
+from fast_validators import FastValidator
+import metrics
+from answer_validation import validate_answer
+from questions import example_phrases, questions_for_role
 
 # --- Known Users Mapping ---
 known_users = {
@@ -20,52 +17,12 @@ known_users = {
     "khalaf": "Business Owner"
 }
 
-# --- Interview Questions per Role ---
-questions_app_owner = [
-    {"field": "application_name", "question": "What is the Application Name?", "options": []},
-    {"field": "category_type", "question": "What is the Application Category Type?", "options": ["Core System", "Supporting System", "Integration Layer", "BI/Reporting Tool", "Mobile App", "External Portal"]},
-    {"field": "line_of_business", "question": "Which Line of Business does it support?", "options": []},
-    {"field": "status", "question": "What is the current Application Status?", "options": ["Active", "Under Development", "Retired", "On Hold"]},
-    {"field": "technology", "question": "What is the Technology Stack (e.g., Java, .NET, Node.js, Python)?", "options": []},
-     # 🔽 Integration questions added here
-    {"field": "integrations", "question": "Let’s collect integration details for this application. Please use the form below to add integrations.", "type": "custom"}
-]
-
-questions_business_owner = [
-    {"field": "business_domain", "question": "What is your business domain or department?", "options": []},
-    {"field": "capabilities", "question": "List the key business capabilities in your domain.", "options": []},
-    {"field": "pain_points", "question": "What are the main pain points in current operations?", "options": []},
-    {"field": "kpis", "question": "What KPIs or performance metrics do you use to evaluate success?", "options": []},
-    {"field": "critical_systems", "question": "Which systems or applications are critical to your operations?", "options": []}
-]
-example_phrases = [
-    "give me example", "give me examples", "can you give me example", "can you give me examples",
-    "what are the options", "what are examples", "examples please", "show me example", "i need example"
-]
-
-# --- GPT Validator ---
-def validate_answer(question_text, user_input, options):
-    prompt = f"""
-You are a helpful EA assistant conducting an interview.
-Question: '{question_text}'
-User's answer: '{user_input}'
-Examples (if needed): {', '.join(options) if options else 'N/A'}
-
-Rules:
-- If the answer is asking for help (e.g., "give me examples", "what are the options", "can you clarify"), return: ❌EXAMPLE
-- If the user asks for help, give example values.
-- If unclear, say "I didn't understand" and give examples.
-- If valid, reply ONLY with: ✅
-"""
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "system", "content": prompt}],
-            temperature=0
-        )
-        return response.choices[0].message.content.strip()
-    except Exception as e:
-        return f"⚠️ GPT error: {e}"
+# --- Local fast-path validator (shared across sessions) ---
+@st.cache_resource
+def get_fast_validator():
+    validator = FastValidator(example_phrases)
+    metrics.register_collector(validator.collect)
+    return validator
 
 # --- Init Session State ---
 if "role_selected" not in st.session_state:
@@ -95,6 +52,9 @@ st.markdown(
     """,
     unsafe_allow_html=True
 )
+fast_stats = get_fast_validator().stats()
+st.sidebar.caption(f"⚡ Answers checked locally: {fast_stats['calls_avoided']} LLM call(s) avoided, {fast_stats['escalated']} escalated")
+
 if st.button("📁 EA Deliverables Builder"):
     st.switch_page("pages/Builder.py")
 
@@ -140,7 +100,7 @@ if not st.session_state.role_selected:
     st.stop()
 
 # --- Load question set ---
-question_set = questions_app_owner if st.session_state.role == "Application Owner" else questions_business_owner
+question_set = questions_for_role(st.session_state.role)
 
 # --- Show chat history ---
 for msg in st.session_state.messages:
@@ -163,19 +123,18 @@ if st.session_state.question_index < len(question_set):
         st.chat_message("user").markdown(user_input)
         st.session_state.messages.append({"role": "user", "content": user_input})
 
-        user_input_clean = user_input.strip().lower()
-        if any(phrase in user_input_clean for phrase in example_phrases):
-            feedback = "❌EXAMPLE"
-        else:
-            feedback = validate_answer(current_q["question"], user_input, current_q["options"])
+        # Rule-based checks first; only ambiguous answers reach the model
+        feedback, answer_value = get_fast_validator().check(current_q, user_input)
+        if feedback is None:
+            feedback = validate_answer(current_q["question"], user_input, current_q.get("options", []), current_q["field"])
 
         if feedback.strip() == "✅":
-            st.session_state.answers[current_q["field"]] = user_input
+            st.session_state.answers[current_q["field"]] = answer_value
             st.session_state.question_index += 1
             st.session_state.just_advanced = True
 
         elif feedback.strip() == "❌EXAMPLE":
-            msg = f"Examples: {', '.join(current_q['options']) if current_q['options'] else 'No predefined examples.'}"
+            msg = f"Examples: {', '.join(current_q['options']) if current_q.get('options') else 'No predefined examples.'}"
             st.chat_message("assistant").markdown(msg)
             st.session_state.messages.append({"role": "assistant", "content": msg})
             st.chat_message("assistant").markdown("Please provide your answer again or type 'skip' to move on.")
@@ -250,30 +209,19 @@ if st.session_state.question_index >= len(question_set):
     st.chat_message("assistant").markdown("```json\n" + json.dumps(st.session_state.answers, indent=2) + "\n```")
 
     try:
-        os.makedirs("catalogues", exist_ok=True)
-
-        role_prefix = st.session_state.role.replace(" ", "")
-        name = st.session_state.answers.get("application_name") or st.session_state.answers.get("business_domain") or "entity"
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        safe_name = name.replace(" ", "_").replace("/", "_").replace("\\", "_")
-        filename = f"{role_prefix}_{safe_name}_{timestamp}.json"
-        filepath = os.path.join("catalogues", filename)
-
-
         export_data = st.session_state.answers.copy()
         export_data["stakeholder_role"] = st.session_state.role
 
-        with open(filepath, "w", encoding="utf-8") as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
- 
-
-        st.chat_message("assistant").markdown(f"✅ Interview responses saved to: `{filepath}`")
+        # One token per interview: reruns after completion return the first save
+        token = st.session_state.setdefault("interview_token", new_token())
+        receipt = save_interview(export_data, token)
+        st.chat_message("assistant").markdown(f"✅ Interview responses saved to: `{receipt['location']}`")
 
     except Exception as e:
         st.chat_message("assistant").markdown(f"❌ Error saving file: `{str(e)}`")
 
     if st.button("🔄 Restart"):
-        for key in ["messages", "answers", "question_index", "role", "role_selected", "just_advanced", "user_name", "show_welcome"]:
+        for key in ["messages", "answers", "question_index", "role", "role_selected", "just_advanced", "user_name", "show_welcome", "interview_token"]:
             st.session_state.pop(key, None)
         st.rerun()
 
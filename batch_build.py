@@ -0,0 +1,206 @@
+# --- Batch "build all deliverables" pipeline ---
+# Loads the catalogue once and produces the whole EA pack in one pass: the local
+# deliverables (catalogues, integration matrix, both ARM heatmaps) are built in
+# parallel from the shared snapshot, while the GPT deliverables (gap analysis and,
+# optionally, GPT-written catalogues) run concurrently through the LLM gateway.
+# The result is one multi-sheet workbook plus the heatmap images.
+#
+#     python batch_build.py --out ea_pack            # local deliverables + gap analysis
+#     python batch_build.py --out ea_pack --no-llm   # fully offline
+import io
+import os
+import sys
+import json
+import zipfile
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import metrics
+from catalogue_store import load_catalogue
+from settings import CATALOGUE_DIR
+
+LOCAL_DELIVERABLES = ["Application Catalogue", "Business Catalogue", "Integration Matrix", "App Heatmap", "Business Heatmap"]
+GPT_DELIVERABLES = {
+    "Gap Analysis": "⚠️ Build Gap Analysis",
+    "Application Catalogue (GPT)": "📘 Build Application Catalogue",
+    "Business Catalogue (GPT)": "📘 Build Business Catalogue",
+}
+
+
+def _application_catalogue(catalogue):
+    from catalogue_builders import build_application_catalogue
+    return {"sheet": build_application_catalogue(catalogue.app_data)}
+
+
+def _business_catalogue(catalogue):
+    from catalogue_builders import build_business_catalogue
+    return {"sheet": build_business_catalogue(catalogue.biz_data)}
+
+
+def _integration_matrix(catalogue):
+    from catalogue_builders import build_integration_matrix, integration_rows
+    return {"sheet": build_integration_matrix(integration_rows(catalogue.app_data))}
+
+
+def _heatmap(frame, rows, columns, title, xlabel, ylabel, figsize=None):
+    from capability_pipeline import count_matrix
+    from heatmaps import is_large, reduce_matrix, render_png
+
+    if frame.empty:
+        return {"sheet": frame}
+    matrix = count_matrix(frame, rows, columns)
+    view = reduce_matrix(matrix, "Top N")[0] if is_large(matrix) else matrix
+    # The full matrix goes into the workbook; the image shows the readable top-N view
+    return {"sheet": matrix.reset_index(), "image": render_png(view, title, xlabel, ylabel, figsize=figsize)}
+
+
+def _app_heatmap(catalogue):
+    from capability_pipeline import application_frame
+    return _heatmap(
+        application_frame(catalogue.app_data), "Line of Business", "Category",
+        "Application Heatmap by LOB vs Category", "Application Category", "Line of Business", figsize=(10, 6),
+    )
+
+
+def _business_heatmap(catalogue):
+    from capability_pipeline import capability_frame
+    return _heatmap(
+        capability_frame(catalogue.biz_files, catalogue.biz_data), "Line of Business", "Capability",
+        "Business Capability Coverage Heatmap", "Capability", "Line of Business",
+    )
+
+
+LOCAL_BUILDERS = {
+    "Application Catalogue": _application_catalogue,
+    "Business Catalogue": _business_catalogue,
+    "Integration Matrix": _integration_matrix,
+    "App Heatmap": _app_heatmap,
+    "Business Heatmap": _business_heatmap,
+}
+
+
+def _gpt_deliverable(catalogue, action, force):
+    import pandas as pd
+    from deliverable_jobs import DELIVERABLE_PROMPTS, generate
+
+    source, prompt = DELIVERABLE_PROMPTS[action]
+    input_data = catalogue.biz_data if source == "business" else catalogue.app_data
+    result = generate(action, prompt, input_data, wants_table=True, force=force)
+    table = result["table"]
+    sheet = pd.DataFrame(table["data"], columns=table["columns"]) if table else None
+    return {"sheet": sheet, "markdown": result["output"], "from_cache": result["from_cache"]}
+
+
+def build_all(catalogue=None, include_llm=True, gpt_catalogues=False, force=False, max_workers=4, on_progress=None):
+    """Build every deliverable from one catalogue snapshot.
+
+    Returns {"sheets": {name: DataFrame}, "images": {name: png}, "markdown": {name: str},
+    "errors": {name: str}, "interviews": int}.
+    """
+    catalogue = catalogue or load_catalogue(CATALOGUE_DIR)
+    tasks = {name: (builder, ()) for name, builder in LOCAL_BUILDERS.items()}
+    if include_llm:
+        for name, action in GPT_DELIVERABLES.items():
+            if name == "Gap Analysis" or gpt_catalogues:
+                tasks[name] = (_gpt_deliverable, (action, force))
+
+    result = {"sheets": {}, "images": {}, "markdown": {}, "errors": {}, "interviews": len(catalogue.all_data)}
+    done = 0
+    # Local and GPT tasks share the pool; GPT calls mostly wait on the gateway
+    with metrics.timer("batch_build"), ThreadPoolExecutor(max_workers=max(1, max_workers)) as pool:
+        futures = {pool.submit(builder, catalogue, *args): name for name, (builder, args) in tasks.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                output = future.result()
+            except Exception as e:
+                result["errors"][name] = str(e)
+            else:
+                if output.get("sheet") is not None:
+                    result["sheets"][name] = output["sheet"]
+                if output.get("image"):
+                    result["images"][name] = output["image"]
+                if output.get("markdown"):
+                    result["markdown"][name] = output["markdown"]
+            done += 1
+            if on_progress:
+                on_progress(done, len(tasks), name)
+    return result
+
+
+def contents_sheet(result):
+    import pandas as pd
+
+    rows = [{"Deliverable": name, "Rows": len(df), "Status": "✅"} for name, df in result["sheets"].items()]
+    rows += [{"Deliverable": name, "Rows": 0, "Status": f"❌ {error}"} for name, error in result["errors"].items()]
+    return pd.DataFrame(rows, columns=["Deliverable", "Rows", "Status"])
+
+
+def ordered_sheets(result):
+    sheets = {"Contents": contents_sheet(result)}
+    order = LOCAL_DELIVERABLES + list(GPT_DELIVERABLES)
+    for name in sorted(result["sheets"], key=lambda n: order.index(n) if n in order else len(order)):
+        sheets[name] = result["sheets"][name]
+    return sheets
+
+
+def _file_name(name, extension):
+    return name.replace(" ", "_").replace("(", "").replace(")", "") + extension
+
+
+def write_pack(result, out_dir):
+    """Write EA_Pack.xlsx, one PNG per heatmap and the GPT markdown to `out_dir`; returns the paths."""
+    from exports import write_excel
+
+    os.makedirs(out_dir, exist_ok=True)
+    paths = [os.path.join(out_dir, "EA_Pack.xlsx")]
+    write_excel(ordered_sheets(result), paths[0])
+    for name, png in result["images"].items():
+        paths.append(os.path.join(out_dir, _file_name(name, ".png")))
+        with open(paths[-1], "wb") as f:
+            f.write(png)
+    for name, text in result["markdown"].items():
+        paths.append(os.path.join(out_dir, _file_name(name, ".md")))
+        with open(paths[-1], "w", encoding="utf-8") as f:
+            f.write(text)
+    return paths
+
+
+def pack_zip(result):
+    """The same pack as one in-memory zip, for a single Streamlit download."""
+    import tempfile
+
+    buffer = io.BytesIO()
+    with tempfile.TemporaryDirectory(prefix="ea_pack_") as folder:
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+            for path in write_pack(result, folder):
+                archive.write(path, os.path.basename(path))
+    return buffer.getvalue()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build every EA deliverable in one pass")
+    parser.add_argument("--folder", default=CATALOGUE_DIR, help="interview catalogue folder")
+    parser.add_argument("--out", default=f"ea_pack_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
+    parser.add_argument("--no-llm", action="store_true", help="skip the GPT deliverables")
+    parser.add_argument("--gpt-catalogues", action="store_true", help="also let GPT write both catalogues")
+    parser.add_argument("--force", action="store_true", help="ignore cached GPT results")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    catalogue = load_catalogue(args.folder)
+    for f, err in catalogue.errors.items():
+        print(f"⚠️ Could not load {f}: {err}")
+    print(f"📂 Building EA pack from {len(catalogue.all_data)} interview(s)...")
+    result = build_all(
+        catalogue, include_llm=not args.no_llm, gpt_catalogues=args.gpt_catalogues, force=args.force,
+        max_workers=args.workers, on_progress=lambda done, total, name: print(f"  [{done}/{total}] {name}"),
+    )
+    paths = write_pack(result, args.out)
+    print(json.dumps({"written": paths, "errors": result["errors"]}, indent=2, ensure_ascii=False))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
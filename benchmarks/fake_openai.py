@@ -0,0 +1,111 @@
+# --- Local stand-in for the OpenAI chat completions API ---
+# A tiny threaded HTTP server answering POST /v1/chat/completions (plain and
+# streamed) after a configurable latency, with configurable token usage. Point
+# the app at it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+#
+#     python -m benchmarks.fake_openai --port 8099 --latency 0.8
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def default_reply(body):
+    """Pick a plausible answer shape from the prompt so every call site can parse it."""
+    text = " ".join(str(m.get("content", "")) for m in body.get("messages", []))
+    if "reply ONLY with: ✅" in text:
+        return "✅"
+    if "Return only a JSON object" in text:
+        scores = {area: 70 for area in [
+            "TOGAF Compliance", "NORA Alignment", "Business-IT Alignment",
+            "Digital Maturity", "Technical Debt", "Completeness",
+        ]}
+        scores["Justification"] = "- Stub assessment bullet"
+        return json.dumps(scores)
+    return "| App Name | Business Line |\n|---|---|\n| Stub App | Stub LOB |\n"
+
+
+class StubConfig:
+    def __init__(self, latency=0.2, prompt_tokens=None, completion_tokens=20, reply=default_reply):
+        self.latency = latency
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.reply = reply
+        self.calls = 0
+        self.lock = threading.Lock()
+
+
+def make_handler(config):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self.send_error(404)
+                return
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+            with config.lock:
+                config.calls += 1
+            time.sleep(config.latency)
+
+            content = config.reply(body)
+            prompt_tokens = config.prompt_tokens
+            if prompt_tokens is None:
+                prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // 4
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": config.completion_tokens,
+                "total_tokens": prompt_tokens + config.completion_tokens,
+            }
+            base = {"id": "chatcmpl-stub", "created": int(time.time()), "model": body.get("model", "stub")}
+
+            if body.get("stream"):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                pieces = [content[i:i + 8] for i in range(0, len(content), 8)] or [""]
+                for piece in pieces:
+                    chunk = {**base, "object": "chat.completion.chunk",
+                             "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                final = {**base, "object": "chat.completion.chunk", "choices": [], "usage": usage}
+                self.wfile.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode("utf-8"))
+                return
+
+            payload = json.dumps({
+                **base,
+                "object": "chat.completion",
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content}, "finish_reason": "stop"}],
+                "usage": usage,
+            }).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+def start_server(config=None, host="127.0.0.1", port=0):
+    """Start the stub in a daemon thread; returns (base_url, server, config)."""
+    config = config or StubConfig()
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://{host}:{server.server_address[1]}/v1", server, config
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local OpenAI chat completions stub")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds per call")
+    parser.add_argument("--completion-tokens", type=int, default=20)
+    args = parser.parse_args()
+    url, server, _ = start_server(StubConfig(args.latency, completion_tokens=args.completion_tokens), port=args.port)
+    print(f"Stub OpenAI API listening on {url} (set OPENAI_BASE_URL to use it)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,209 @@
+# --- Benchmark / load-test harness ---
+# Generates synthetic catalogues of several sizes, points the LLM gateway at the
+# local OpenAI stub, and times the hot paths: catalogue loading (cold + warm),
+# heatmap frames, integration matrix / graph building and validate_answer
+# throughput. Results are written as JSON; pass --baseline to flag regressions.
+#
+#     python -m benchmarks.run --sizes 10,1000,10000 --latency 0.05
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import statistics
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+
+def timed(func, repeat=3):
+    samples = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        samples.append(time.perf_counter() - started)
+    return {"min_s": min(samples), "median_s": statistics.median(samples), "runs": repeat}, result
+
+
+def bench_size(size, workdir, args, report):
+    from benchmarks.synthetic import generate
+    from catalogue_store import CatalogueStore
+
+    folder = os.path.join(workdir, f"catalogues_{size}")
+    generate(folder, size)
+    results = {}
+
+    def cold_load():
+        return CatalogueStore(folder).refresh()
+
+    results["catalogue_load_cold"], snapshot = timed(cold_load, args.repeat)
+    store = CatalogueStore(folder)
+    store.refresh()
+    results["catalogue_refresh_warm"], _ = timed(store.refresh, args.repeat)
+
+    from integration_graph import IntegrationGraph
+    records = dict(zip(snapshot.app_files, snapshot.app_data))
+    results["integration_graph_build"], graph = timed(lambda: _graph(IntegrationGraph, records), args.repeat)
+    if graph.nodes():
+        first = graph.nodes()[0]
+        results["integration_graph_impact_query"], _ = timed(lambda: graph.downstream(first), args.repeat)
+
+    try:
+        import pandas  # noqa: F401
+    except ImportError:
+        report["skipped"].append(f"size {size}: heatmap / matrix benchmarks need pandas")
+    else:
+        import capability_pipeline
+        from catalogue_builders import build_integration_matrix, integration_rows
+
+        def app_heatmap():
+            capability_pipeline._cache.clear()
+            frame = capability_pipeline.application_frame(snapshot.app_data)
+            return capability_pipeline.count_matrix(frame, "Line of Business", "Category")
+
+        def business_heatmap():
+            capability_pipeline._cache.clear()
+            frame = capability_pipeline.capability_frame(snapshot.biz_files, snapshot.biz_data)
+            return capability_pipeline.count_matrix(frame, "Line of Business", "Capability")
+
+        results["app_heatmap_matrix"], _ = timed(app_heatmap, args.repeat)
+        results["business_heatmap_matrix"], matrix = timed(business_heatmap, args.repeat)
+        results["integration_matrix"], _ = timed(lambda: build_integration_matrix(integration_rows(snapshot.app_data)), args.repeat)
+
+        try:
+            import heatmaps
+            heatmaps._png_cache.clear()
+            results["business_heatmap_render"], _ = timed(lambda: heatmaps.render_png(heatmaps.reduce_matrix(matrix)[0]), 1)
+        except ImportError as e:
+            report["skipped"].append(f"size {size}: heatmap rendering needs {e.name}")
+
+    return results
+
+
+def _graph(graph_class, records):
+    graph = graph_class()
+    graph.sync(records)
+    return graph
+
+
+def bench_validation(args, report):
+    from fast_validators import FastValidator
+    from questions import questions_app_owner, example_phrases
+
+    answers = ["Active", "actve", "Java", "Core System", "live", "give me examples", "XYZ CRM", "??", "in-house stuff"]
+    pairs = [(q, a) for q in questions_app_owner if q.get("type") != "custom" for a in answers]
+    results = {}
+
+    fast = FastValidator(example_phrases)
+    started = time.perf_counter()
+    for _ in range(args.validation_rounds):
+        for q, a in pairs:
+            fast.check(q, a)
+    elapsed = time.perf_counter() - started
+    results["fast_path"] = {
+        "answers": len(pairs) * args.validation_rounds,
+        "answers_per_s": len(pairs) * args.validation_rounds / elapsed,
+        **fast.stats(),
+    }
+
+    try:
+        import openai  # noqa: F401
+    except ImportError:
+        report["skipped"].append("validate_answer throughput needs the openai package")
+        return results
+
+    from benchmarks.fake_openai import StubConfig, start_server
+    import llm_gateway
+    from answer_validation import validate_answer
+    from validation_cache import get_cache
+
+    url, server, config = start_server(StubConfig(latency=args.latency))
+    os.environ["OPENAI_BASE_URL"] = url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    llm_gateway._gateway = None
+    try:
+        get_cache().clear()
+        for label in ("validate_answer_cold_cache", "validate_answer_warm_cache"):
+            calls_before = config.calls
+            started = time.perf_counter()
+            for q, a in pairs:
+                validate_answer(q["question"], a, q.get("options", []), q["field"])
+            elapsed = time.perf_counter() - started
+            results[label] = {
+                "answers": len(pairs),
+                "answers_per_s": len(pairs) / elapsed,
+                "llm_calls": config.calls - calls_before,
+            }
+        results["validation_cache"] = get_cache().stats()
+        results["gateway"] = llm_gateway.get_gateway().metrics()
+    finally:
+        server.shutdown()
+    return results
+
+
+def compare(current, baseline, tolerance):
+    regressions = []
+    for size, benches in current["sizes"].items():
+        for name, values in benches.items():
+            old = baseline.get("sizes", {}).get(size, {}).get(name)
+            if old and old.get("median_s") and values["median_s"] > old["median_s"] * (1 + tolerance):
+                regressions.append(f"size {size} {name}: {old['median_s']:.4f}s -> {values['median_s']:.4f}s")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EA builder performance benchmarks")
+    parser.add_argument("--sizes", default="10,100,1000", help="comma-separated catalogue sizes")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.05, help="stub LLM latency in seconds")
+    parser.add_argument("--validation-rounds", type=int, default=200)
+    parser.add_argument("--out", default=RESULTS_DIR)
+    parser.add_argument("--baseline", help="previous report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix="ea_bench_")
+    # Keep caches/indexes of the run away from the real ones; settings reads these at import
+    os.environ["EA_CACHE_DIR"] = os.path.join(workdir, "cache")
+    os.environ["EA_CATALOGUE_DIR"] = os.path.join(workdir, "catalogues")
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": vars(args),
+        "sizes": {},
+        "skipped": [],
+    }
+    try:
+        for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+            print(f"⏱️  Benchmarking {size} interview(s)...")
+            report["sizes"][str(size)] = bench_size(size, workdir, args, report)
+        print("⏱️  Benchmarking answer validation...")
+        report["validation"] = bench_validation(args, report)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    for target in (path, os.path.join(args.out, "latest.json")):
+        with open(target, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    print(f"✅ Report written to {path}")
+    for line in report["skipped"]:
+        print(f"⚠️ Skipped: {line}")
+    for line in report.get("regressions", []):
+        print(f"❌ Regression: {line}")
+    return 1 if report.get("regressions") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
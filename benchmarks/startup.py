@@ -0,0 +1,136 @@
+# --- Startup timing report ---
+# Imports each page's module set in a fresh interpreter and records how long it
+# took and which heavy dependencies (pandas, matplotlib, seaborn, openai,
+# xlsxwriter, ...) ended up loaded. The interview chat should not pull in any of
+# them either, and the Builder/Governance pages only import pandas inside the
+# functions that build a table, heatmap or export.
+#
+#     python -m benchmarks.startup --repeat 5
+import os
+import ast
+import sys
+import glob
+import json
+import platform
+import argparse
+import statistics
+import subprocess
+from datetime import datetime
+
+from benchmarks.run import RESULTS_DIR
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HEAVY_MODULES = ["pandas", "numpy", "matplotlib", "seaborn", "altair", "openai", "xlsxwriter", "pyarrow", "tiktoken"]
+
+def _module_imports(tree):
+    """Names imported on every load, skipping imports deferred into functions or branches."""
+    pending = list(tree.body)
+    while pending:
+        node = pending.pop(0)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda, ast.If, ast.For, ast.While)):
+            continue
+        if isinstance(node, ast.Import):
+            yield from (alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            yield node.module
+        else:
+            pending.extend(ast.iter_child_nodes(node))
+
+
+def page_modules(path):
+    """Top-level modules a page imports at load time, its own third-party imports included
+    (Streamlit itself is measured separately)."""
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    modules = []
+    for name in _module_imports(tree):
+        root = name.split(".")[0]
+        if root not in modules and root != "streamlit":
+            modules.append(root)
+    return modules
+
+
+def discover_pages():
+    """{page: modules} for app.py and pages/*.py, read from their imports so the list never goes stale."""
+    pages = {"app": page_modules(os.path.join(ROOT, "app.py"))}
+    for path in sorted(glob.glob(os.path.join(ROOT, "pages", "*.py"))):
+        pages[os.path.splitext(os.path.basename(path))[0]] = page_modules(path)
+    return pages
+
+
+PROBE = """
+import sys, time, json
+modules = [m for m in sys.argv[1].split(",") if m]
+heavy = sys.argv[2].split(",")
+started = time.perf_counter()
+error = None
+try:
+    for name in modules:
+        __import__(name)
+except Exception as e:
+    error = f"{type(e).__name__}: {e}"
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "error": error, "loaded": [m for m in heavy if m in sys.modules]}))
+"""
+
+
+def probe(modules, env):
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, ",".join(modules), ",".join(HEAVY_MODULES)],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(modules, repeat, env):
+    samples = [probe(modules, env) for _ in range(repeat)]
+    seconds = [s["seconds"] for s in samples]
+    return {
+        "min_s": min(seconds),
+        "median_s": statistics.median(seconds),
+        "runs": repeat,
+        "heavy_loaded": samples[-1]["loaded"],
+        "error": samples[-1]["error"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Per-page import/startup timing")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--out", default=RESULTS_DIR)
+    args = parser.parse_args(argv)
+
+    env = dict(os.environ)
+    # Don't open the exporter port or touch real caches while probing
+    env.pop("EA_METRICS_PORT", None)
+    env.setdefault("EA_CACHE_DIR", os.path.join(args.out, ".startup_cache"))
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "baseline_interpreter": measure([], args.repeat, env),
+        "streamlit": measure(["streamlit"], args.repeat, env),
+        "pages": {},
+    }
+    for page, modules in discover_pages().items():
+        print(f"⏱️  Timing {page} imports...")
+        report["pages"][page] = measure(modules, args.repeat, env)
+
+    os.makedirs(args.out, exist_ok=True)
+    path = os.path.join(args.out, f"startup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    base = report["baseline_interpreter"]["median_s"]
+    for page, values in report["pages"].items():
+        heavy = ", ".join(values["heavy_loaded"]) or "none"
+        note = f" (⚠️ {values['error']})" if values["error"] else ""
+        print(f"  {page:<12} {values['median_s'] - base:7.3f}s  heavy: {heavy}{note}")
+    print(f"✅ Report written to {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
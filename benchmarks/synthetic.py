@@ -0,0 +1,74 @@
+# --- Synthetic catalogues shaped like catalogues/*.json ---
+import os
+import json
+import random
+
+LINES_OF_BUSINESS = ["Retail Banking", "Corporate Banking", "Social Development", "HR", "Finance", "Core Banking Team"]
+CATEGORIES = ["Core System", "Supporting System", "Integration Layer", "BI/Reporting Tool", "Mobile App", "External Portal"]
+STATUSES = ["Active", "Under Development", "Retired", "On Hold", "live"]
+TECHNOLOGIES = ["Java", ".NET", "Node.js", "Python", "SAP", "Oracle"]
+CAPABILITIES = [
+    "Customer Experience Management", "Governance, Risk, and Legal Management", "Strategy Management",
+    "Digital Transformation Strategy Management", "Institutional Excellence", "Customer onboarding",
+    "customer on-boarding", "Payments Processing", "Loan Origination", "Workforce Planning",
+]
+INTERFACES = ["API", "Batch", "Webhook", "Message Queue", "Other"]
+PROTOCOLS = ["HTTPS", "HTTP", "SFTP", "AMQP", "MQTT"]
+FREQUENCIES = ["Real-Time", "Hourly", "Daily", "Weekly", "On Demand"]
+
+
+def app_names(count):
+    return [f"App {i:05d}" for i in range(count)]
+
+
+def application_interview(rng, name, names):
+    return {
+        "application_name": name,
+        "category_type": rng.choice(CATEGORIES).lower() if rng.random() < 0.3 else rng.choice(CATEGORIES),
+        "line_of_business": rng.choice(LINES_OF_BUSINESS),
+        "status": rng.choice(STATUSES),
+        "technology": rng.choice(TECHNOLOGIES),
+        "integrations": [
+            {
+                "Source App": name,
+                "Target App": rng.choice(names) if rng.random() > 0.05 else "",
+                "Interface Type": rng.choice(INTERFACES),
+                "Protocol": rng.choice(PROTOCOLS),
+                "Frequency": rng.choice(FREQUENCIES),
+            }
+            for _ in range(rng.randint(0, 4))
+        ],
+        "stakeholder_role": "Application Owner",
+    }
+
+
+def business_interview(rng, names):
+    caps = rng.sample(CAPABILITIES, rng.randint(2, 6))
+    return {
+        "business_domain": rng.choice(LINES_OF_BUSINESS) + " ",
+        "capabilities": "\n\n".join(caps) + "\n",
+        "pain_points": "Manual reconciliation.\n\nLow maturity level of electronic services.\n",
+        "kpis": "successful service execution per day",
+        "critical_systems": " , ".join(rng.sample(names, min(2, len(names)))),
+        "stakeholder_role": "Business Owner",
+    }
+
+
+def generate(folder, count, app_share=0.7, seed=42):
+    """Write `count` interview files to `folder`; returns the list of filenames."""
+    rng = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    names = app_names(max(1, int(count * app_share)))
+    written = []
+    for i in range(count):
+        if i < len(names):
+            data = application_interview(rng, names[i], names)
+            filename = f"ApplicationOwner_{names[i].replace(' ', '_')}_20250101_{i:06d}.json"
+        else:
+            data = business_interview(rng, names)
+            lob = data["business_domain"].replace(" ", "_")
+            filename = f"BusinessOwner_{lob}_20250101_{i:06d}.json"
+        with open(os.path.join(folder, filename), "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        written.append(filename)
+    return written
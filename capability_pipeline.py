@@ -0,0 +1,114 @@
+# --- Vectorized normalization stage for the ARM heatmaps ---
+# Business Owner capabilities are exploded into one long (LOB, Capability) frame
+# and Application Owner fields into an (Application, LOB, Category) frame using
+# pandas string ops and precompiled patterns. Frames are categorical-typed and
+# memoized per catalogue snapshot, so both heatmaps share one pass over the data.
+# Free-text names are mapped onto canonical labels (see name_index) so
+# near-duplicate rows/columns collapse before pivoting.
+import re
+import threading
+
+from catalogue_builders import CAPABILITY_PREFIX
+from name_index import get_index
+import metrics
+
+# LOB is encoded in Business Owner filenames: BusinessOwner_<lob>__<timestamp>.json
+LOB_FROM_FILENAME = re.compile(r"BusinessOwner_(.*?)__")
+
+_SPACES = re.compile(r"\s+")
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+def _memoized(name, data, build):
+    # Keyed on the identity of the interview dicts: the catalogue store only
+    # replaces a dict when its file changes. The data list is kept alive with
+    # the result so the ids cannot be recycled.
+    key = tuple(map(id, data))
+    with _cache_lock:
+        entry = _cache.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[2]
+    with metrics.timer("heatmap_frame", frame=name):
+        frame = build()
+    with _cache_lock:
+        _cache[name] = (key, list(data), frame)
+    return frame
+
+
+def lob_label(value, default="Unknown"):
+    """Display casing for a Line of Business, identical for interview fields and filenames.
+
+    Words are title-cased except all-caps acronyms ("HR", "XYZ"), so "social development",
+    "Social_Development" and "SOCIAL development" all canonicalise from the same spelling.
+    """
+    words = _SPACES.sub(" ", str(value or "").replace("_", " ")).strip().split(" ")
+    label = " ".join(w if w.isupper() and len(w) <= 4 else w.capitalize() for w in words if w)
+    return label or default
+
+
+def _capability_frame(biz_files, biz_data):
+    import pandas as pd
+
+    raw = pd.Series([d.get("capabilities", "") for d in biz_data], dtype="object")
+    raw = raw.where(raw.map(lambda v: isinstance(v, str)), "")
+
+    lob = pd.Series(biz_files, dtype="string").str.extract(LOB_FROM_FILENAME, expand=False).map(
+        lambda v: lob_label(v if isinstance(v, str) else "")
+    )
+
+    caps = raw.astype("string").str.split("\n")
+    frame = pd.DataFrame({"Line of Business": lob, "Capability": caps}).explode("Capability", ignore_index=True)
+    frame = frame[frame["Capability"].fillna("").str.strip() != ""]
+    frame["Capability"] = (
+        frame["Capability"]
+        .str.strip("- ")
+        .str.strip()
+        .str.replace(CAPABILITY_PREFIX, "", regex=True)
+        .str.strip()
+        .str.capitalize()
+    )
+    frame["Capability"] = get_index("capability").canonicalize(frame["Capability"].tolist())
+    frame["Line of Business"] = get_index("lob").canonicalize(frame["Line of Business"].tolist())
+    return frame.astype({"Line of Business": "category", "Capability": "category"}).reset_index(drop=True)
+
+
+def capability_frame(biz_files, biz_data):
+    return _memoized("capabilities", biz_data, lambda: _capability_frame(biz_files, biz_data))
+
+
+def _application_frame(app_data):
+    import pandas as pd
+
+    frame = pd.DataFrame(
+        {
+            "Application": [d.get("application_name", "Unnamed") for d in app_data],
+            "Line of Business": [d.get("line_of_business", "N/A") for d in app_data],
+            "Category": [d.get("category_type", "Unspecified") for d in app_data],
+        },
+        dtype="string",
+    )
+    return normalize_application_frame(frame)
+
+
+def normalize_application_frame(frame):
+    """Labels of an (Application, LOB, Category) frame, shared by the json and sqlite heatmap paths."""
+    frame = frame.astype("string")
+    frame["Line of Business"] = frame["Line of Business"].map(lob_label)
+    frame["Category"] = frame["Category"].str.strip().str.lower()
+    frame["Application"] = get_index("application").canonicalize(frame["Application"].tolist())
+    frame["Line of Business"] = get_index("lob").canonicalize(frame["Line of Business"].tolist())
+    return frame.astype({"Line of Business": "category", "Category": "category"})
+
+
+def application_frame(app_data):
+    return _memoized("applications", app_data, lambda: _application_frame(app_data))
+
+
+def count_matrix(frame, rows, columns):
+    import pandas as pd
+
+    if frame.empty:
+        return pd.DataFrame()
+    return frame.groupby([rows, columns], observed=True).size().unstack(fill_value=0)
@@ -0,0 +1,133 @@
+# --- Deterministic catalogue builders ---
+# The Application and Business Catalogues are projections of fields we already
+# collect, so they are built locally into typed DataFrames. The LLM is only
+# (optionally) asked for the derived columns it actually adds value to.
+import re
+import json
+
+from interview_db import integration_entries
+from name_index import get_index
+from questions import questions_app_owner
+
+APP_CATALOGUE_COLUMNS = ["App Name", "Business Line", "Category", "Status", "Tech Stack", "Stakeholder"]
+INTEGRATION_COLUMNS = ["Source App", "Target App", "Interface Type", "Protocol", "Frequency"]
+CANONICAL_COLUMNS = {"Source App": "Source App (canonical)", "Target App": "Target App (canonical)"}
+BUSINESS_CATALOGUE_COLUMNS = ["Capability Name", "Description", "Related Department", "Pain Point", "TOGAF Layer"]
+
+# Multiple-choice answers, keyed by lowercase text so "core system" maps back to "Core System"
+_OPTIONS = {q["field"]: {o.lower(): o for o in q["options"]} for q in questions_app_owner if q.get("options")}
+
+# Capability numbering such as "Cab 1: ..." / "cab2 - ..." used by some interviewees
+CAPABILITY_PREFIX = re.compile(r"cab\s*\d+\s*[:\-]?\s*", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _text(value, default=""):
+    if value is None:
+        return default
+    if isinstance(value, (list, tuple)):
+        value = ", ".join(str(v) for v in value)
+    value = _WHITESPACE.sub(" ", str(value)).strip()
+    return value or default
+
+
+def _option(value, field):
+    """Answer as entered, or the matching question option when it only differs in case."""
+    value = _text(value)
+    return _OPTIONS.get(field, {}).get(value.lower(), value)
+
+
+def split_lines(raw):
+    if isinstance(raw, list):
+        items = [str(item) for item in raw]
+    elif isinstance(raw, str):
+        items = raw.split("\n")
+    else:
+        return []
+    return [item.strip("- ").strip() for item in items if item.strip("- ").strip()]
+
+
+def clean_capability(cap):
+    return CAPABILITY_PREFIX.sub("", cap).strip().capitalize()
+
+
+def build_application_catalogue(app_data):
+    import pandas as pd
+
+    rows = [
+        {
+            "App Name": _text(app.get("application_name"), "Unnamed"),
+            "Business Line": _text(app.get("line_of_business")),
+            "Category": _option(app.get("category_type"), "category_type"),
+            "Status": _option(app.get("status"), "status"),
+            "Tech Stack": _text(app.get("technology")),
+            "Stakeholder": _text(app.get("stakeholder_role")),
+        }
+        for app in app_data
+    ]
+    df = pd.DataFrame(rows, columns=APP_CATALOGUE_COLUMNS)
+    df = df.astype({col: "string" for col in APP_CATALOGUE_COLUMNS})
+    return df.astype({"Business Line": "category", "Category": "category", "Status": "category"})
+
+
+def build_business_catalogue(biz_data):
+    import pandas as pd
+
+    rows = []
+    for interview in biz_data:
+        department = _text(interview.get("business_domain"))
+        pain_points = "; ".join(split_lines(interview.get("pain_points")))
+        for cap in split_lines(interview.get("capabilities")):
+            rows.append({
+                "Capability Name": clean_capability(cap),
+                "Description": "",
+                "Related Department": department,
+                "Pain Point": pain_points,
+                # Capabilities collected from Business Owners sit in the TOGAF Business Architecture layer
+                "TOGAF Layer": "Business",
+            })
+    df = pd.DataFrame(rows, columns=BUSINESS_CATALOGUE_COLUMNS)
+    df = df.drop_duplicates(subset=["Capability Name", "Related Department"], ignore_index=True)
+    df = df.astype({col: "string" for col in BUSINESS_CATALOGUE_COLUMNS})
+    return df.astype({"Related Department": "category", "TOGAF Layer": "category"})
+
+
+def integration_rows(app_data):
+    return [row for app in app_data for row in integration_entries(app)]
+
+
+def build_integration_matrix(rows):
+    import pandas as pd
+
+    df = pd.DataFrame(rows, columns=INTEGRATION_COLUMNS)
+    # Names stay as entered; the canonical label (spelling variants collapsed) sits alongside
+    index = get_index("application")
+    for column, canonical in CANONICAL_COLUMNS.items():
+        df[canonical] = index.canonicalize(df[column].tolist())
+    return df
+
+
+def enrichment_prompt(names, columns):
+    return (
+        "You are an expert Enterprise Architect. For each item below, provide the following fields: "
+        + ", ".join(columns)
+        + ".\nReturn ONLY a JSON object mapping each item name exactly as given to an object with those fields.\n\n"
+        + json.dumps(names, ensure_ascii=False)
+    )
+
+
+def enrich_catalogue(df, key_column, columns, ask_llm):
+    """Fill derived `columns` via one LLM call; `ask_llm(prompt) -> str` returns the raw reply."""
+    import pandas as pd
+
+    if df.empty:
+        return df
+    names = sorted(df[key_column].dropna().unique().tolist())
+    derived = json.loads(ask_llm(enrichment_prompt(names, columns)))
+    df = df.copy()
+    for column in columns:
+        values = df[key_column].map(lambda name: (derived.get(name) or {}).get(column))
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            df[column] = df[column].astype("string")
+        df[column] = values.fillna(df[column]).astype("string")
+    return df
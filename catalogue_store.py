@@ -0,0 +1,129 @@
+# --- Shared catalogue store ---
+# Keeps one process-wide index of the interview files in `catalogues/`, keyed by
+# (filename, mtime, size). A refresh only stats the folder and re-parses the
+# files whose signature changed, so Streamlit reruns and concurrent sessions all
+# share the same parsed data instead of re-reading every file. Interviews kept in
+# the append-only log (see interview_log) are tailed and merged in as well.
+import os
+import json
+import threading
+
+from settings import CATALOGUE_DIR, INTERVIEW_LOG_DIR
+from interview_log import LogReader
+import metrics
+
+
+class CatalogueSnapshot:
+    def __init__(self, version, records, errors):
+        self.version = version
+        # filename -> parsed interview dict, sorted by filename for stable output
+        self.records = records
+        self.errors = errors
+
+        self.app_files, self.app_data = [], []
+        self.biz_files, self.biz_data = [], []
+        for name, data in records.items():
+            role = str(data.get("stakeholder_role", "")).lower()
+            if "application" in role:
+                self.app_files.append(name)
+                self.app_data.append(data)
+            elif "business" in role:
+                self.biz_files.append(name)
+                self.biz_data.append(data)
+
+    @property
+    def all_data(self):
+        return list(self.records.values())
+
+
+class CatalogueStore:
+    def __init__(self, folder=CATALOGUE_DIR, log_dir=None):
+        self.folder = folder
+        if log_dir is None:
+            log_dir = INTERVIEW_LOG_DIR if folder == CATALOGUE_DIR else os.path.join(folder, "log")
+        self._log = LogReader(log_dir)
+        self._lock = threading.Lock()
+        self._index = {}  # filename -> ((mtime_ns, size), data)
+        self._errors = {}  # filename -> ((mtime_ns, size), error message)
+        self._version = 0
+        self._snapshot = CatalogueSnapshot(0, {}, {})
+
+    def _scan(self):
+        signatures = {}
+        try:
+            entries = os.scandir(self.folder)
+        except FileNotFoundError:
+            return signatures
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                stat = entry.stat()
+                signatures[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return signatures
+
+    def refresh(self):
+        with metrics.timer("catalogue_refresh"):
+            return self._refresh()
+
+    def _refresh(self):
+        with self._lock:
+            signatures = self._scan()
+            changed = False
+
+            for name in list(self._index):
+                if name not in signatures:
+                    del self._index[name]
+                    changed = True
+            for name in list(self._errors):
+                if name not in signatures:
+                    del self._errors[name]
+                    changed = True
+
+            for name, sig in signatures.items():
+                cached = self._index.get(name) or self._errors.get(name)
+                if cached and cached[0] == sig:
+                    continue
+                changed = True
+                try:
+                    with open(os.path.join(self.folder, name), "r", encoding="utf-8") as file:
+                        data = json.load(file)
+                    if not isinstance(data, dict):
+                        raise ValueError("interview file must contain a JSON object")
+                    self._index[name] = (sig, data)
+                    self._errors.pop(name, None)
+                    metrics.inc("catalogue_files_parsed")
+                except Exception as e:
+                    self._index.pop(name, None)
+                    self._errors[name] = (sig, str(e))
+                    metrics.inc("catalogue_parse_errors")
+
+            log_records, log_changed = self._log.refresh()
+            changed = changed or log_changed
+
+            if changed:
+                self._version += 1
+                records = {name: self._index[name][1] for name in sorted(self._index)}
+                records.update(log_records)
+                errors = {name: self._errors[name][1] for name in sorted(self._errors)}
+                self._snapshot = CatalogueSnapshot(self._version, records, errors)
+            return self._snapshot
+
+    def snapshot(self):
+        return self._snapshot
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(folder=CATALOGUE_DIR):
+    with _stores_lock:
+        store = _stores.get(folder)
+        if store is None:
+            store = _stores[folder] = CatalogueStore(folder)
+        return store
+
+
+def load_catalogue(folder=CATALOGUE_DIR):
+    return get_store(folder).refresh()
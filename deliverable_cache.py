@@ -0,0 +1,119 @@
+# --- Content-addressed cache for generated deliverables ---
+# A deliverable is identified by its type, the prompt template and a content
+# hash of the interviews it was generated from. Results (markdown and parsed
+# table; exported files live in the exports cache) are stored on disk under
+# that key, so re-clicking Generate on an unchanged catalogue costs nothing,
+# and editing a Business Owner interview does not invalidate deliverables built
+# only from Application Owner data. Every catalogue edit creates new keys, so
+# entries unused for DELIVERABLE_CACHE_TTL_SECONDS are dropped and the cache is
+# capped at DELIVERABLE_CACHE_MAX_ENTRIES, least recently used first.
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+
+import metrics
+from settings import CACHE_DIR, DELIVERABLE_CACHE_MAX_ENTRIES, DELIVERABLE_CACHE_TTL_SECONDS
+
+DELIVERABLE_CACHE_DIR = os.path.join(CACHE_DIR, "deliverables")
+
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0, "writes": 0}
+
+
+def interview_hash(interview):
+    encoded = json.dumps(interview, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def content_hash(interviews):
+    # Order-independent: the same set of interviews always hashes the same
+    digest = hashlib.sha256()
+    for h in sorted(interview_hash(i) for i in interviews):
+        digest.update(h.encode("ascii"))
+    return digest.hexdigest()
+
+
+def make_key(deliverable, prompt_template, interviews, model=""):
+    payload = json.dumps([deliverable, prompt_template.strip(), model, content_hash(interviews)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _path(key, name, folder):
+    return os.path.join(folder, key[:2], key, name)
+
+
+def _write_atomic(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def load(key, folder=DELIVERABLE_CACHE_DIR):
+    """Return {"output", "table", "deliverable"} for a cached deliverable, or None."""
+    meta_path = _path(key, "meta.json", folder)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        with _lock:
+            stats["misses"] += 1
+        return None
+    try:
+        os.utime(meta_path)  # mtime doubles as "last used" for eviction
+    except OSError:
+        pass
+    with _lock:
+        stats["hits"] += 1
+    return {"output": meta.get("output", ""), "table": meta.get("table"), "deliverable": meta.get("deliverable")}
+
+
+def save(key, deliverable, output, table=None, folder=DELIVERABLE_CACHE_DIR):
+    """`table` is a JSON-serializable {"columns": [...], "data": [[...]]} payload."""
+    meta = {"deliverable": deliverable, "output": output, "table": table}
+    # Written via rename so a reader never sees a half-written entry
+    _write_atomic(_path(key, "meta.json", folder), json.dumps(meta, ensure_ascii=False).encode("utf-8"))
+    with _lock:
+        stats["writes"] += 1
+    evict(folder)
+
+
+def evict(folder=DELIVERABLE_CACHE_DIR, max_entries=DELIVERABLE_CACHE_MAX_ENTRIES, ttl=DELIVERABLE_CACHE_TTL_SECONDS):
+    """Drop entries unused for `ttl` seconds, then the least recently used beyond `max_entries`."""
+    entries = []
+    try:
+        shards = list(os.scandir(folder))
+    except FileNotFoundError:
+        return 0
+    for shard in shards:
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            try:
+                entries.append((os.stat(os.path.join(entry.path, "meta.json")).st_mtime, entry.path))
+            except OSError:
+                continue
+    entries.sort(reverse=True)
+    cutoff = time.time() - ttl
+    stale = [path for i, (used, path) in enumerate(entries) if i >= max_entries or used < cutoff]
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+    return len(stale)
+
+
+@metrics.register_collector
+def _collect():
+    lookups = stats["hits"] + stats["misses"]
+    return [
+        ("deliverable_cache_hits", stats["hits"], {}, "counter"),
+        ("deliverable_cache_misses", stats["misses"], {}, "counter"),
+        ("deliverable_cache_hit_ratio", stats["hits"] / lookups if lookups else 0.0, {}, "gauge"),
+    ]
+
+
+def clear(folder=DELIVERABLE_CACHE_DIR):
+    shutil.rmtree(folder, ignore_errors=True)
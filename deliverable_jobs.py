@@ -0,0 +1,93 @@
+# --- Background job kinds for the Builder and Governance pages ---
+# Jobs receive only small, JSON-serializable parameters and reload interview
+# data from the shared catalogue store, so a resumed job always works on the
+# current catalogue and the job table stays small.
+import deliverable_cache
+import llm_gateway
+from catalogue_store import load_catalogue
+from governance_scoring import assess_portfolio, assess_portfolio_incremental
+from job_queue import job
+from markdown_tables import MarkdownTableStream
+from prompt_compaction import compact_interviews
+
+# GPT-generated deliverables: action -> (interview source, prompt template)
+DELIVERABLE_PROMPTS = {
+    "📘 Build Application Catalogue": ("application", """
+You are an expert Application Architect. Build a TOGAF-aligned Application Catalogue from the following interviews. Output ONLY a clean markdown table with: App Name, Business Line, Category, Status, Tech Stack, Stakeholder.
+"""),
+    "📘 Build Business Catalogue": ("business", """
+You are an expert Business Architect. Build a TOGAF-aligned Business Capability Catalogue. Output ONLY a clean markdown table with: Capability Name, Description, Related Department, Pain Point, TOGAF Layer.
+"""),
+    "⚠️ Build Gap Analysis": ("application", """
+You're a TOGAF compliance consultant. Analyze the following interviews and generate a structured Gap Analysis. Use markdown bullets or tables showing Gap, Impact, and Recommendation.
+"""),
+}
+
+
+def _interviews(source):
+    catalogue = load_catalogue()
+    return {"application": catalogue.app_data, "business": catalogue.biz_data}.get(source, catalogue.all_data)
+
+
+def parse_table(output):
+    table_stream = MarkdownTableStream()
+    table_stream.feed(output)
+    table_stream.close()
+    if table_stream.header is None:
+        return None
+    return {"columns": table_stream.header, "data": table_stream.rows}
+
+
+def generate(action, prompt, input_data, wants_table=False, force=False, report=None, on_token=None):
+    """Run one GPT deliverable through the deliverable cache.
+
+    Returns {"output", "table", "cache_key", "from_cache", "compaction"}; `on_token(text so far, delta)`
+    streams the reply as it is generated.
+    """
+    cache_key = deliverable_cache.make_key(action, prompt, input_data, model="gpt-4")
+    cached = None if force else deliverable_cache.load(cache_key)
+    if cached is not None:
+        return {"output": cached["output"], "table": cached["table"], "cache_key": cache_key, "from_cache": True, "compaction": None}
+
+    compaction = compact_interviews(input_data, action)
+    if report:
+        report(0.1, f"Sending {compaction['unique']} interview(s) ({compaction['tokens_after']:,} tokens) to GPT-4")
+    messages = [
+        {"role": "system", "content": "You are a senior Enterprise Architect."},
+        {"role": "user", "content": f"{prompt.strip()}\n\nData:\n{compaction['text']}"}
+    ]
+    if on_token is None:
+        output = llm_gateway.chat("gpt-4", messages)
+    else:
+        output = ""
+        for delta in llm_gateway.stream("gpt-4", messages):
+            output += delta
+            on_token(output, delta)
+    if report:
+        report(0.9, "Parsing result")
+    table = parse_table(output) if wants_table else None
+    deliverable_cache.save(cache_key, action, output, table=table)
+    return {"output": output, "table": table, "cache_key": cache_key, "from_cache": False, "compaction": compaction}
+
+
+@job("gpt_deliverable")
+def gpt_deliverable(params, report):
+    """params: action, prompt, source ("application" | "business"), wants_table, force."""
+    return generate(
+        params["action"], params["prompt"], _interviews(params["source"]),
+        wants_table=params.get("wants_table"), force=params.get("force"), report=report,
+    )
+
+
+@job("governance_assessment")
+def governance_assessment(params, report):
+    files = _interviews("all")
+    report(0.05, f"Assessing {len(files)} interview(s)")
+    on_progress = lambda done, total: report(0.05 + 0.9 * done / total, f"Scored batch {done} of {total}")
+    if params.get("incremental"):
+        result = assess_portfolio_incremental(files, on_progress=on_progress)
+    else:
+        result = assess_portfolio(files, chunked=params.get("chunked"), on_progress=on_progress)
+    if "error" in result:
+        raise RuntimeError(result["error"])
+    return result
@@ -0,0 +1,217 @@
+# --- Export subsystem ---
+# Builds Excel / CSV / Parquet files for deliverable tables only when the user
+# asks for one. Workbooks are written with xlsxwriter's constant_memory mode
+# straight to a file (rows are flushed as they are written), and every built
+# artifact is kept on disk under a hash of the data, so re-exporting an
+# unchanged table, or the same table from another session, is just a file read.
+# Files unused for EXPORT_CACHE_TTL_SECONDS are removed, and the folder is kept
+# under EXPORT_CACHE_MAX_BYTES by dropping the least recently used files first.
+import os
+import time
+import hashlib
+import threading
+
+import metrics
+from settings import CACHE_DIR, EXPORT_CACHE_MAX_BYTES, EXPORT_CACHE_TTL_SECONDS
+
+EXPORT_CACHE_DIR = os.path.join(CACHE_DIR, "exports")
+
+FORMATS = {
+    "Excel": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "CSV": (".csv", "text/csv"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+EXCEL_MAX_SHEET_NAME = 31
+ROW_CHUNK = 5000
+
+_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0, "bytes_written": 0}
+
+
+def parquet_available():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def available_formats():
+    return [name for name in FORMATS if name != "Parquet" or parquet_available()]
+
+
+def frame_hash(df):
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(repr([str(c) for c in df.columns]).encode("utf-8"))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()
+
+
+def sheets_hash(sheets, fmt):
+    digest = hashlib.sha256(fmt.encode("utf-8"))
+    for name, df in sheets.items():
+        digest.update(name.encode("utf-8"))
+        digest.update(frame_hash(df).encode("ascii"))
+    return digest.hexdigest()
+
+
+def _rows(df):
+    # Chunked so NaN/NA become blank cells without copying the whole frame at once
+    for start in range(0, len(df), ROW_CHUNK):
+        chunk = df.iloc[start:start + ROW_CHUNK].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def write_excel(sheets, path):
+    """Write {sheet name: DataFrame} to `path`, one row at a time."""
+    import xlsxwriter
+
+    workbook = xlsxwriter.Workbook(path, {"constant_memory": True, "strings_to_urls": False})
+    try:
+        header = workbook.add_format({"bold": True})
+        for name, df in sheets.items():
+            sheet = workbook.add_worksheet(name[:EXCEL_MAX_SHEET_NAME])
+            sheet.write_row(0, 0, [str(c) for c in df.columns], header)
+            for row_number, row in enumerate(_rows(df), start=1):
+                sheet.write_row(row_number, 0, row)
+    finally:
+        workbook.close()
+
+
+def write_csv(df, path):
+    df.to_csv(path, index=False, chunksize=ROW_CHUNK)
+
+
+def write_parquet(df, path):
+    if not parquet_available():
+        raise RuntimeError("Parquet export needs the optional 'pyarrow' package.")
+    df = df.copy()
+    df.columns = [str(c) for c in df.columns]
+    df.to_parquet(path, index=False)
+
+
+def build(sheets, fmt="Excel", folder=EXPORT_CACHE_DIR):
+    """Return the path of the exported file for {sheet name: DataFrame}, building it if needed.
+
+    CSV and Parquet hold a single table, so only the first sheet is exported.
+    """
+    extension = FORMATS[fmt][0]
+    key = sheets_hash(sheets, fmt)
+    path = os.path.join(folder, key[:2], key + extension)
+    if os.path.exists(path):
+        try:
+            os.utime(path)  # mtime doubles as "last used" for eviction
+        except OSError:
+            pass
+        with _lock:
+            stats["hits"] += 1
+        return path
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    first = next(iter(sheets.values()))
+    with metrics.timer("export_build", format=fmt):
+        try:
+            if fmt == "Excel":
+                write_excel(sheets, tmp)
+            elif fmt == "CSV":
+                write_csv(first, tmp)
+            else:
+                write_parquet(first, tmp)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+    with _lock:
+        stats["misses"] += 1
+        stats["bytes_written"] += os.path.getsize(path)
+    evict(folder)
+    return path
+
+
+def evict(folder=EXPORT_CACHE_DIR, max_bytes=EXPORT_CACHE_MAX_BYTES, ttl=EXPORT_CACHE_TTL_SECONDS):
+    """Drop files unused for `ttl` seconds, then the least recently used beyond `max_bytes`."""
+    files = []
+    try:
+        shards = list(os.scandir(folder))
+    except FileNotFoundError:
+        return 0
+    for shard in shards:
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            if entry.name.endswith(".tmp"):
+                continue  # still being written
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+    files.sort(reverse=True)
+    cutoff = time.time() - ttl
+    removed, kept_bytes = 0, 0
+    for i, (used, size, path) in enumerate(files):
+        kept_bytes += size
+        # The newest file is the one just built or served, so it always stays
+        if i and (used < cutoff or kept_bytes > max_bytes):
+            try:
+                os.remove(path)
+                removed += 1
+            except FileNotFoundError:
+                pass
+            kept_bytes -= size
+    return removed
+
+
+def read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+@metrics.register_collector
+def _collect():
+    lookups = stats["hits"] + stats["misses"]
+    return [
+        ("export_cache_hits", stats["hits"], {}, "counter"),
+        ("export_cache_misses", stats["misses"], {}, "counter"),
+        ("export_cache_hit_ratio", stats["hits"] / lookups if lookups else 0.0, {}, "gauge"),
+        ("export_bytes_written", stats["bytes_written"], {}, "counter"),
+    ]
+
+
+def export_panel(df, file_stem, sheet_name="Deliverable", key="export"):
+    """Streamlit front-end: choose a format, build on click, then offer the download."""
+    import streamlit as st
+
+    if df is None or df.empty:
+        return
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        fmt = st.radio("Export format", available_formats(), horizontal=True, key=f"{key}_format")
+    prepared = st.session_state.setdefault("prepared_exports", {})
+    slot = f"{key}:{fmt}"
+    with col2:
+        if st.button("📦 Prepare download", key=f"{key}_prepare"):
+            try:
+                with st.spinner(f"Building {fmt} file..."):
+                    prepared[slot] = build({sheet_name: df}, fmt)
+            except Exception as e:
+                st.error(f"❌ Export failed: {e}")
+
+    path = prepared.get(slot)
+    # A stale path (table changed since it was prepared) is dropped rather than offered
+    if path and os.path.basename(path).startswith(sheets_hash({sheet_name: df}, fmt)):
+        extension, mime = FORMATS[fmt]
+        st.download_button(
+            label=f"📥 Download as {fmt}",
+            data=read(path),
+            file_name=file_stem + extension,
+            mime=mime,
+            key=f"{key}_download",
+        )
+    elif path:
+        prepared.pop(slot, None)
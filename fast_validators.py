@@ -0,0 +1,211 @@
+# --- Local fast-path answer validation ---
+# Runs before validate_answer so that most interview turns are decided in
+# microseconds: help requests are caught by one compiled matcher, closed option
+# lists are matched strictly, and simple fields have their own shape checks. A
+# local verdict is only given when it is decisive: non-answers ("I don't know",
+# "skip"), hedged answers, questions back to the interviewer and near-miss
+# options always escalate to the model.
+import re
+import difflib
+import threading
+
+from validation_cache import normalize_text
+
+ACCEPT = "✅"
+EXAMPLE = "❌EXAMPLE"
+UNCLEAR = "❌UNCLEAR"
+
+# Extra help intents on top of the phrases configured in app.py
+HELP_PATTERNS = [
+    r"what (are|is) (the )?(options|choices|examples?)",
+    r"(can|could) you (please )?(clarify|explain)",
+    r"(give|show) me (some |an )?examples?",
+    r"examples? please",
+    r"^\s*(help|options|examples?)\s*\??\s*$",
+]
+
+# Non-answers and skips: never accepted locally, the model decides how to follow up
+NON_ANSWER_PATTERNS = [
+    r"^\s*(none|nothing|nil|n/?a|na|tbd|tbc|unknown|skip|pass|next|later|no|nope|idk|\?+|-+)\s*[.!?]*\s*$",
+    # "don't know", "don't really know", "do not quite remember" ...
+    r"\b(do ?n[o']?t|dont|do not|can ?n[o']?t|cannot)( \w+){0,3} (know|remember|recall|understand|say|tell)\b",
+    r"\b(no|not any)( \w+){0,2} idea\b",
+    r"\bnot( \w+){0,2} sure\b",
+    r"\bno clue\b",
+    r"\bno comment\b",
+    r"\b(skip|pass)( this| it| the question)?\b",
+    r"\b(maybe|perhaps|probably|i guess|i think|not certain)\b",
+]
+
+# Questions back to the interviewer ("what do you mean?", "why do you need this")
+QUESTION_PATTERNS = [
+    r"\?",
+    r"^(what|why|how|who|whom|whose|which|when|where)\b",
+    r"^(can|could|would|should|do|does|did|is|are|will|may|must) (i|you|we|it|that|this|they)\b",
+]
+
+# Answers that talk about the interview instead of answering it
+META_PATTERNS = [
+    r"\b(mean|meaning|question|clarify|explain|repeat|rephrase)\b",
+]
+
+# Names and labels are short noun phrases, not sentences about the speaker
+_PERSONAL = re.compile(r"\b(i|i'm|im|me|my|you|your|we|our|us)\b")
+
+# Words/prefixes that turn an option into its opposite ("Inactive", "not active")
+NEGATION_WORDS = {"not", "no", "non", "never"}
+NEGATION_PREFIXES = ("in", "un", "non", "dis", "de")
+
+KNOWN_TECHNOLOGIES = {
+    "java", ".net", "dotnet", "c#", "node", "node.js", "nodejs", "python", "php", "ruby", "go", "golang",
+    "react", "angular", "vue", "javascript", "typescript", "kotlin", "swift", "flutter", "sap", "abap",
+    "oracle", "sql", "mssql", "postgres", "postgresql", "mysql", "mongodb", "cobol", "salesforce",
+    "dynamics", "sharepoint", "spring", "django", "flask", "rust", "scala", "c++", "android", "ios",
+}
+
+_HAS_WORD = re.compile(r"[^\W_]", re.UNICODE)
+_TOKEN = re.compile(r"[a-z0-9#+.]+")
+_LIST_SPLIT = re.compile(r"\s*(?:,|;|\n|\band\b|&)\s*")
+
+# Function words that carry no content on their own
+_FILLER = {
+    "i", "me", "my", "we", "our", "us", "you", "your", "it", "this", "that", "the", "a", "an", "and", "or",
+    "to", "of", "in", "on", "for", "with", "is", "are", "be", "have", "has", "do", "does", "what", "really",
+    "just", "so", "very", "well", "yes", "ok", "okay", "some", "any", "all", "things", "stuff", "etc",
+}
+
+_field_validators = {}
+
+
+def field_validator(*fields):
+    def register(func):
+        for field in fields:
+            _field_validators[field] = func
+        return func
+    return register
+
+
+def _word_count(text):
+    return len(text.split())
+
+
+@field_validator("application_name")
+def _check_application_name(answer):
+    if 2 <= len(answer) <= 100 and _word_count(answer) <= 6 and not _PERSONAL.search(answer.lower()):
+        return ACCEPT
+    return None
+
+
+@field_validator("line_of_business", "business_domain")
+def _check_short_label(answer):
+    if 2 <= len(answer) <= 80 and _word_count(answer) <= 6 and not _PERSONAL.search(answer.lower()):
+        return ACCEPT
+    return None
+
+
+@field_validator("technology")
+def _check_technology(answer):
+    # Decisive only for a plain list of stack items, e.g. "Java, Spring and Oracle"
+    items = [item for item in _LIST_SPLIT.split(answer.lower()) if item]
+    if not items or any(_word_count(item) > 3 for item in items):
+        return None
+    if all(set(_TOKEN.findall(item)) & KNOWN_TECHNOLOGIES for item in items):
+        return ACCEPT
+    return None
+
+
+@field_validator("capabilities", "pain_points", "kpis")
+def _check_free_text(answer):
+    # Decisive only for a statement with some content, e.g. "Payroll, hiring and onboarding"
+    words = _TOKEN.findall(answer.lower())
+    if len(words) >= 3 and len(set(words) - _FILLER) >= 2:
+        return ACCEPT
+    return None
+
+
+@field_validator("critical_systems")
+def _check_system_list(answer):
+    items = [item for item in _LIST_SPLIT.split(answer) if item]
+    if items and all(_HAS_WORD.search(item) and _word_count(item) <= 6 for item in items):
+        return ACCEPT
+    return None
+
+
+class FastValidator:
+    def __init__(self, help_phrases=(), fuzzy_cutoff=0.95):
+        patterns = [re.escape(normalize_text(p)) for p in help_phrases] + HELP_PATTERNS
+        self._help = re.compile("|".join(f"(?:{p})" for p in patterns))
+        self._non_answer = re.compile("|".join(f"(?:{p})" for p in NON_ANSWER_PATTERNS + QUESTION_PATTERNS + META_PATTERNS))
+        self.fuzzy_cutoff = fuzzy_cutoff
+        self._lock = threading.Lock()
+        self.counts = {"accepted": 0, "examples": 0, "rejected": 0, "escalated": 0}
+
+    def _count(self, key):
+        with self._lock:
+            self.counts[key] += 1
+
+    @staticmethod
+    def _negates(answer, option):
+        extra = set(answer.split()) - set(option.split())
+        if extra & NEGATION_WORDS:
+            return True
+        return any(answer.startswith(p) and not option.startswith(p) for p in NEGATION_PREFIXES)
+
+    def match_option(self, answer, options):
+        """Exact match after normalisation, or a typo-level match (ratio >= cutoff) that adds no negation."""
+        if not options:
+            return None
+        answer = normalize_text(answer)
+        normalized = {normalize_text(o): o for o in options}
+        if answer in normalized:
+            return normalized[answer]
+        close = difflib.get_close_matches(answer, list(normalized), n=1, cutoff=self.fuzzy_cutoff)
+        if close and not self._negates(answer, close[0]):
+            return normalized[close[0]]
+        return None
+
+    def check(self, question, user_input):
+        """Return (verdict, value) or (None, user_input) when the model must decide."""
+        answer = str(user_input or "").strip()
+        clean = normalize_text(answer)
+
+        if self._help.search(clean):
+            self._count("examples")
+            return EXAMPLE, answer
+        if not _HAS_WORD.search(clean):
+            self._count("rejected")
+            return UNCLEAR, answer
+
+        if self._non_answer.search(clean):
+            self._count("escalated")
+            return None, answer
+
+        option = self.match_option(answer, question.get("options"))
+        if option is not None:
+            self._count("accepted")
+            return ACCEPT, option
+
+        validator = _field_validators.get(question.get("field"))
+        if validator is not None and validator(answer) == ACCEPT:
+            self._count("accepted")
+            return ACCEPT, answer
+
+        self._count("escalated")
+        return None, answer
+
+    def collect(self):
+        stats = self.stats()
+        return [
+            ("fast_path_calls_avoided", stats["calls_avoided"], {}, "counter"),
+            ("fast_path_escalated", stats["escalated"], {}, "counter"),
+            ("fast_path_avoided_ratio", stats["avoided_ratio"], {}, "gauge"),
+        ]
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+        avoided = counts["accepted"] + counts["examples"] + counts["rejected"]
+        total = avoided + counts["escalated"]
+        counts["calls_avoided"] = avoided
+        counts["avoided_ratio"] = (avoided / total) if total else 0.0
+        return counts
@@ -0,0 +1,362 @@
+# --- Governance portfolio assessment ---
+# Single-prompt assessment for small portfolios plus a chunked (map-reduce) mode:
+# large portfolios do not fit into a single prompt, so interviews are packed
+# into compact, token-budgeted batches that are scored concurrently (map) and
+# then merged into portfolio scores by a deterministic weighted mean (reduce).
+import os
+import json
+import time
+import sqlite3
+import threading
+from contextlib import closing
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import llm_gateway
+import metrics
+from deliverable_cache import interview_hash
+from prompt_compaction import DELIVERABLE_FIELDS, compact_interviews, compact_json, estimate_tokens, project
+from settings import GOVERNANCE_DB_PATH
+
+SCORE_AREAS = [
+    "TOGAF Compliance",
+    "NORA Alignment",
+    "Business-IT Alignment",
+    "Digital Maturity",
+    "Technical Debt",
+    "Completeness",
+]
+
+DEFAULT_BATCH_TOKENS = 6000
+MAX_JUSTIFICATION_BULLETS = 15
+
+GOVERNANCE_FIELDS = DELIVERABLE_FIELDS["governance"]
+
+
+def encode_interview(interview):
+    return compact_json(project(interview, GOVERNANCE_FIELDS))
+
+
+def portfolio_tokens(files):
+    return sum(estimate_tokens(encode_interview(f)) for f in files)
+
+
+def pack_batches(files, token_budget=DEFAULT_BATCH_TOKENS):
+    batches, current, used = [], [], 0
+    for interview in files:
+        encoded = encode_interview(interview)
+        cost = estimate_tokens(encoded)
+        if current and used + cost > token_budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(encoded)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def build_batch_prompt(encoded_interviews, batch_no, batch_count):
+    return (
+        "You are an experienced enterprise architecture consultant.\n\n"
+        f"You are analyzing batch {batch_no} of {batch_count} of a portfolio of stakeholder interviews. "
+        "Each line below is one interview as a compact JSON object.\n\n"
+        + "\n".join(encoded_interviews)
+        + "\n\nScore the governance maturity of the interviews in this batch (0-100) for: "
+        + ", ".join(SCORE_AREAS)
+        + " (for Technical Debt lower = better).\n"
+        "Add at most 5 concise bullets covering strengths, gaps with impact, and recommended actions.\n\n"
+        "Return only a JSON object in this format:\n"
+        "{\n"
+        "  \"TOGAF Compliance\": 78,\n"
+        "  ...\n"
+        "  \"Justification\": \"- Bullet 1\\n- Bullet 2\"\n"
+        "}"
+    )
+
+
+def reduce_scores(batch_results):
+    """Merge per-batch results, weighting each batch by its interview count."""
+    totals = {area: 0.0 for area in SCORE_AREAS}
+    weights = {area: 0 for area in SCORE_AREAS}
+    bullets, seen = [], set()
+    errors = []
+
+    for size, result in batch_results:
+        if "error" in result:
+            errors.append(result["error"])
+            continue
+        for area in SCORE_AREAS:
+            value = result.get(area)
+            if isinstance(value, (int, float)):
+                totals[area] += value * size
+                weights[area] += size
+        for line in str(result.get("Justification", "")).split("\n"):
+            line = line.strip()
+            key = line.lower()
+            if line.startswith("-") and key not in seen:
+                seen.add(key)
+                bullets.append(line)
+
+    if not any(weights.values()):
+        return {"error": errors[0] if errors else "No batch could be assessed."}
+
+    merged = {area: round(totals[area] / weights[area]) for area in SCORE_AREAS if weights[area]}
+    merged["Justification"] = "\n".join(bullets[:MAX_JUSTIFICATION_BULLETS])
+    if errors:
+        merged["Batch Errors"] = f"{len(errors)} of {len(batch_results)} batch(es) failed: {errors[0]}"
+    return merged
+
+
+def assess_portfolio_chunked(assess_batch, files, token_budget=DEFAULT_BATCH_TOKENS, max_workers=4, on_progress=None):
+    """`assess_batch(prompt) -> dict` performs one LLM call and parses its JSON."""
+    batches = pack_batches(files, token_budget)
+    if not batches:
+        return {"error": "No interviews to assess."}
+
+    prompts = [build_batch_prompt(batch, i + 1, len(batches)) for i, batch in enumerate(batches)]
+
+    def run(prompt):
+        try:
+            return assess_batch(prompt)
+        except Exception as e:
+            return {"error": str(e)}
+
+    results = [None] * len(prompts)
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(prompts)))) as pool:
+        futures = {pool.submit(run, prompt): i for i, prompt in enumerate(prompts)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if on_progress is not None:
+                on_progress(done, len(prompts))
+
+    return reduce_scores([(len(batch), result) for batch, result in zip(batches, results)])
+
+
+# --- Single-prompt and entry-point assessment ---
+
+def gpt_assess_batch(prompt):
+    content = llm_gateway.chat(
+        "gpt-3.5-turbo",
+        [{"role": "user", "content": prompt}],
+        temperature=0.3
+    )
+    return json.loads(content)
+
+
+def portfolio_prompt(files):
+    encoded = compact_interviews(files, "governance")["text"]
+
+    return (
+        "You are an experienced enterprise architecture consultant.\n\n"
+        "You are analyzing a portfolio of stakeholder interviews from various systems. "
+        "Each interview is one row of assessment and metadata fields.\n\n"
+        "Below is the full set of interviews:\n"
+        f"{encoded}\n\n"
+        "Your task:\n"
+        "1. Score the overall governance maturity of this portfolio across the following areas (0-100):\n"
+        "- TOGAF Compliance\n"
+        "- NORA Alignment\n"
+        "- Business-IT Alignment\n"
+        "- Digital Maturity\n"
+        "- Technical Debt (lower = better)\n"
+        "- Completeness\n\n"
+        "2. Provide a concise analysis using bullet points (not a paragraph) that:\n"
+        "- Highlights strengths with justifications\n"
+        "- Lists clear weaknesses or gaps and their likely impact\n"
+        "- Recommends specific improvements or actions\n"
+        "- Uses clear and formal bullet points with no introduction or conclusion\n\n"
+        "Return only a JSON object in this format:\n"
+        "{\n"
+        "  \"TOGAF Compliance\": 78,\n"
+        "  \"NORA Alignment\": 65,\n"
+        "  ...\n"
+        "  \"Justification\": \"- Bullet 1\\n- Bullet 2\\n- Bullet 3\"\n"
+        "}"
+    )
+
+
+@metrics.timed("gpt_assess_portfolio", mode="full")
+def assess_portfolio(files, chunked=None, on_token=None, on_progress=None):
+    if chunked is None:
+        chunked = portfolio_tokens(files) > DEFAULT_BATCH_TOKENS
+    if chunked:
+        return assess_portfolio_chunked(gpt_assess_batch, files, on_progress=on_progress)
+
+    prompt = portfolio_prompt(files)
+    try:
+        if on_token is None:
+            return gpt_assess_batch(prompt)
+        content = ""
+        for delta in llm_gateway.stream("gpt-3.5-turbo", [{"role": "user", "content": prompt}], temperature=0.3):
+            content += delta
+            on_token(content)
+        return json.loads(content)
+    except Exception as e:
+        return {"error": str(e)}
+
+
+# --- Incremental per-interview assessment ---
+# Each interview is scored once and stored under its content hash; portfolio
+# scores are an aggregation over the stored rows. Only new or edited interviews
+# reach the model, so an unchanged portfolio costs zero LLM calls.
+
+def _connect(db_path):
+    folder = os.path.dirname(db_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS interview_scores ("
+        "interview_hash TEXT PRIMARY KEY, scores TEXT NOT NULL, justification TEXT, assessed_at TEXT NOT NULL)"
+    )
+    return conn
+
+
+def load_scores(hashes, db_path=GOVERNANCE_DB_PATH):
+    stored = {}
+    hashes = list(hashes)
+    with closing(_connect(db_path)) as conn:
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            rows = conn.execute(
+                f"SELECT interview_hash, scores, justification FROM interview_scores "
+                f"WHERE interview_hash IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            for h, scores, justification in rows:
+                stored[h] = {**json.loads(scores), "Justification": justification or ""}
+    return stored
+
+
+def store_scores(results, db_path=GOVERNANCE_DB_PATH):
+    now = datetime.now().isoformat(timespec="seconds")
+    with closing(_connect(db_path)) as conn, conn:
+        conn.executemany(
+            "INSERT OR REPLACE INTO interview_scores (interview_hash, scores, justification, assessed_at) VALUES (?, ?, ?, ?)",
+            [
+                (
+                    h,
+                    json.dumps({a: r[a] for a in SCORE_AREAS if isinstance(r.get(a), (int, float))}),
+                    str(r.get("Justification", "")),
+                    now,
+                )
+                for h, r in results.items()
+            ],
+        )
+
+
+def build_interview_prompt(items):
+    return (
+        "You are an experienced enterprise architecture consultant.\n\n"
+        "Score EACH stakeholder interview below individually. Every line is `<id> <compact JSON interview>`.\n\n"
+        + "\n".join(f"{item_id} {encoded}" for item_id, encoded in items)
+        + "\n\nFor every id give 0-100 scores for: "
+        + ", ".join(SCORE_AREAS)
+        + " (for Technical Debt lower = better) and at most 2 concise bullets on gaps or recommended actions.\n\n"
+        "Return only a JSON object keyed by id, in this format:\n"
+        "{\n"
+        "  \"<id>\": {\"TOGAF Compliance\": 78, ..., \"Justification\": \"- Bullet 1\\n- Bullet 2\"}\n"
+        "}"
+    )
+
+
+# Interviews whose scoring failed are not re-sent on every page load for a while
+FAILURE_RETRY_SECONDS = 300
+_failures = {}  # hash -> (failed_at, error)
+_failures_lock = threading.Lock()
+
+
+def recent_failures(hashes, now=None):
+    """{hash: error} for interviews that failed to score within FAILURE_RETRY_SECONDS."""
+    now = time.monotonic() if now is None else now
+    with _failures_lock:
+        for h, (failed_at, _) in list(_failures.items()):
+            if now - failed_at > FAILURE_RETRY_SECONDS:
+                del _failures[h]
+        return {h: _failures[h][1] for h in hashes if h in _failures}
+
+
+def _remember_failures(errors):
+    now = time.monotonic()
+    with _failures_lock:
+        _failures.update({h: (now, error) for h, error in errors.items()})
+
+
+def score_interviews(interviews_by_hash, token_budget=DEFAULT_BATCH_TOKENS, max_workers=4, on_progress=None):
+    """Score {hash: interview} with the model.
+
+    Returns ({hash: result}, {hash: error}); like assess_portfolio_chunked, a failed batch
+    reports its exception text instead of disappearing.
+    """
+    items = [(h[:12], h, encode_interview(interview)) for h, interview in interviews_by_hash.items()]
+    batches, current, used = [], [], 0
+    for item in items:
+        cost = estimate_tokens(item[2])
+        if current and used + cost > token_budget:
+            batches.append(current)
+            current, used = [], 0
+        current.append(item)
+        used += cost
+    if current:
+        batches.append(current)
+
+    def run(batch):
+        try:
+            return batch, gpt_assess_batch(build_interview_prompt([(short, encoded) for short, _, encoded in batch])), None
+        except Exception as e:
+            return batch, {}, str(e)
+
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(batches) or 1))) as pool:
+        for done, future in enumerate(as_completed([pool.submit(run, b) for b in batches]), start=1):
+            batch, reply, error = future.result()
+            for short, full, _ in batch:
+                scored = reply.get(short) if isinstance(reply, dict) else None
+                if isinstance(scored, dict):
+                    results[full] = scored
+                else:
+                    errors[full] = error or "No scores returned for this interview."
+            if on_progress is not None:
+                on_progress(done, len(batches))
+    return results, errors
+
+
+def aggregate_scores(per_interview):
+    """Portfolio scores = mean of the stored per-interview scores (deterministic)."""
+    return reduce_scores([(1, result) for result in per_interview])
+
+
+@metrics.timed("gpt_assess_portfolio", mode="incremental")
+def assess_portfolio_incremental(files, db_path=GOVERNANCE_DB_PATH, on_progress=None):
+    hashes = [interview_hash(f) for f in files]
+    stored = load_scores(set(hashes), db_path)
+    errors = recent_failures(h for h in hashes if h not in stored)
+    pending = {h: f for h, f in zip(hashes, files) if h not in stored and h not in errors}
+    reused = sum(1 for h in hashes if h in stored)
+
+    if pending:
+        fresh, failed = score_interviews(pending, on_progress=on_progress)
+        store_scores(fresh, db_path)
+        stored.update({h: {**r, "Justification": str(r.get("Justification", ""))} for h, r in fresh.items()})
+        _remember_failures(failed)
+        errors.update(failed)
+
+    result = aggregate_scores([stored[h] for h in hashes if h in stored])
+    if "error" in result:
+        if errors:
+            result["error"] = next(iter(errors.values()))
+        return result
+
+    scored = len(pending) - sum(1 for h in pending if h in errors)
+    result["Assessment"] = (
+        f"{scored} new/changed interview(s) scored, {reused} reused from stored results"
+        + (f", {len(errors)} could not be scored" if errors else "")
+    )
+    if errors:
+        result["Batch Errors"] = (
+            f"{len(errors)} interview(s) could not be scored (retried after {FAILURE_RETRY_SECONDS // 60} min): "
+            + next(iter(errors.values()))
+        )
+    return result
@@ -0,0 +1,167 @@
+# --- Heatmap rendering subsystem ---
+# Renders count/score matrices to PNG with an object-oriented matplotlib Figure
+# (no pyplot global state, always closed), caches the bytes by a hash of the
+# data and styling, and reduces large matrices to top-N / clustered / paged
+# views before drawing. An interactive Altair renderer is offered as a
+# lightweight alternative to the static image.
+import io
+import hashlib
+import threading
+from collections import OrderedDict
+
+import metrics
+
+MAX_ROWS = 30
+MAX_COLS = 30
+ANNOTATE_MAX_CELLS = 400
+PNG_CACHE_SIZE = 64
+
+VIEW_MODES = ["Top N", "Clustered", "Paginated"]
+
+_png_cache = OrderedDict()
+_png_lock = threading.Lock()
+stats = {"hits": 0, "misses": 0}
+
+
+def matrix_hash(matrix, *params):
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(matrix, index=True).values.tobytes())
+    digest.update(repr((list(matrix.columns), params)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def is_large(matrix, max_rows=MAX_ROWS, max_cols=MAX_COLS):
+    return matrix.shape[0] > max_rows or matrix.shape[1] > max_cols
+
+
+def _seriate(matrix, axis):
+    # Order rows (or columns) by the position of their heaviest cell, so similar
+    # profiles end up next to each other without needing scipy
+    values = matrix if axis == 0 else matrix.T
+    order = sorted(range(len(values)), key=lambda i: (int(values.iloc[i].values.argmax()), -values.iloc[i].sum()))
+    labels = values.index[order]
+    return matrix.loc[labels] if axis == 0 else matrix[labels]
+
+
+def reduce_matrix(matrix, mode="Top N", max_rows=MAX_ROWS, max_cols=MAX_COLS, page=0):
+    """Return (view, caption) with at most max_rows x max_cols cells."""
+    if not is_large(matrix, max_rows, max_cols):
+        return matrix, None
+
+    top_cols = matrix.sum(axis=0).sort_values(ascending=False).index[:max_cols]
+    view = matrix[top_cols]
+
+    if mode == "Paginated":
+        pages = max(1, -(-len(view) // max_rows))
+        page = min(max(page, 0), pages - 1)
+        view = view.iloc[page * max_rows:(page + 1) * max_rows]
+        caption = f"Rows {page * max_rows + 1}–{page * max_rows + len(view)} of {len(matrix)} (page {page + 1}/{pages})"
+    else:
+        top_rows = view.sum(axis=1).sort_values(ascending=False).index[:max_rows]
+        view = view.loc[top_rows]
+        if mode == "Clustered":
+            view = _seriate(_seriate(view, 0), 1)
+        caption = f"Showing top {len(view)} of {len(matrix)} rows"
+
+    if len(top_cols) < matrix.shape[1]:
+        caption += f" and top {len(top_cols)} of {matrix.shape[1]} columns"
+    return view, caption
+
+
+def render_png(matrix, title="", xlabel="", ylabel="", cmap="YlGnBu", fmt="d", cbar=True, figsize=None):
+    key = matrix_hash(matrix, title, xlabel, ylabel, cmap, fmt, cbar, figsize)
+    with _png_lock:
+        if key in _png_cache:
+            _png_cache.move_to_end(key)
+            stats["hits"] += 1
+            return _png_cache[key]
+        stats["misses"] += 1
+
+    with metrics.timer("heatmap_render"):
+        png = _draw_png(matrix, title, xlabel, ylabel, cmap, fmt, cbar, figsize)
+
+    with _png_lock:
+        _png_cache[key] = png
+        while len(_png_cache) > PNG_CACHE_SIZE:
+            _png_cache.popitem(last=False)
+    return png
+
+
+def _draw_png(matrix, title, xlabel, ylabel, cmap, fmt, cbar, figsize):
+    from matplotlib.figure import Figure
+    import seaborn as sns
+
+    rows, cols = matrix.shape
+    if figsize is None:
+        figsize = (min(4 + cols * 0.5, 24), min(2 + rows * 0.4, 18))
+    fig = Figure(figsize=figsize)
+    try:
+        ax = fig.subplots()
+        sns.heatmap(
+            matrix, annot=rows * cols <= ANNOTATE_MAX_CELLS, fmt=fmt, cmap=cmap,
+            linewidths=0.5, cbar=cbar, ax=ax
+        )
+        ax.set_title(title, fontsize=14)
+        ax.set_xlabel(xlabel)
+        ax.set_ylabel(ylabel)
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png", bbox_inches="tight", dpi=100)
+    finally:
+        fig.clf()
+    return buffer.getvalue()
+
+
+@metrics.register_collector
+def _collect():
+    lookups = stats["hits"] + stats["misses"]
+    return [
+        ("heatmap_png_cache_hits", stats["hits"], {}, "counter"),
+        ("heatmap_png_cache_misses", stats["misses"], {}, "counter"),
+        ("heatmap_png_cache_hit_ratio", stats["hits"] / lookups if lookups else 0.0, {}, "gauge"),
+    ]
+
+
+def altair_chart(matrix, xlabel="", ylabel="", scheme="yellowgreenblue"):
+    import altair as alt
+
+    long = matrix.copy()
+    long.index = long.index.astype(str)
+    long.columns = long.columns.astype(str)
+    long = long.rename_axis(index="row", columns="column").stack().rename("value").reset_index()
+    return (
+        alt.Chart(long)
+        .mark_rect()
+        .encode(
+            x=alt.X("column:N", title=xlabel, sort=list(matrix.columns.astype(str))),
+            y=alt.Y("row:N", title=ylabel, sort=list(matrix.index.astype(str))),
+            color=alt.Color("value:Q", scale=alt.Scale(scheme=scheme)),
+            tooltip=["row", "column", "value"],
+        )
+    )
+
+
+def show_heatmap(matrix, title="", xlabel="", ylabel="", cmap="YlGnBu", fmt="d", cbar=True, figsize=None, key="heatmap"):
+    """Streamlit front-end: picks a reduced view for large matrices and the renderer."""
+    import streamlit as st
+
+    view, caption = matrix, None
+    if is_large(matrix):
+        col1, col2 = st.columns(2)
+        with col1:
+            mode = st.radio("Large matrix view", VIEW_MODES, horizontal=True, key=f"{key}_mode")
+        page = 0
+        if mode == "Paginated":
+            pages = max(1, -(-len(matrix) // MAX_ROWS))
+            with col2:
+                page = st.number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page") - 1
+        view, caption = reduce_matrix(matrix, mode, page=page)
+
+    interactive = st.toggle("🖱️ Interactive heatmap", value=False, key=f"{key}_interactive")
+    if interactive:
+        st.altair_chart(altair_chart(view, xlabel, ylabel), use_container_width=True)
+    else:
+        st.image(render_png(view, title, xlabel, ylabel, cmap, fmt, cbar, figsize))
+    if caption:
+        st.caption(caption)
@@ -0,0 +1,194 @@
+# --- Integration graph index ---
+# Adjacency-indexed view of every interface reported by Application Owners.
+# App names are normalized ("XYZ Core banking" == "XYZ Core Banking") and the
+# index is synced per interview file, so only new or changed files are
+# re-applied when the catalogue grows.
+import re
+import threading
+from collections import Counter, defaultdict, deque
+
+_WHITESPACE = re.compile(r"\s+")
+_PUNCTUATION = re.compile(r"[_\-/\\.]+")
+
+
+def normalize_app_name(name):
+    name = _PUNCTUATION.sub(" ", str(name or ""))
+    return _WHITESPACE.sub(" ", name).strip().lower()
+
+
+def interview_edges(interview):
+    app_name = interview.get("application_name") or "Unknown"
+    edges = []
+    for entry in interview.get("integrations") or []:
+        if not isinstance(entry, dict):
+            continue
+        source = entry.get("Source App") or app_name
+        target = entry.get("Target App") or ""
+        if normalize_app_name(source) and normalize_app_name(target):
+            edges.append((source, target))
+    return edges
+
+
+class IntegrationGraph:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._files = {}  # filename -> (interview dict, [(source, target), ...])
+        self.outgoing = defaultdict(Counter)
+        self.incoming = defaultdict(Counter)
+        self._labels = defaultdict(Counter)  # key -> spelling counts
+
+    # --- Maintenance ---
+
+    def _apply(self, edges, sign):
+        for source, target in edges:
+            s, t = normalize_app_name(source), normalize_app_name(target)
+            for key, label in ((s, source), (t, target)):
+                self._labels[key][label.strip()] += sign
+                if self._labels[key][label.strip()] <= 0:
+                    del self._labels[key][label.strip()]
+                if not self._labels[key]:
+                    del self._labels[key]
+            self.outgoing[s][t] += sign
+            self.incoming[t][s] += sign
+            if self.outgoing[s][t] <= 0:
+                del self.outgoing[s][t]
+                del self.incoming[t][s]
+            for adjacency, key in ((self.outgoing, s), (self.incoming, t)):
+                if not adjacency[key]:
+                    del adjacency[key]
+
+    def add_interview(self, filename, interview):
+        with self._lock:
+            self.remove_interview(filename)
+            edges = interview_edges(interview)
+            self._files[filename] = (interview, edges)
+            self._apply(edges, 1)
+
+    def remove_interview(self, filename):
+        with self._lock:
+            previous = self._files.pop(filename, None)
+            if previous is not None:
+                self._apply(previous[1], -1)
+
+    def sync(self, records):
+        """Bring the index in line with `{filename: interview}`; returns the number of files re-applied."""
+        changed = 0
+        with self._lock:
+            for filename in list(self._files):
+                if filename not in records:
+                    self.remove_interview(filename)
+                    changed += 1
+            for filename, interview in records.items():
+                current = self._files.get(filename)
+                # The catalogue store hands out the same dict until the file changes
+                if current is not None and current[0] is interview:
+                    continue
+                self.add_interview(filename, interview)
+                changed += 1
+        return changed
+
+    # --- Queries ---
+
+    def label(self, key):
+        spellings = self._labels.get(key)
+        return spellings.most_common(1)[0][0] if spellings else key
+
+    def nodes(self):
+        with self._lock:
+            return sorted(self.label(key) for key in self._labels)
+
+    def _traverse(self, app, adjacency, max_depth=None):
+        start = normalize_app_name(app)
+        distances = {}
+        queue = deque([(start, 0)])
+        seen = {start}
+        while queue:
+            node, depth = queue.popleft()
+            if max_depth is not None and depth >= max_depth:
+                continue
+            for neighbour in adjacency.get(node, ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    distances[neighbour] = depth + 1
+                    queue.append((neighbour, depth + 1))
+        return [(self.label(node), hops) for node, hops in sorted(distances.items(), key=lambda x: (x[1], x[0]))]
+
+    def downstream(self, app, max_depth=None):
+        """Apps that (transitively) receive data from `app` — what breaks if it goes down."""
+        with self._lock:
+            return self._traverse(app, self.outgoing, max_depth)
+
+    def upstream(self, app, max_depth=None):
+        """Apps that `app` (transitively) depends on for its inbound data."""
+        with self._lock:
+            return self._traverse(app, self.incoming, max_depth)
+
+    def ranking(self, top=None):
+        with self._lock:
+            rows = [
+                {
+                    "Application": self.label(key),
+                    "Fan-in": len(self.incoming.get(key, ())),
+                    "Fan-out": len(self.outgoing.get(key, ())),
+                }
+                for key in self._labels
+            ]
+        rows.sort(key=lambda r: (-(r["Fan-in"] + r["Fan-out"]), r["Application"]))
+        return rows[:top] if top else rows
+
+    def cycles(self):
+        """Strongly connected components with more than one app (or a self-loop)."""
+        with self._lock:
+            graph = {node: list(targets) for node, targets in self.outgoing.items()}
+            index, low, on_stack, stack, components = {}, {}, set(), [], []
+            counter = 0
+
+            # Iterative Tarjan so deep dependency chains don't hit the recursion limit
+            for root in graph:
+                if root in index:
+                    continue
+                work = [(root, iter(graph.get(root, ())))]
+                index[root] = low[root] = counter
+                counter += 1
+                stack.append(root)
+                on_stack.add(root)
+                while work:
+                    node, neighbours = work[-1]
+                    advanced = False
+                    for neighbour in neighbours:
+                        if neighbour not in index:
+                            index[neighbour] = low[neighbour] = counter
+                            counter += 1
+                            stack.append(neighbour)
+                            on_stack.add(neighbour)
+                            work.append((neighbour, iter(graph.get(neighbour, ()))))
+                            advanced = True
+                            break
+                        if neighbour in on_stack:
+                            low[node] = min(low[node], index[neighbour])
+                    if advanced:
+                        continue
+                    work.pop()
+                    if work:
+                        parent = work[-1][0]
+                        low[parent] = min(low[parent], low[node])
+                    if low[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member == node:
+                                break
+                        if len(component) > 1 or node in graph.get(node, ()):
+                            components.append(sorted(self.label(m) for m in component))
+            return components
+
+
+_graph = IntegrationGraph()
+
+
+def get_graph(records=None):
+    if records is not None:
+        _graph.sync(records)
+    return _graph
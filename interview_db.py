@@ -0,0 +1,212 @@
+# --- Embedded SQLite backend for interview records ---
+# Optional storage backend (EA_STORAGE_BACKEND=sqlite). Each interview is written
+# in a single transaction together with its normalized integration edges, and
+# the indexed columns let the Builder answer heatmap / integration queries
+# without loading every interview.
+#
+# One-shot import of the existing files:
+#     python interview_db.py import [catalogues]
+import os
+import re
+import sys
+import json
+import sqlite3
+from contextlib import closing
+from datetime import datetime
+
+from settings import CATALOGUE_DIR, INTERVIEW_DB_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS interviews (
+    id INTEGER PRIMARY KEY,
+    source TEXT UNIQUE,
+    stakeholder_role TEXT COLLATE NOCASE,
+    application_name TEXT COLLATE NOCASE,
+    line_of_business TEXT COLLATE NOCASE,
+    category_type TEXT COLLATE NOCASE,
+    status TEXT COLLATE NOCASE,
+    business_domain TEXT COLLATE NOCASE,
+    payload TEXT NOT NULL,
+    saved_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_interviews_role ON interviews(stakeholder_role);
+CREATE INDEX IF NOT EXISTS idx_interviews_app ON interviews(application_name);
+CREATE INDEX IF NOT EXISTS idx_interviews_lob ON interviews(line_of_business);
+CREATE INDEX IF NOT EXISTS idx_interviews_category ON interviews(category_type);
+CREATE INDEX IF NOT EXISTS idx_interviews_status ON interviews(status);
+
+CREATE TABLE IF NOT EXISTS integrations (
+    id INTEGER PRIMARY KEY,
+    interview_id INTEGER NOT NULL REFERENCES interviews(id) ON DELETE CASCADE,
+    source_app TEXT,
+    target_app TEXT,
+    source_key TEXT,
+    target_key TEXT,
+    interface_type TEXT,
+    protocol TEXT,
+    frequency TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_integrations_interview ON integrations(interview_id);
+CREATE INDEX IF NOT EXISTS idx_integrations_source ON integrations(source_key);
+CREATE INDEX IF NOT EXISTS idx_integrations_target ON integrations(target_key);
+"""
+
+INDEXED_FIELDS = ["stakeholder_role", "application_name", "line_of_business", "category_type", "status", "business_domain"]
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_name(value):
+    return _WHITESPACE.sub(" ", str(value or "")).strip().lower()
+
+
+def _clean(value):
+    if value is None:
+        return None
+    return _WHITESPACE.sub(" ", str(value)).strip()
+
+
+def connect(db_path=INTERVIEW_DB_PATH):
+    folder = os.path.dirname(db_path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def integration_entries(data):
+    """Integration rows of one interview; a missing "Source App" means the interviewed app itself.
+
+    Shared with catalogue_builders.integration_rows so both backends read edges the same way.
+    """
+    app_name = data.get("application_name") or "Unknown"
+    integrations = data.get("integrations") or []
+    if not isinstance(integrations, list):
+        return []
+    return [
+        {
+            "Source App": entry.get("Source App") or app_name,
+            "Target App": entry.get("Target App", ""),
+            "Interface Type": entry.get("Interface Type", ""),
+            "Protocol": entry.get("Protocol", ""),
+            "Frequency": entry.get("Frequency", ""),
+        }
+        for entry in integrations
+        if isinstance(entry, dict)
+    ]
+
+
+def _write_interview(conn, data, source):
+    # Everything that can fail on bad input is prepared before the first statement
+    values = (
+        source,
+        *[_clean(data.get(field)) for field in INDEXED_FIELDS],
+        json.dumps(data, ensure_ascii=False, separators=(",", ":")),
+        datetime.now().isoformat(timespec="seconds"),
+    )
+    edges = [
+        (
+            row["Source App"], row["Target App"], normalize_name(row["Source App"]), normalize_name(row["Target App"]),
+            row["Interface Type"], row["Protocol"], row["Frequency"],
+        )
+        for row in integration_entries(data)
+    ]
+
+    # Re-importing the same source replaces the previous row and its edges
+    if source is not None:
+        conn.execute("DELETE FROM interviews WHERE source = ?", (source,))
+    cur = conn.execute(
+        "INSERT INTO interviews (source, stakeholder_role, application_name, line_of_business, "
+        "category_type, status, business_domain, payload, saved_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        values,
+    )
+    interview_id = cur.lastrowid
+    conn.executemany(
+        "INSERT INTO integrations (interview_id, source_app, target_app, source_key, target_key, "
+        "interface_type, protocol, frequency) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [(interview_id, *edge) for edge in edges],
+    )
+    return interview_id
+
+
+def save_interview(data, source=None, db_path=INTERVIEW_DB_PATH):
+    with closing(connect(db_path)) as conn:
+        with conn:
+            return _write_interview(conn, data, source)
+
+
+def import_catalogues(folder=CATALOGUE_DIR, db_path=INTERVIEW_DB_PATH):
+    imported, errors = 0, {}
+    with closing(connect(db_path)) as conn:
+        with conn:
+            for f in sorted(os.listdir(folder)):
+                if not f.endswith(".json"):
+                    continue
+                try:
+                    with open(os.path.join(folder, f), "r", encoding="utf-8") as file:
+                        data = json.load(file)
+                except Exception as e:
+                    errors[f] = str(e)
+                    continue
+                # One savepoint per file: a failed write keeps that file's previous row
+                conn.execute("SAVEPOINT import_file")
+                try:
+                    _write_interview(conn, data, f)
+                    imported += 1
+                except Exception as e:
+                    conn.execute("ROLLBACK TO import_file")
+                    errors[f] = str(e)
+                finally:
+                    conn.execute("RELEASE import_file")
+    return imported, errors
+
+
+# --- Read API ---
+
+def _query(sql, params=(), db_path=INTERVIEW_DB_PATH):
+    with closing(connect(db_path)) as conn:
+        return [dict(row) for row in conn.execute(sql, params)]
+
+
+def app_heatmap_rows(db_path=INTERVIEW_DB_PATH):
+    """Raw (Application, LOB, Category) rows; labels go through capability_pipeline.normalize_application_frame."""
+    rows = _query(
+        "SELECT COALESCE(application_name, 'Unnamed') AS application, "
+        "COALESCE(line_of_business, 'N/A') AS lob, "
+        "COALESCE(category_type, 'Unspecified') AS category "
+        "FROM interviews WHERE stakeholder_role LIKE '%application%'",
+        db_path=db_path,
+    )
+    return [
+        {"Application": r["application"], "Line of Business": r["lob"], "Category": r["category"]}
+        for r in rows
+    ]
+
+
+def integration_rows(app_name=None, db_path=INTERVIEW_DB_PATH):
+    sql = (
+        "SELECT source_app AS 'Source App', target_app AS 'Target App', "
+        "interface_type AS 'Interface Type', protocol AS 'Protocol', frequency AS 'Frequency' "
+        "FROM integrations"
+    )
+    params = ()
+    if app_name is not None:
+        key = normalize_name(app_name)
+        sql += " WHERE source_key = ? OR target_key = ?"
+        params = (key, key)
+    return _query(sql + " ORDER BY id", params, db_path)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "import":
+        folder = sys.argv[2] if len(sys.argv) > 2 else CATALOGUE_DIR
+        count, failed = import_catalogues(folder)
+        print(f"✅ Imported {count} interview(s) into {INTERVIEW_DB_PATH}")
+        for f, err in failed.items():
+            print(f"⚠️ Could not import {f}: {err}")
+    else:
+        print("Usage: python interview_db.py import [catalogue_dir]")
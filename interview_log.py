@@ -0,0 +1,224 @@
+# --- Append-only interview log ---
+# Interviews are appended as one compact JSON line each to numbered segment
+# files (segment-000001.jsonl, ...). Appends take an exclusive lock and issue a
+# single O_APPEND write, so concurrent writers never interleave lines. When
+# enough segments accumulate they are compacted into one segment holding only
+# the latest interview per entity. Readers memory-map segments and, because
+# segments are append-only, only parse bytes added since their last read.
+#
+#     python interview_log.py import [catalogues]   # migrate *.json files
+#     python interview_log.py compact
+import os
+import re
+import sys
+import json
+import mmap
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from settings import CATALOGUE_DIR, INTERVIEW_LOG_DIR, LOG_SEGMENT_MAX_BYTES, LOG_COMPACT_AFTER_SEGMENTS
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on O_APPEND + the in-process lock only
+    fcntl = None
+
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{6})\.jsonl$")
+_WHITESPACE = re.compile(r"\s+")
+
+_thread_lock = threading.Lock()
+
+
+def entity_key(data):
+    role = _WHITESPACE.sub(" ", str(data.get("stakeholder_role", ""))).strip().lower()
+    name = data.get("application_name") or data.get("business_domain") or "entity"
+    return f"{role}|{_WHITESPACE.sub(' ', str(name)).strip().lower()}"
+
+
+def list_segments(folder=INTERVIEW_LOG_DIR):
+    try:
+        names = os.listdir(folder)
+    except FileNotFoundError:
+        return []
+    return sorted(int(m.group(1)) for m in map(SEGMENT_PATTERN.match, names) if m)
+
+
+def segment_path(number, folder=INTERVIEW_LOG_DIR):
+    return os.path.join(folder, f"segment-{number:06d}.jsonl")
+
+
+@contextmanager
+def locked(folder=INTERVIEW_LOG_DIR):
+    os.makedirs(folder, exist_ok=True)
+    with _thread_lock:
+        with open(os.path.join(folder, ".lock"), "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _encode(entry):
+    return (json.dumps(entry, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+def _write_line(path, line):
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, line)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def append(data, name, folder=INTERVIEW_LOG_DIR):
+    """Append one interview; `name` is its file-style id (e.g. BusinessOwner_hr__20250101_120000.json).
+
+    Returns the log entry plus "segment", the segment file now holding it.
+    """
+    entry = {"name": name, "entity": entity_key(data), "saved_at": datetime.now().isoformat(timespec="seconds"), "data": data}
+    line = _encode(entry)
+    with locked(folder):
+        segments = list_segments(folder)
+        number = segments[-1] if segments else 1
+        path = segment_path(number, folder)
+        if os.path.exists(path) and os.path.getsize(path) + len(line) > LOG_SEGMENT_MAX_BYTES:
+            number += 1
+            path = segment_path(number, folder)
+        _write_line(path, line)
+        if len(list_segments(folder)) >= LOG_COMPACT_AFTER_SEGMENTS:
+            _compact(folder)
+            path = segment_path(list_segments(folder)[-1], folder)
+    return {**entry, "segment": path}
+
+
+def iter_entries(path, offset=0):
+    """Yield (end_offset, entry) for complete lines after `offset` using a memory map."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= offset:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            position = offset
+            while position < size:
+                end = mm.find(b"\n", position)
+                if end == -1:
+                    break  # partial line still being written
+                raw = mm[position:end]
+                position = end + 1
+                if raw.strip():
+                    try:
+                        yield position, json.loads(raw)
+                    except ValueError:
+                        yield position, None
+
+
+def _compact(folder):
+    segments = list_segments(folder)
+    if not segments:
+        return 0
+    latest = {}
+    for number in segments:
+        for _, entry in iter_entries(segment_path(number, folder)):
+            if entry is not None:
+                latest.pop(entry["entity"], None)  # re-insert to keep save order
+                latest[entry["entity"]] = entry
+
+    target = segment_path(segments[-1] + 1, folder)
+    tmp = target + ".tmp"
+    with open(tmp, "wb") as f:
+        for entry in latest.values():
+            f.write(_encode(entry))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, target)
+    for number in segments:
+        os.remove(segment_path(number, folder))
+    return len(latest)
+
+
+def compact(folder=INTERVIEW_LOG_DIR):
+    with locked(folder):
+        return _compact(folder)
+
+
+class LogReader:
+    """Incrementally tails the log; parsed dicts stay the same objects between refreshes."""
+
+    def __init__(self, folder=INTERVIEW_LOG_DIR):
+        self.folder = folder
+        self._offsets = {}  # segment number -> (inode, bytes consumed)
+        self._entries = {}  # segment number -> {name: data}
+        self.errors = 0
+
+    def refresh(self):
+        """Return (records, changed) where records maps name -> interview dict in log order."""
+        changed = False
+        segments = list_segments(self.folder)
+        for number in list(self._entries):
+            if number not in segments:
+                del self._entries[number]
+                del self._offsets[number]
+                changed = True
+
+        for number in segments:
+            path = segment_path(number, self.folder)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            inode, offset = self._offsets.get(number, (stat.st_ino, 0))
+            if inode != stat.st_ino:
+                offset = 0
+                self._entries[number] = {}
+            entries = self._entries.setdefault(number, {})
+            try:
+                for end, entry in iter_entries(path, offset):
+                    offset = end
+                    if entry is None:
+                        self.errors += 1
+                        continue
+                    entries[entry["name"]] = entry["data"]
+                    changed = True
+            except FileNotFoundError:
+                # Compaction removed the segment between listing and reading
+                continue
+            self._offsets[number] = (stat.st_ino, offset)
+
+        records = {}
+        for number in sorted(self._entries):
+            records.update(self._entries[number])
+        return records, changed
+
+
+def import_catalogues(folder=CATALOGUE_DIR, log_dir=INTERVIEW_LOG_DIR):
+    """Append every *.json interview in `folder`; returns (imported, {file: error}) like interview_db."""
+    imported, errors = 0, {}
+    for f in sorted(os.listdir(folder)):
+        if not f.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(folder, f), "r", encoding="utf-8") as file:
+                data = json.load(file)
+            append(data, f, log_dir)
+            imported += 1
+        except Exception as e:
+            errors[f] = str(e)
+    return imported, errors
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "import":
+        count, failed = import_catalogues(sys.argv[2] if len(sys.argv) > 2 else CATALOGUE_DIR)
+        print(f"✅ Appended {count} interview(s) to {INTERVIEW_LOG_DIR}")
+        for f, err in failed.items():
+            print(f"⚠️ Could not import {f}: {err}")
+    elif command == "compact":
+        print(f"✅ Compacted log to {compact()} interview(s)")
+    else:
+        print("Usage: python interview_log.py import [catalogue_dir] | compact")
@@ -0,0 +1,172 @@
+# --- Interview persistence ---
+# Saving a finished interview is safe with many concurrent writers (several
+# sessions, several Streamlit replicas on shared storage):
+# - ids are collision-free: <Role>_<entity>__<timestamp>_<random>.json
+# - files are written to a temp file, fsynced and renamed into place, so readers
+#   never see a half-written interview and an existing file is never replaced
+# - every interview carries a save token; the first save under a token leaves a
+#   receipt, and any later save with the same token (Streamlit reruns, a retry
+#   from another replica) returns that receipt instead of writing a duplicate.
+#   Check-and-write happens under an exclusive lock on the catalogue folder.
+#   Receipts older than RECEIPT_TTL_SECONDS are pruned (at most hourly), since
+#   duplicate saves only come from reruns and retries shortly after the first.
+import os
+import re
+import json
+import uuid
+import time
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import metrics
+from settings import CATALOGUE_DIR, RECEIPT_TTL_SECONDS, STORAGE_BACKEND
+
+try:
+    import fcntl
+except ImportError:  # Windows: rely on the in-process lock and O_EXCL receipts only
+    fcntl = None
+
+RECEIPTS_DIR = ".receipts"
+PRUNE_INTERVAL_SECONDS = 3600
+_UNSAFE = re.compile(r"[^\w\-]+", re.UNICODE)
+
+_thread_lock = threading.Lock()
+_last_prune = {}  # folder -> time.time() of the last receipt pruning in this process
+
+
+def new_token():
+    return uuid.uuid4().hex
+
+
+def safe_part(value, default="entity"):
+    value = _UNSAFE.sub("_", str(value or "")).strip("_")
+    # "__" separates the entity from the timestamp (see capability_pipeline.LOB_FROM_FILENAME)
+    return re.sub(r"_{2,}", "_", value) or default
+
+
+def interview_id(data, now=None):
+    role_prefix = safe_part(str(data.get("stakeholder_role", "")).replace(" ", ""), "Stakeholder")
+    name = safe_part(data.get("application_name") or data.get("business_domain"))
+    timestamp = (now or datetime.now()).strftime("%Y%m%d_%H%M%S")
+    return f"{role_prefix}_{name}__{timestamp}_{uuid.uuid4().hex[:8]}.json"
+
+
+@contextmanager
+def locked(folder=CATALOGUE_DIR):
+    os.makedirs(folder, exist_ok=True)
+    with _thread_lock:
+        with open(os.path.join(folder, ".lock"), "a+b") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _fsync_dir(folder):
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(folder, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def write_atomic(path, payload):
+    """Write bytes to `path` via temp file + rename; refuses to replace an existing file."""
+    folder = os.path.dirname(path) or "."
+    os.makedirs(folder, exist_ok=True)
+    tmp = os.path.join(folder, f".{os.path.basename(path)}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp, "xb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            # link() fails if the target exists, unlike replace()
+            os.link(tmp, path)
+        except FileExistsError:
+            raise
+        except (AttributeError, NotImplementedError, OSError):
+            # No hard links here (EPERM, EOPNOTSUPP, EXDEV on some network/shared filesystems)
+            if os.path.exists(path):
+                raise FileExistsError(path)
+            os.replace(tmp, path)
+        _fsync_dir(folder)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _receipt_path(token, folder):
+    return os.path.join(folder, RECEIPTS_DIR, safe_part(token, "token") + ".json")
+
+
+def load_receipt(token, folder=CATALOGUE_DIR):
+    try:
+        with open(_receipt_path(token, folder), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def prune_receipts(folder=CATALOGUE_DIR, ttl=RECEIPT_TTL_SECONDS, now=None):
+    """Delete receipts older than `ttl` seconds; returns how many were removed."""
+    now = time.time() if now is None else now
+    removed = 0
+    receipts = os.path.join(folder, RECEIPTS_DIR)
+    try:
+        entries = list(os.scandir(receipts))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.name.endswith(".json") and now - entry.stat().st_mtime > ttl:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass  # pruned concurrently by another replica
+    return removed
+
+
+def save_interview(data, token, backend=STORAGE_BACKEND, folder=CATALOGUE_DIR):
+    """Persist a finished interview once per `token`.
+
+    Returns a receipt {"id", "location", "backend", "saved_at", "created"}; "created" is
+    False when the interview had already been saved under this token.
+    """
+    with locked(folder):
+        receipt = load_receipt(token, folder)
+        if receipt is not None:
+            return {**receipt, "created": False}
+
+        name = interview_id(data)
+        if backend == "jsonl":
+            import interview_log
+            location = interview_log.append(data, name)["segment"]
+        else:
+            location = os.path.join(folder, name)
+            write_atomic(location, json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8"))
+
+        if backend == "sqlite":
+            import interview_db
+            interview_db.save_interview(data, source=name)
+
+        receipt = {"id": name, "location": location, "backend": backend, "saved_at": datetime.now().isoformat(timespec="seconds")}
+        write_atomic(_receipt_path(token, folder), json.dumps(receipt).encode("utf-8"))
+
+        if time.time() - _last_prune.get(folder, 0) > PRUNE_INTERVAL_SECONDS:
+            _last_prune[folder] = time.time()
+            metrics.inc("receipts_pruned", prune_receipts(folder))
+
+    # Outside the folder lock; a missed update is caught up on the next page load
+    try:
+        import portfolio_summary
+        portfolio_summary.record(name, data)
+    except Exception:
+        metrics.inc("portfolio_summary_errors")
+    return {**receipt, "created": True}
@@ -0,0 +1,222 @@
+# --- Background job runner ---
+# Long LLM deliverables run on a process-wide thread pool instead of inside the
+# Streamlit script, so navigating away or reconnecting does not lose them. Every
+# job is persisted in a SQLite table (status, progress, result), which lets any
+# session look up a job id and pick up the finished result.
+#
+# Several replicas may share the table. Each queue stamps its jobs with an owner
+# id and heartbeats them while they are queued or running; only jobs whose
+# heartbeat has gone stale (their process stopped) are marked "interrupted", and
+# those can be resumed because their kind and parameters are stored with them.
+# Finished jobs are deleted after JOB_RETENTION_SECONDS.
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import hashlib
+import threading
+import traceback
+from contextlib import closing
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from settings import JOB_DB_PATH, JOB_HEARTBEAT_SECONDS, JOB_MAX_WORKERS, JOB_RETENTION_SECONDS, JOB_STALE_SECONDS
+
+QUEUED, RUNNING, DONE, FAILED, INTERRUPTED = "queued", "running", "done", "failed", "interrupted"
+ACTIVE = (QUEUED, RUNNING)
+FINISHED = (DONE, FAILED, INTERRUPTED)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    title TEXT,
+    params TEXT NOT NULL,
+    params_hash TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress REAL NOT NULL DEFAULT 0,
+    message TEXT,
+    result TEXT,
+    error TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    owner TEXT,
+    heartbeat_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status);
+CREATE INDEX IF NOT EXISTS idx_jobs_kind_hash ON jobs(kind, params_hash);
+"""
+
+# Columns added after the first release; older job databases get them on open
+MIGRATIONS = {"owner": "ALTER TABLE jobs ADD COLUMN owner TEXT", "heartbeat_at": "ALTER TABLE jobs ADD COLUMN heartbeat_at REAL"}
+
+_job_kinds = {}
+
+
+def job(kind):
+    """Register `func(params, report) -> result`; `report(progress, message)` updates the job row."""
+    def register(func):
+        _job_kinds[kind] = func
+        return func
+    return register
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _params_hash(kind, params):
+    return hashlib.sha256(json.dumps([kind, params], sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class JobQueue:
+    def __init__(self, db_path=JOB_DB_PATH, max_workers=JOB_MAX_WORKERS, heartbeat=JOB_HEARTBEAT_SECONDS,
+                 stale_after=JOB_STALE_SECONDS, retention=JOB_RETENTION_SECONDS):
+        self.db_path = db_path
+        folder = os.path.dirname(db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.heartbeat, self.stale_after, self.retention = heartbeat, stale_after, retention
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, ddl in MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(ddl)
+        self.maintain()
+        if heartbeat > 0:
+            threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True).start()
+
+    def _heartbeat_loop(self):
+        while not self._stopped.wait(self.heartbeat):
+            try:
+                self.maintain()
+            except sqlite3.Error:
+                pass  # the DB is busy or briefly unavailable; try again next beat
+
+    def maintain(self, now=None):
+        """Heartbeat this queue's active jobs, reclaim other owners' stale ones and prune old finished jobs."""
+        now = time.time() if now is None else now
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"UPDATE jobs SET heartbeat_at = ? WHERE owner = ? AND status IN ({', '.join('?' * len(ACTIVE))})",
+                (now, self.owner, *ACTIVE),
+            )
+            # Rows from before heartbeats existed have no owner; they can only be left over from a restart
+            conn.execute(
+                f"UPDATE jobs SET status = ?, message = ?, updated_at = ? WHERE status IN ({', '.join('?' * len(ACTIVE))}) "
+                "AND (heartbeat_at IS NULL OR heartbeat_at < ?)",
+                (INTERRUPTED, "Interrupted by a restart – resume to run it again.", _now(), *ACTIVE, now - self.stale_after),
+            )
+            cutoff = datetime.fromtimestamp(now - self.retention).isoformat(timespec="seconds")
+            conn.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' * len(FINISHED))}) AND updated_at < ?",
+                (*FINISHED, cutoff),
+            )
+
+    def close(self):
+        self._stopped.set()
+        self.pool.shutdown(wait=False)
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _update(self, job_id, **fields):
+        fields["updated_at"] = _now()
+        fields["heartbeat_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE id = ?", (*fields.values(), job_id))
+
+    def _run(self, job_id, kind, params):
+        func = _job_kinds.get(kind)
+        if func is None:
+            self._update(job_id, status=FAILED, error=f"Unknown job kind: {kind}")
+            return
+
+        def report(progress, message=None):
+            self._update(job_id, progress=max(0.0, min(1.0, float(progress))), message=message)
+
+        self._update(job_id, status=RUNNING, message="Started")
+        try:
+            result = func(params, report)
+            self._update(
+                job_id, status=DONE, progress=1.0, message="Finished",
+                result=json.dumps(result, ensure_ascii=False, default=str),
+            )
+        except Exception as e:
+            self._update(job_id, status=FAILED, error=f"{e}\n{traceback.format_exc(limit=5)}")
+
+    def submit(self, kind, params, title=None):
+        """Queue a job and return its id; an identical queued/running job is reused."""
+        params_hash = _params_hash(kind, params)
+        with self._lock:
+            with closing(self._connect()) as conn, conn:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE kind = ? AND params_hash = ? AND status IN (?, ?) ORDER BY created_at DESC",
+                    (kind, params_hash, *ACTIVE),
+                ).fetchone()
+                if row is not None:
+                    return row["id"]
+                job_id = uuid.uuid4().hex
+                now = _now()
+                conn.execute(
+                    "INSERT INTO jobs (id, kind, title, params, params_hash, status, message, created_at, updated_at, "
+                    "owner, heartbeat_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        job_id, kind, title or kind, json.dumps(params, ensure_ascii=False), params_hash, QUEUED, "Queued",
+                        now, now, self.owner, time.time(),
+                    ),
+                )
+        self.pool.submit(self._run, job_id, kind, params)
+        return job_id
+
+    def resume(self, job_id):
+        record = self.get(job_id)
+        if record is None or record["status"] in ACTIVE or record["status"] == DONE:
+            return job_id
+        self._update(job_id, status=QUEUED, progress=0.0, message="Queued", error=None, result=None, owner=self.owner)
+        self.pool.submit(self._run, job_id, record["kind"], record["params"])
+        return job_id
+
+    @staticmethod
+    def _decode(row):
+        record = dict(row)
+        record["params"] = json.loads(record["params"])
+        record["result"] = json.loads(record["result"]) if record["result"] else None
+        return record
+
+    def get(self, job_id):
+        with closing(self._connect()) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._decode(row) if row is not None else None
+
+    def recent(self, kind=None, limit=20):
+        sql, params = "SELECT * FROM jobs", []
+        if kind is not None:
+            sql += " WHERE kind = ?"
+            params.append(kind)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with closing(self._connect()) as conn:
+            return [self._decode(row) for row in conn.execute(sql, params)]
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
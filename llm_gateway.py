@@ -0,0 +1,227 @@
+# --- Shared LLM gateway ---
+# Every page routes its chat completions through this module instead of owning an
+# OpenAI client. Calls run on one bounded worker pool, wait on a token bucket so
+# concurrent sessions stay under the API rate limit, retry transient failures
+# with exponential backoff + jitter, and identical in-flight prompts are
+# coalesced into a single request. Latency and token usage are recorded per model.
+import os
+import json
+import time
+import random
+import hashlib
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import metrics
+from settings import LLM_MAX_WORKERS, LLM_REQUESTS_PER_MINUTE, LLM_BURST, LLM_MAX_RETRIES, LLM_TIMEOUT_SECONDS
+
+
+class TokenBucket:
+    """Rate limiter; a rate of 0 or less (EA_LLM_RPM=0) disables throttling."""
+
+    def __init__(self, rate_per_second, capacity):
+        self.rate = rate_per_second
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if self.rate <= 0:
+            return
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class LLMResult:
+    def __init__(self, content, model, prompt_tokens=0, completion_tokens=0, latency=0.0):
+        self.content = content
+        self.model = model
+        self.prompt_tokens = prompt_tokens
+        self.completion_tokens = completion_tokens
+        self.latency = latency
+
+
+def _is_retryable(error):
+    status = getattr(error, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    name = type(error).__name__
+    return name in {"RateLimitError", "APIConnectionError", "APITimeoutError", "InternalServerError"}
+
+
+class LLMGateway:
+    def __init__(self, client=None, max_workers=LLM_MAX_WORKERS, requests_per_minute=LLM_REQUESTS_PER_MINUTE,
+                 burst=LLM_BURST, max_retries=LLM_MAX_RETRIES):
+        self._client = client
+        self._client_lock = threading.Lock()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="llm")
+        self.bucket = TokenBucket(requests_per_minute / 60.0, burst)
+        self.max_retries = max_retries
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        self._metrics = defaultdict(lambda: {
+            "calls": 0, "errors": 0, "retries": 0, "coalesced": 0,
+            "prompt_tokens": 0, "completion_tokens": 0, "latency_total": 0.0, "latency_max": 0.0,
+        })
+
+    @property
+    def client(self):
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    from openai import OpenAI
+                    # Retries happen in _call/stream (with the token bucket); the SDK's own
+                    # retries would multiply them and bypass the bucket
+                    self._client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"), timeout=LLM_TIMEOUT_SECONDS, max_retries=0)
+        return self._client
+
+    def _record(self, model, **values):
+        for key, value in values.items():
+            if key == "latency":
+                metrics.observe("llm_call", value, model=model)
+            elif key in ("prompt_tokens", "completion_tokens"):
+                metrics.inc("llm_tokens", value, model=model, kind=key.replace("_tokens", ""))
+            else:
+                metrics.inc(f"llm_{key}", value, model=model)
+        with self._metrics_lock:
+            entry = self._metrics[model]
+            for key, value in values.items():
+                if key == "latency":
+                    entry["latency_total"] += value
+                    entry["latency_max"] = max(entry["latency_max"], value)
+                else:
+                    entry[key] += value
+
+    def _call(self, model, messages, params):
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            started = time.perf_counter()
+            try:
+                response = self.client.chat.completions.create(model=model, messages=messages, **params)
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    self._record(model, errors=1)
+                    raise
+                attempt += 1
+                self._record(model, retries=1)
+                # Full jitter keeps retrying sessions from stampeding together
+                time.sleep(random.uniform(0, min(30.0, 0.5 * 2 ** attempt)))
+                continue
+
+            latency = time.perf_counter() - started
+            usage = getattr(response, "usage", None)
+            result = LLMResult(
+                response.choices[0].message.content,
+                model,
+                getattr(usage, "prompt_tokens", 0) or 0,
+                getattr(usage, "completion_tokens", 0) or 0,
+                latency,
+            )
+            self._record(
+                model, calls=1, latency=latency,
+                prompt_tokens=result.prompt_tokens, completion_tokens=result.completion_tokens,
+            )
+            return result
+
+    def submit(self, model, messages, **params):
+        """Queue a chat completion and return a Future resolving to an LLMResult."""
+        key = hashlib.sha256(
+            json.dumps([model, messages, params], sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        ).hexdigest()
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._record(model, coalesced=1)
+                return future
+            future = self.pool.submit(self._call, model, messages, params)
+            self._inflight[key] = future
+
+        def release(_):
+            with self._inflight_lock:
+                if self._inflight.get(key) is future:
+                    del self._inflight[key]
+
+        future.add_done_callback(release)
+        return future
+
+    def complete(self, model, messages, **params):
+        return self.submit(model, messages, **params).result()
+
+    def chat(self, model, messages, **params):
+        return self.complete(model, messages, **params).content
+
+    def stream(self, model, messages, **params):
+        """Yield content deltas as they arrive; runs on the caller's thread so the UI can render them."""
+        attempt = 0
+        while True:
+            self.bucket.acquire()
+            started = time.perf_counter()
+            try:
+                response = self.client.chat.completions.create(
+                    model=model, messages=messages, stream=True,
+                    stream_options={"include_usage": True}, **params
+                )
+                break
+            except Exception as e:
+                if attempt >= self.max_retries or not _is_retryable(e):
+                    self._record(model, errors=1)
+                    raise
+                attempt += 1
+                self._record(model, retries=1)
+                time.sleep(random.uniform(0, min(30.0, 0.5 * 2 ** attempt)))
+
+        prompt_tokens = completion_tokens = 0
+        try:
+            for chunk in response:
+                usage = getattr(chunk, "usage", None)
+                if usage is not None:
+                    prompt_tokens = usage.prompt_tokens or 0
+                    completion_tokens = usage.completion_tokens or 0
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception:
+            self._record(model, errors=1)
+            raise
+        self._record(
+            model, calls=1, latency=time.perf_counter() - started,
+            prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+        )
+
+    def metrics(self):
+        with self._metrics_lock:
+            snapshot = {model: dict(values) for model, values in self._metrics.items()}
+        for values in snapshot.values():
+            values["latency_avg"] = values["latency_total"] / values["calls"] if values["calls"] else 0.0
+        return snapshot
+
+
+_gateway = None
+_gateway_lock = threading.Lock()
+
+
+def get_gateway():
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            _gateway = LLMGateway()
+        return _gateway
+
+
+def chat(model, messages, **params):
+    return get_gateway().chat(model, messages, **params)
+
+
+def stream(model, messages, **params):
+    return get_gateway().stream(model, messages, **params)
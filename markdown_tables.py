@@ -0,0 +1,70 @@
+# --- Incremental markdown table parsing ---
+# Streamed GPT output arrives a few tokens at a time; this parser consumes the
+# deltas, emits each table row as soon as its line is complete, and can turn
+# the rows seen so far into a DataFrame at any point.
+import re
+
+_SEPARATOR_CELL = re.compile(r"^:?-{2,}:?$")
+
+
+def split_row(line):
+    cells = [cell.strip() for cell in line.strip().strip("|").split("|")]
+    return cells
+
+
+def is_separator(cells):
+    return bool(cells) and all(_SEPARATOR_CELL.match(cell.replace(" ", "")) for cell in cells if cell)
+
+
+class MarkdownTableStream:
+    def __init__(self):
+        self.buffer = ""
+        self.header = None
+        self.rows = []
+        self.finished = False
+
+    def _consume_line(self, line):
+        stripped = line.strip()
+        if self.finished:
+            return None
+        if not (stripped.startswith("|") and stripped.count("|") >= 2):
+            # A blank or prose line after the table ends it, like extract_markdown_table
+            if self.header is not None:
+                self.finished = True
+            return None
+        cells = split_row(stripped)
+        if self.header is None:
+            self.header = cells
+            return None
+        if is_separator(cells):
+            return None
+        # Pad / trim ragged rows to the header width
+        cells = (cells + [""] * len(self.header))[:len(self.header)]
+        self.rows.append(cells)
+        return cells
+
+    def feed(self, delta):
+        """Add a streamed text delta; return the list of rows completed by it."""
+        self.buffer += delta
+        new_rows = []
+        while "\n" in self.buffer:
+            line, self.buffer = self.buffer.split("\n", 1)
+            row = self._consume_line(line)
+            if row is not None:
+                new_rows.append(row)
+        return new_rows
+
+    def close(self):
+        new_rows = []
+        if self.buffer:
+            row = self._consume_line(self.buffer)
+            self.buffer = ""
+            if row is not None:
+                new_rows.append(row)
+        return new_rows
+
+    def dataframe(self):
+        if self.header is None:
+            return None
+        import pandas as pd
+        return pd.DataFrame(self.rows, columns=self.header)
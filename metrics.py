@@ -0,0 +1,236 @@
+# --- Hot-path instrumentation ---
+# Process-wide timers and counters for catalogue loading, answer validation, LLM
+# calls, deliverable generation and heatmaps. Each observation is also kept per
+# Streamlit session (when one is active) for the admin metrics page. Metrics can
+# be exported in the Prometheus text format, and EA_METRICS_PORT starts a small
+# HTTP endpoint for scraping.
+import time
+import threading
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
+from functools import wraps
+
+from settings import METRICS_PORT
+
+MAX_SAMPLES = 2048
+MAX_SESSIONS = 200
+
+
+def _label_key(labels):
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = defaultdict(float)  # (name, labels) -> value
+        self.samples = defaultdict(lambda: deque(maxlen=MAX_SAMPLES))
+        self.totals = defaultdict(lambda: [0, 0.0])  # (name, labels) -> [count, sum]
+
+    def inc(self, name, value=1, labels=()):
+        with self._lock:
+            self.counters[(name, labels)] += value
+
+    def observe(self, name, seconds, labels=()):
+        with self._lock:
+            self.samples[(name, labels)].append(seconds)
+            total = self.totals[(name, labels)]
+            total[0] += 1
+            total[1] += seconds
+
+    def timer_rows(self):
+        with self._lock:
+            items = [(key, sorted(values), list(self.totals[key])) for key, values in self.samples.items()]
+        rows = []
+        for (name, labels), values, (count, total) in sorted(items):
+            rows.append({
+                "metric": name,
+                "labels": ", ".join(f"{k}={v}" for k, v in labels),
+                "count": count,
+                "p50_ms": 1000 * percentile(values, 0.5),
+                "p95_ms": 1000 * percentile(values, 0.95),
+                "max_ms": 1000 * values[-1] if values else 0.0,
+                "total_s": total,
+            })
+        return rows
+
+    def counter_rows(self):
+        with self._lock:
+            items = sorted(self.counters.items())
+        return [
+            {"metric": name, "labels": ", ".join(f"{k}={v}" for k, v in labels), "value": value}
+            for (name, labels), value in items
+        ]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+registry = Registry()
+_sessions = OrderedDict()
+_sessions_lock = threading.Lock()
+_collectors = []
+
+
+def current_session_id():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx is not None else None
+    except Exception:
+        return None
+
+
+def session_registry(session_id=None, create=True):
+    session_id = session_id or current_session_id()
+    if session_id is None:
+        return None
+    with _sessions_lock:
+        reg = _sessions.get(session_id)
+        if reg is None and create:
+            reg = _sessions[session_id] = Registry()
+            while len(_sessions) > MAX_SESSIONS:
+                _sessions.popitem(last=False)
+        elif reg is not None:
+            _sessions.move_to_end(session_id)
+        return reg
+
+
+def inc(name, value=1, **labels):
+    key = _label_key(labels)
+    registry.inc(name, value, key)
+    session = session_registry()
+    if session is not None:
+        session.inc(name, value, key)
+
+
+def observe(name, seconds, **labels):
+    key = _label_key(labels)
+    registry.observe(name, seconds, key)
+    session = session_registry()
+    if session is not None:
+        session.observe(name, seconds, key)
+
+
+@contextmanager
+def timer(name, **labels):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def timed(name, **labels):
+    def decorate(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with timer(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def register_collector(func):
+    """`func() -> [(name, value, labels_dict, "gauge" | "counter"), ...]`, read at export time."""
+    if func not in _collectors:
+        _collectors.append(func)
+    return func
+
+
+def collected():
+    rows = []
+    for func in list(_collectors):
+        try:
+            rows.extend(func())
+        except Exception:
+            continue
+    return rows
+
+
+def _prom_name(name):
+    return "ea_" + "".join(c if c.isalnum() else "_" for c in name)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prom_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in labels) + "}"
+
+
+def prometheus_text():
+    lines = []
+    typed = set()
+    with registry._lock:
+        counters = sorted(registry.counters.items())
+        timers = [(key, sorted(values), list(registry.totals[key])) for key, values in registry.samples.items()]
+
+    for (name, labels), value in counters:
+        metric = _prom_name(name) + "_total"
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} counter")
+            typed.add(metric)
+        lines.append(f"{metric}{_prom_labels(labels)} {value}")
+
+    for (name, labels), values, (count, total) in sorted(timers):
+        metric = _prom_name(name) + "_seconds"
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} summary")
+            typed.add(metric)
+        for q in (0.5, 0.95):
+            lines.append(f"{metric}{_prom_labels(labels + (('quantile', str(q)),))} {percentile(values, q)}")
+        lines.append(f"{metric}_count{_prom_labels(labels)} {count}")
+        lines.append(f"{metric}_sum{_prom_labels(labels)} {total}")
+
+    for name, value, labels, kind in collected():
+        metric = _prom_name(name)
+        if metric not in typed:
+            lines.append(f"# TYPE {metric} {kind}")
+            typed.add(metric)
+        lines.append(f"{metric}{_prom_labels(_label_key(labels))} {value}")
+    return "\n".join(lines) + "\n"
+
+
+_exporter_started = False
+_exporter_lock = threading.Lock()
+
+
+def start_http_exporter(port=METRICS_PORT):
+    global _exporter_started
+    if not port:
+        return False
+    with _exporter_lock:
+        if _exporter_started:
+            return True
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                body = prometheus_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        try:
+            server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+        except OSError:
+            return False  # another process (e.g. a second replica on this host) owns the port
+        threading.Thread(target=server.serve_forever, daemon=True, name="metrics-exporter").start()
+        _exporter_started = True
+        return True
+
+
+start_http_exporter()
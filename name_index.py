@@ -0,0 +1,267 @@
+# --- Canonical name index ---
+# Free-text capability, LOB and application names are clustered so that
+# spelling variants such as "Customer onboarding" / "customer on-boarding" /
+# "Custmer onboarding" or "CRM" / "CRM System" collapse onto one canonical
+# label. Candidates are found through a character-trigram inverted index
+# (blocking), and a new name is only compared with each candidate cluster's
+# canonical label, never with the cluster's other variants, so merges cannot
+# chain from one name to the next. Two names are aliases when their core tokens
+# are identical, or when nearly all tokens match (fuzzy token Jaccard) and the
+# character ratio is high; a single shared word is never enough.
+#
+# The variant -> canonical mapping is persisted between runs; manual overrides
+# take precedence and survive a reset:
+#
+#     python name_index.py alias application "XYZ CRM" "XYZ CRM System"
+#     python name_index.py reset [kind]
+import os
+import re
+import sys
+import json
+import atexit
+import threading
+from collections import Counter
+from difflib import SequenceMatcher
+
+from settings import CACHE_DIR
+
+CANONICAL_NAMES_PATH = os.path.join(CACHE_DIR, "canonical_names.json")
+# Mappings saved by an older matcher are discarded instead of being trusted
+FORMAT_VERSION = 3
+
+# Words that do not distinguish one application from another
+GENERIC_APP_TOKENS = {"system", "systems", "application", "app", "platform", "solution", "tool", "the"}
+
+_JOINERS = re.compile(r"(?<=\w)[-'’](?=\w)")
+_NON_WORD = re.compile(r"[^\w]+", re.UNICODE)
+_DIGIT = re.compile(r"\d")
+
+
+def name_key(name):
+    name = _JOINERS.sub("", str(name or "").lower())
+    return _NON_WORD.sub(" ", name).strip()
+
+
+def trigrams(key):
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def edit_distance(a, b, limit=2):
+    """Optimal string alignment distance (a swapped pair of letters is one edit), capped at `limit`."""
+    if abs(len(a) - len(b)) >= limit:
+        return limit
+    previous2, previous = None, list(range(len(b) + 1))
+    for i, ca in enumerate(a, start=1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, start=1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) >= limit:
+            return limit
+        previous2, previous = previous, current
+    return min(previous[-1], limit)
+
+
+def _tokens_match(a, b, ratio=0.9, min_typo_length=5):
+    # Identifiers and numbers ("App 00017", "HR2") must match exactly
+    if a == b:
+        return True
+    if _DIGIT.search(a) or _DIGIT.search(b):
+        return False
+    # One typo ("Socail", "Custmer") in a word long enough not to be a different word
+    if min(len(a), len(b)) >= min_typo_length and edit_distance(a, b) <= 1:
+        return True
+    return SequenceMatcher(None, a, b).ratio() >= ratio
+
+
+def token_jaccard(a, b):
+    """Jaccard over token sets where near-identical spellings count as the same token."""
+    if not a or not b:
+        return 0.0
+    unmatched = set(b)
+    matched = 0
+    for token in a:
+        hit = next((other for other in unmatched if _tokens_match(token, other)), None)
+        if hit is not None:
+            unmatched.discard(hit)
+            matched += 1
+    return matched / (len(a) + len(b) - matched)
+
+
+class NameIndex:
+    def __init__(self, kind, mapping=None, overrides=None, threshold=0.88, min_jaccard=0.75):
+        self.kind = kind
+        self.threshold = threshold
+        self.min_jaccard = min_jaccard
+        self.dirty = False
+        self._lock = threading.Lock()
+        self._variants = {}                   # variant key -> cluster id
+        self._labels = []                     # cluster id -> canonical label
+        self._label_ids = {}                  # canonical label -> cluster id
+        self._postings = {}                   # trigram -> cluster ids (label keys only)
+        self._overrides = {name_key(k): v for k, v in (overrides or {}).items()}
+        for key, label in (mapping or {}).items():
+            self._attach(key, self._cluster_for_label(label))
+
+    def _core_tokens(self, key):
+        tokens = set(key.split())
+        if self.kind == "application":
+            tokens -= GENERIC_APP_TOKENS
+        return tokens
+
+    def _cluster_for_label(self, label):
+        cid = self._label_ids.get(label)
+        if cid is None:
+            cid = self._label_ids[label] = len(self._labels)
+            self._labels.append(label)
+            label_key = name_key(label)
+            self._variants.setdefault(label_key, cid)
+            for gram in trigrams(label_key):
+                self._postings.setdefault(gram, set()).add(cid)
+        return cid
+
+    def _attach(self, key, cid):
+        self._variants.setdefault(key, cid)
+
+    def is_alias(self, key, label_key):
+        if key == label_key:
+            return True
+        a, b = self._core_tokens(key), self._core_tokens(label_key)
+        if a and a == b:
+            return True
+        return (
+            token_jaccard(a, b) >= self.min_jaccard
+            and SequenceMatcher(None, key, label_key).ratio() >= self.threshold
+        )
+
+    def _best_match(self, key):
+        shared = Counter()
+        for gram in trigrams(key):
+            for cid in self._postings.get(gram, ()):
+                shared[cid] += 1
+        best, best_score = None, 0.0
+        for cid, _ in shared.most_common(20):
+            label_key = name_key(self._labels[cid])
+            if not self.is_alias(key, label_key):
+                continue
+            score = SequenceMatcher(None, key, label_key).ratio()
+            if score > best_score:
+                best, best_score = cid, score
+        return best
+
+    def canonical(self, name):
+        key = name_key(name)
+        if not key:
+            return str(name or "").strip()
+        if key in self._overrides:
+            return self._overrides[key]
+        with self._lock:
+            cid = self._variants.get(key)
+            if cid is None:
+                cid = self._best_match(key)
+                if cid is None:
+                    cid = self._cluster_for_label(str(name).strip())
+                self._attach(key, cid)
+                self.dirty = True
+            return self._labels[cid]
+
+    def canonicalize(self, values):
+        """Map an iterable of names (e.g. a pandas Series) via its unique values only."""
+        lookup = {value: self.canonical(value) for value in set(values) if value is not None}
+        return [lookup.get(value, value) for value in values]
+
+    def mapping(self):
+        with self._lock:
+            return {key: self._labels[cid] for key, cid in self._variants.items()}
+
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def _load_all(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        stored = {}
+    if stored.get("version") != FORMAT_VERSION:
+        # Keep manual overrides, drop learned mappings from an older matcher
+        return {"version": FORMAT_VERSION, "mappings": {}, "overrides": stored.get("overrides", {})}
+    stored.setdefault("mappings", {})
+    stored.setdefault("overrides", {})
+    return stored
+
+
+def _write_all(stored, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(stored, f, ensure_ascii=False, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def get_index(kind, path=CANONICAL_NAMES_PATH):
+    with _indexes_lock:
+        index = _indexes.get((path, kind))
+        if index is None:
+            stored = _load_all(path)
+            index = _indexes[(path, kind)] = NameIndex(
+                kind, stored["mappings"].get(kind), stored["overrides"].get(kind)
+            )
+        return index
+
+
+def save_indexes(path=CANONICAL_NAMES_PATH):
+    with _indexes_lock:
+        dirty = [index for (p, _), index in _indexes.items() if p == path and index.dirty]
+        if not dirty:
+            return
+        stored = _load_all(path)
+        for index in dirty:
+            stored["mappings"][index.kind] = {**stored["mappings"].get(index.kind, {}), **index.mapping()}
+            index.dirty = False
+        _write_all(stored, path)
+
+
+def reset_indexes(kind=None, path=CANONICAL_NAMES_PATH):
+    """Forget learned mappings (all kinds, or one); manual overrides are kept."""
+    with _indexes_lock:
+        stored = _load_all(path)
+        for k in [kind] if kind else list(stored["mappings"]):
+            stored["mappings"].pop(k, None)
+        for key in [key for key in _indexes if key[0] == path and (kind is None or key[1] == kind)]:
+            del _indexes[key]
+        _write_all(stored, path)
+
+
+def set_override(kind, variant, label, path=CANONICAL_NAMES_PATH):
+    """Pin `variant` to `label` (an empty label removes the override)."""
+    with _indexes_lock:
+        stored = _load_all(path)
+        overrides = stored["overrides"].setdefault(kind, {})
+        if label:
+            overrides[variant] = label
+        else:
+            overrides.pop(variant, None)
+        _indexes.pop((path, kind), None)
+        _write_all(stored, path)
+
+
+# Learned names are written once at shutdown rather than after every build
+atexit.register(save_indexes)
+
+
+if __name__ == "__main__":
+    command = sys.argv[1] if len(sys.argv) > 1 else ""
+    if command == "reset":
+        reset_indexes(sys.argv[2] if len(sys.argv) > 2 else None)
+        print("✅ Learned name mappings cleared.")
+    elif command == "alias" and len(sys.argv) in (4, 5):
+        set_override(sys.argv[2], sys.argv[3], sys.argv[4] if len(sys.argv) == 5 else "")
+        print("✅ Override saved.")
+    else:
+        print("Usage: python name_index.py reset [kind] | alias <kind> <variant> [<canonical label>]")
+        sys.exit(1)
@@ -5,21 +5,26 @@
 # ---
 import streamlit as st
 import os
-import json
-import pandas as pd
-from io import StringIO, BytesIO
-from datetime import datetime
-from openai import OpenAI
-import matplotlib.pyplot as plt
-import seaborn as sns
-import re  # 👈 ADD THIS
-import os
-from openai import OpenAI
-# --- Setup OpenAI Client ---
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from catalogue_store import load_catalogue
+from settings import CATALOGUE_DIR, STORAGE_BACKEND
+import interview_db
+import llm_gateway
+import metrics
+from markdown_tables import MarkdownTableStream
+from prompt_compaction import describe
+from integration_graph import get_graph
+from exports import export_panel
+from deliverable_jobs import DELIVERABLE_PROMPTS, generate  # also registers the background job kinds
+from job_queue import get_queue
+from heatmaps import show_heatmap
+from capability_pipeline import application_frame, capability_frame, count_matrix, normalize_application_frame
+from portfolio_summary import edge_count, load_summary, matrix as summary_matrix
+from batch_build import build_all, ordered_sheets, pack_zip
+from catalogue_builders import (
+    build_application_catalogue, build_business_catalogue, build_integration_matrix, enrich_catalogue, integration_rows
+)
 
 # --- Directory ---
-CATALOGUE_DIR = "catalogues"
 os.makedirs(CATALOGUE_DIR, exist_ok=True)
 
 st.set_page_config(page_title="EA Deliverables Builder", layout="wide")
@@ -33,21 +38,20 @@ st.markdown(
     unsafe_allow_html=True
 )
 # --- Load and classify all interview files ---
-app_data = []
-biz_data = []
-
-for f in os.listdir(CATALOGUE_DIR):
-    if f.endswith(".json"):
-        with open(os.path.join(CATALOGUE_DIR, f), "r", encoding="utf-8") as file:
-            try:
-                data = json.load(file)
-                role = data.get("stakeholder_role", "").lower()
-                if "application" in role:
-                    app_data.append(data)
-                elif "business" in role:
-                    biz_data.append(data)
-            except Exception as e:
-                st.warning(f"⚠️ Could not load {f}: {e}")
+# The shared store only re-parses files whose (mtime, size) changed since the last rerun
+catalogue = load_catalogue(CATALOGUE_DIR)
+app_data = catalogue.app_data
+biz_data = catalogue.biz_data
+
+for f, err in catalogue.errors.items():
+    st.warning(f"⚠️ Could not load {f}: {err}")
+
+# Pre-computed counts, kept current on every save instead of recomputed per page load
+summary = load_summary(catalogue)
+st.caption(
+    f"📊 {len(app_data)} application and {len(biz_data)} business interview(s) · "
+    f"{edge_count(summary)} integration edge(s)"
+)
 
 # --- Select Deliverable ---
 st.subheader("🛠️ Choose what you want to generate:")
@@ -57,173 +61,148 @@ options = [
     "🔗 Build Integration Matrix",
     "⚠️ Build Gap Analysis",
     "🔥 ARM Heatmap – Application Perspective",
-    "📊 ARM Heatmap – Business Perspective"
+    "📊 ARM Heatmap – Business Perspective",
+    "📦 Build All Deliverables"
 ]
 action = st.radio("Deliverable Type:", options)
+build_all_mode = action == "📦 Build All Deliverables"
+
+if "Catalogue" in action:
+    local_build = st.toggle("⚡ Build locally from interview fields (no GPT-4)", value=True)
+    llm_enrich = local_build and st.checkbox("✨ Enrich derived columns with GPT (Description / TOGAF Layer)")
+else:
+    local_build = llm_enrich = False
+if build_all_mode:
+    batch_llm = st.toggle("🤖 Include GPT Gap Analysis", value=True)
+    batch_gpt_catalogues = batch_llm and st.checkbox("📘 Also let GPT write both catalogues")
+stream_output = st.toggle("📡 Stream GPT output as it is generated", value=True)
+force_regenerate = st.checkbox("🔄 Ignore cached result and regenerate")
+run_in_background = st.toggle("🕒 Run GPT deliverables as background jobs (survives page switches)")
+
+# --- Generated results ---
+# Kept in session_state and rendered below the Generate button, so the export,
+# heatmap and download widgets (which rerun the script) keep working after the
+# button resets.
+def keep_result(**result):
+    st.session_state.builder_result = {"action": action, "file_stem": "EA_Deliverable", "sheet_name": "Deliverable", **result}
+
+
+# --- Local catalogue build (optionally enriched by GPT) ---
+def build_local_catalogue(action, enrich):
+    import pandas as pd
+
+    if action == "📘 Build Application Catalogue":
+        df = build_application_catalogue(app_data)
+        key_column, derived = "App Name", ["Description", "TOGAF Layer"]
+        if enrich:
+            df["Description"] = pd.Series("", index=df.index, dtype="string")
+            df["TOGAF Layer"] = pd.Series("Application", index=df.index, dtype="string")
+    else:
+        df = build_business_catalogue(biz_data)
+        key_column, derived = "Capability Name", ["Description", "TOGAF Layer"]
 
-# --- Extract markdown table from GPT ---
-def extract_markdown_table(output_text):
-    table_lines = []
-    inside = False
-    for line in output_text.splitlines():
-        if line.strip().startswith("|") and line.count("|") >= 2:
-            inside = True
-            table_lines.append(line.strip())
-        elif inside and not line.strip():
-            break
-    if not table_lines:
-        return None
-    try:
-        df = pd.read_csv(StringIO("\n".join(table_lines)), sep="|", engine="python", skipinitialspace=True)
-        df = df.dropna(axis=1, how="all")
-        df.columns = [col.strip() for col in df.columns]
-        df = df[1:] if df.columns.equals(df.iloc[0]) else df
-        return df
-    except Exception as e:
-        st.warning(f"⚠️ Table parsing failed: {e}")
-        return None
+    if df.empty:
+        keep_result(messages=[("warning", "⚠️ No interview data found for this catalogue.")])
+        return
 
-# --- Advanced App Heatmap
+    messages = []
+    if enrich:
+        try:
+            df = enrich_catalogue(
+                df, key_column, derived,
+                lambda p: llm_gateway.chat("gpt-4", [{"role": "user", "content": p}], temperature=0)
+            )
+        except Exception as e:
+            messages.append(("warning", f"⚠️ GPT enrichment failed, showing local catalogue only: {e}"))
 
-def build_app_heatmap():
-    rows = []
-    for app in app_data:
-        rows.append({
-            "Application": app.get("application_name", "Unnamed"),
-            "Line of Business": app.get("line_of_business", "N/A").strip().lower(),
-            "Category": app.get("category_type", "Unspecified").strip().lower()
-        })
+    messages.append(("success", f"✅ {action.split('Build ')[-1]} built locally from {len(df)} row(s)."))
+    keep_result(messages=messages, table=df)
 
-    df = pd.DataFrame(rows)
+# --- Advanced App Heatmap
 
-    if df.empty:
-        st.warning("⚠️ No application data found.")
+def build_app_heatmap():
+    import pandas as pd
+
+    if STORAGE_BACKEND == "sqlite":
+        df = pd.DataFrame(interview_db.app_heatmap_rows(), columns=["Application", "Line of Business", "Category"])
+        df = normalize_application_frame(df)
+        matrix = count_matrix(df, "Line of Business", "Category") if not df.empty else pd.DataFrame()
+    else:
+        df = None
+        matrix = summary_matrix(summary, "app_lob_category")
+
+    if matrix.empty:
+        keep_result(messages=[("warning", "⚠️ No application data found.")])
         return
 
-    # Pivot for count matrix
-    count_matrix = df.groupby(["Line of Business", "Category"]).size().unstack(fill_value=0)
-
-    # Plot heatmap
-    fig, ax = plt.subplots(figsize=(10, 6))
-    sns.heatmap(count_matrix, annot=True, fmt="d", cmap="YlGnBu", linewidths=0.5, cbar=True, ax=ax)
-    ax.set_title("🗺️ Application Heatmap by LOB vs Category", fontsize=14)
-    ax.set_xlabel("Application Category")
-    ax.set_ylabel("Line of Business")
-    st.pyplot(fig)
-
-    # Optionally display detailed list
-    with st.expander("📋 View Applications per Cell"):
-        st.dataframe(df)
+    # Plot heatmap, with the detailed list underneath
+    keep_result(
+        heatmap={
+            "matrix": matrix, "title": "Application Heatmap by LOB vs Category", "xlabel": "Application Category",
+            "ylabel": "Line of Business", "figsize": (10, 6), "key": "app_heatmap",
+        },
+        details=("📋 View Applications per Cell", df if df is not None else application_frame(app_data)),
+    )
 
 # --- Advanced Business Heatmap
 
 
 def build_business_heatmap():
-    st.markdown("### 🧊 Business Capability Heatmap")
+    messages = [("markdown", "### 🧊 Business Capability Heatmap")]
 
     if not biz_data:
-        st.warning("⚠️ No Business Owner data found.")
+        keep_result(messages=messages + [("warning", "⚠️ No Business Owner data found.")])
         return
 
-    rows = []
-
-    for f in os.listdir(CATALOGUE_DIR):
-        if not f.startswith("BusinessOwner_") or not f.endswith(".json"):
-            continue
-
-        filepath = os.path.join(CATALOGUE_DIR, f)
-        try:
-            with open(filepath, "r", encoding="utf-8") as file:
-                interview = json.load(file)
-
-            # Extract line of business from filename
-            match = re.search(r'BusinessOwner_(.*?)__', f)
-            lob = match.group(1).replace('_', ' ').strip().title() if match else "Unknown"
-
-            raw_caps = interview.get("capabilities", "")
+    # Capability counts per LOB come straight from the portfolio summary
+    matrix = summary_matrix(summary, "capabilities")
 
-            # Parse raw string of capabilities
-            if isinstance(raw_caps, str):
-                parsed_caps = [cap.strip("- ").strip() for cap in raw_caps.split("\n") if cap.strip()]
-            else:
-                parsed_caps = []
-
-            def clean_cap(cap):
-                return re.sub(r'cab\s*\d+\s*[:\-]?\s*', '', cap, flags=re.IGNORECASE).strip().capitalize()
-
-            cleaned_caps = [clean_cap(cap) for cap in parsed_caps]
-
-            for cap in cleaned_caps:
-                rows.append({
-                    "Line of Business": lob,
-                    "Capability": cap
-                })
-
-        except Exception as e:
-            st.warning(f"⚠️ Error reading {f}: {e}")
-
-    if not rows:
-        st.warning("⚠️ No capabilities could be extracted from Business Owner files.")
+    if matrix.empty:
+        keep_result(messages=messages + [("warning", "⚠️ No capabilities could be extracted from Business Owner files.")])
         return
 
-    df = pd.DataFrame(rows)
-    st.dataframe(df, use_container_width=True)
-
-    # Heatmap of capability count per LOB
-    count_matrix = df.groupby(["Line of Business", "Capability"]).size().unstack(fill_value=0)
-
-    st.markdown("### 🔥 Heatmap View (Count of Capabilities by Line of Business)")
-    fig, ax = plt.subplots(figsize=(12, 6))
-    sns.heatmap(count_matrix, cmap="YlGnBu", annot=True, fmt="d", linewidths=0.5, cbar=True, ax=ax)
-    ax.set_xlabel("Capability")
-    ax.set_ylabel("Line of Business")
-    ax.set_title("Business Capability Coverage Heatmap")
-    st.pyplot(fig)
+    keep_result(
+        messages=messages + [("markdown", "### 🔥 Heatmap View (Count of Capabilities by Line of Business)")],
+        heatmap={
+            "matrix": matrix, "title": "Business Capability Coverage Heatmap", "xlabel": "Capability",
+            "ylabel": "Line of Business", "key": "business_heatmap",
+        },
+        details=("📋 View capabilities per Business Owner interview", capability_frame(catalogue.biz_files, biz_data)),
+    )
 
 # --- Generate Deliverable ---
 if st.button("🤖 Generate Using DevoteamAI²"):
-    with st.spinner("🧠 Thinking like an architect..."):
-
-        if action == "📘 Build Application Catalogue":
-            input_data = app_data
-            prompt = """
-You are an expert Application Architect. Build a TOGAF-aligned Application Catalogue from the following interviews. Output ONLY a clean markdown table with: App Name, Business Line, Category, Status, Tech Stack, Stakeholder.
-"""
-        elif action == "📘 Build Business Catalogue":
-            input_data = biz_data
-            prompt = """
-You are an expert Business Architect. Build a TOGAF-aligned Business Capability Catalogue. Output ONLY a clean markdown table with: Capability Name, Description, Related Department, Pain Point, TOGAF Layer.
-"""
+    st.session_state.pop("builder_result", None)
+    with st.spinner("🧠 Thinking like an architect..."), metrics.timer("builder_generate", deliverable=action):
+
+        if build_all_mode:
+            progress = st.progress(0.0, text="Building deliverables...")
+            pack = build_all(
+                catalogue, include_llm=batch_llm, gpt_catalogues=batch_gpt_catalogues, force=force_regenerate,
+                on_progress=lambda done, total, name: progress.progress(done / total, text=f"✅ {name} ({done}/{total})"),
+            )
+            st.session_state.ea_pack = {"result": pack, "zip": pack_zip(pack)}
+            input_data = []
+            prompt = ""
+        elif local_build:
+            build_local_catalogue(action, llm_enrich)
+            input_data = []
+            prompt = ""
+        elif action in ("📘 Build Application Catalogue", "📘 Build Business Catalogue"):
+            source, prompt = DELIVERABLE_PROMPTS[action]
+            input_data = biz_data if source == "business" else app_data
         elif action == "🔗 Build Integration Matrix":
-            rows = []
-            for app in app_data:
-                app_name = app.get("application_name", "Unknown")
-                integrations = app.get("integrations", [])
-                for entry in integrations:
-                    rows.append({
-                        "Source App": entry.get("Source App", app_name),
-                        "Target App": entry.get("Target App", ""),
-                        "Interface Type": entry.get("Interface Type", ""),
-                        "Protocol": entry.get("Protocol", ""),
-                        "Frequency": entry.get("Frequency", "")
-                    })
+            if STORAGE_BACKEND == "sqlite":
+                rows = interview_db.integration_rows()
+            else:
+                rows = integration_rows(app_data)
 
             if not rows:
-                st.warning("⚠️ No integration data found.")
+                keep_result(messages=[("warning", "⚠️ No integration data found.")])
             else:
-                df = pd.DataFrame(rows)
-                st.success("✅ Integration Matrix built from structured JSON.")
-                st.dataframe(df)
-
-                excel_io = BytesIO()
-                with pd.ExcelWriter(excel_io, engine='xlsxwriter') as writer:
-                    df.to_excel(writer, index=False, sheet_name="Integration Matrix")
-                excel_io.seek(0)
-                st.download_button(
-                    label="📥 Download as Excel",
-                    data=excel_io.getvalue(),
-                    file_name="Integration_Matrix.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+                keep_result(
+                    messages=[("success", "✅ Integration Matrix built from structured JSON.")],
+                    table=build_integration_matrix(rows), file_stem="Integration_Matrix", sheet_name="Integration Matrix",
                 )
 
             input_data = []
@@ -231,9 +210,7 @@ You are an expert Business Architect. Build a TOGAF-aligned Business Capability
 
         elif action == "⚠️ Build Gap Analysis":
             input_data = app_data
-            prompt = """
-You're a TOGAF compliance consultant. Analyze the following interviews and generate a structured Gap Analysis. Use markdown bullets or tables showing Gap, Impact, and Recommendation.
-"""
+            prompt = DELIVERABLE_PROMPTS[action][1]
         elif action == "🔥 ARM Heatmap – Application Perspective":
             build_app_heatmap()
             input_data = []
@@ -246,39 +223,153 @@ You're a TOGAF compliance consultant. Analyze the following interviews and gener
             input_data = []
             prompt = "No action selected."
 
-        if prompt.strip():
-            final_prompt = f"{prompt.strip()}\n\nData:\n{json.dumps(input_data, indent=2)}"
-
+        if prompt.strip() and run_in_background:
+            # The job answers from the deliverable cache when the interviews are unchanged
+            job_id = get_queue().submit(
+                "gpt_deliverable",
+                {
+                    "action": action,
+                    "prompt": prompt,
+                    "source": "business" if input_data is biz_data else "application",
+                    "wants_table": "Catalogue" in action,
+                    "force": force_regenerate,
+                },
+                title=action,
+            )
+            st.session_state.setdefault("builder_jobs", [])
+            if job_id not in st.session_state.builder_jobs:
+                st.session_state.builder_jobs.append(job_id)
+            st.info(f"🕒 Submitted as background job `{job_id[:8]}` – follow it under Background Jobs below.")
+        elif prompt.strip():
             try:
-                response = client.chat.completions.create(
-                    model="gpt-4",
-                    messages=[
-                        {"role": "system", "content": "You are a senior Enterprise Architect."},
-                        {"role": "user", "content": final_prompt}
-                    ]
-                )
-                output = response.choices[0].message.content
-                st.success("✅ Deliverable Generated!")
-                st.markdown(output)
-
-                if "Catalogue" in action or "Matrix" in action:
-                    df = extract_markdown_table(output)
-                    if df is not None:
-                        st.dataframe(df)
-                        excel_io = BytesIO()
-                        with pd.ExcelWriter(excel_io, engine='xlsxwriter') as writer:
-                            df.to_excel(writer, index=False, sheet_name="Deliverable")
-                        excel_io.seek(0)
-                        st.download_button(
-                            label="📥 Download as Excel",
-                            data=excel_io.getvalue(),
-                            file_name="EA_Deliverable.xlsx",
-                            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                        )
-                    else:
-                        st.warning("⚠️ Could not extract table for Excel download.")
+                wants_table = "Catalogue" in action
+                on_token = None
+                if stream_output:
+                    # Render tokens and completed table rows as they arrive
+                    text_placeholder = st.empty()
+                    table_placeholder = st.empty()
+                    table_stream = MarkdownTableStream()
+
+                    def on_token(text, delta):
+                        text_placeholder.markdown(text + "▌")
+                        if wants_table and table_stream.feed(delta):
+                            table_placeholder.dataframe(table_stream.dataframe())
+
+                result = generate(action, prompt, input_data, wants_table=wants_table, force=force_regenerate, on_token=on_token)
+                if stream_output:
+                    text_placeholder.empty()
+                    table_placeholder.empty()
+
+                if result["from_cache"]:
+                    messages = [("info", "♻️ Loaded from cache – the interviews behind this deliverable haven't changed.")]
+                else:
+                    messages = [("caption", describe(result["compaction"])), ("success", "✅ Deliverable Generated!")]
+                import pandas as pd
+
+                table = result["table"]
+                df = pd.DataFrame(table["data"], columns=table["columns"]) if table else None
+                if wants_table and df is None:
+                    messages.append(("warning", "⚠️ Could not extract table for export."))
+                keep_result(messages=messages, output=result["output"], table=df)
             except Exception as e:
-                st.error(f"❌ GPT Error: {e}")
+                keep_result(messages=[("error", f"❌ GPT Error: {e}")])
+
+# --- Last generated result for the selected deliverable ---
+builder_result = st.session_state.get("builder_result")
+if builder_result and builder_result["action"] == action:
+    for level, text in builder_result.get("messages", []):
+        getattr(st, level)(text)
+    if builder_result.get("output"):
+        st.markdown(builder_result["output"])
+    if builder_result.get("heatmap"):
+        heatmap = builder_result["heatmap"]
+        show_heatmap(heatmap["matrix"], heatmap["title"], heatmap["xlabel"], heatmap["ylabel"],
+                     figsize=heatmap.get("figsize"), key=heatmap["key"])
+    if builder_result.get("details"):
+        label, details = builder_result["details"]
+        with st.expander(label):
+            st.dataframe(details, use_container_width=True)
+    if builder_result.get("table") is not None:
+        st.dataframe(builder_result["table"], use_container_width=True)
+        export_panel(
+            builder_result["table"], builder_result["file_stem"], sheet_name=builder_result["sheet_name"], key="export_result"
+        )
+
+# --- EA pack from the last "Build All" run ---
+if build_all_mode and "ea_pack" in st.session_state:
+    pack = st.session_state.ea_pack["result"]
+    st.success(f"✅ EA pack built from {pack['interviews']} interview(s).")
+    st.dataframe(ordered_sheets(pack)["Contents"], use_container_width=True)
+    for name, error in pack["errors"].items():
+        st.warning(f"⚠️ {name} failed: {error}")
+    for name, png in pack["images"].items():
+        st.image(png, caption=name)
+    for name, text in pack["markdown"].items():
+        with st.expander(f"📄 {name}"):
+            st.markdown(text)
+    st.download_button(
+        label="📥 Download EA pack (workbook + heatmaps)",
+        data=st.session_state.ea_pack["zip"],
+        file_name="EA_Pack.zip",
+        mime="application/zip",
+    )
+
+# --- Background jobs (visible to every session) ---
+recent_jobs = get_queue().recent(kind="gpt_deliverable", limit=10)
+if recent_jobs:
+    with st.expander("🕒 Background Jobs", expanded=bool(st.session_state.get("builder_jobs"))):
+        if st.button("🔄 Refresh job status"):
+            st.rerun()
+        for job_record in recent_jobs:
+            mine = "⭐ " if job_record["id"] in st.session_state.get("builder_jobs", []) else ""
+            st.markdown(f"{mine}**{job_record['title']}** · `{job_record['id'][:8]}` · {job_record['status']} · {job_record['created_at']}")
+            if job_record["status"] in ("queued", "running"):
+                st.progress(job_record["progress"], text=job_record["message"] or "")
+            elif job_record["status"] == "done":
+                result = job_record["result"]
+                if st.checkbox("Show result", key=f"show_{job_record['id']}"):
+                    st.markdown(result["output"])
+                    if result.get("table"):
+                        import pandas as pd
+                        job_df = pd.DataFrame(result["table"]["data"], columns=result["table"]["columns"])
+                        st.dataframe(job_df)
+                        export_panel(job_df, "EA_Deliverable", key=f"export_{job_record['id']}")
+            else:
+                st.warning(f"⚠️ {job_record['error'] or job_record['message']}")
+                if st.button("▶️ Resume", key=f"resume_{job_record['id']}"):
+                    get_queue().resume(job_record["id"])
+                    st.rerun()
+
+# --- Dependency & impact explorer ---
+if action == "🔗 Build Integration Matrix":
+    # Only interview files added or changed since the last rerun are re-indexed
+    graph = get_graph({f: d for f, d in zip(catalogue.app_files, catalogue.app_data)})
+    apps = graph.nodes()
+    with st.expander("🧭 Dependency & Impact Explorer", expanded=False):
+        if not apps:
+            st.info("No integrations captured yet.")
+        else:
+            import pandas as pd
+
+            selected = st.selectbox("Application", apps)
+            col1, col2 = st.columns(2)
+            with col1:
+                st.markdown("**⬇️ Impacted if it goes down (downstream)**")
+                st.dataframe(pd.DataFrame(graph.downstream(selected), columns=["Application", "Hops"]), use_container_width=True)
+            with col2:
+                st.markdown("**⬆️ Depends on (upstream)**")
+                st.dataframe(pd.DataFrame(graph.upstream(selected), columns=["Application", "Hops"]), use_container_width=True)
+
+            st.markdown("**📈 Most connected applications (fan-in / fan-out)**")
+            st.dataframe(pd.DataFrame(graph.ranking(top=20)), use_container_width=True)
+
+            cycles = graph.cycles()
+            if cycles:
+                st.warning(f"🔁 {len(cycles)} circular dependency group(s) detected:")
+                for group in cycles:
+                    st.markdown("- " + " ⇄ ".join(group))
+            else:
+                st.success("✅ No circular dependencies detected.")
 
 # --- Footer ---
 st.markdown("""
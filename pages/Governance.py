@@ -1,75 +1,35 @@
 import streamlit as st
 import json
-import os
-import openai
-from openai import OpenAI
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
-import os
-from openai import OpenAI
-# -------------------------------
-# GPT client setup
-# -------------------------------
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from catalogue_store import load_catalogue
+from settings import CATALOGUE_DIR
+from governance_scoring import DEFAULT_BATCH_TOKENS, assess_portfolio, assess_portfolio_incremental, portfolio_tokens
+from heatmaps import show_heatmap as render_heatmap
+import deliverable_jobs  # registers the background job kinds
+from job_queue import get_queue
+import quality_rules
+from portfolio_summary import completeness as summary_completeness, edge_count, load_summary
 
 # -------------------------------
 # Load all JSON files from /catalogues
 # -------------------------------
-def load_all_json(folder="catalogues"):
-    contents = []
-    for f in os.listdir(folder):
-        if f.endswith(".json"):
-            try:
-                with open(os.path.join(folder, f), "r", encoding="utf-8") as file:
-                    contents.append(json.load(file))
-            except Exception as e:
-                st.warning(f"⚠️ Failed to read {f}: {e}")
-    return contents
+def load_all_json(folder=CATALOGUE_DIR):
+    catalogue = load_catalogue(folder)
+    for f, err in catalogue.errors.items():
+        st.warning(f"⚠️ Failed to read {f}: {err}")
+    return catalogue
+
+
+# Rule checks only re-run when the catalogue snapshot changes
+@st.cache_data(show_spinner=False, max_entries=4)
+def quality_report(version, _files):
+    return quality_rules.evaluate(_files)
 
 # -------------------------------
 # GPT Governance Assessment
 # -------------------------------
-def gpt_assess_portfolio(files: list):
-    raw_json = json.dumps(files, indent=2)
-
-    prompt = (
-        "You are an experienced enterprise architecture consultant.\n\n"
-        "You are analyzing a portfolio of stakeholder interviews from various systems. "
-        "Each interview is represented as a JSON object containing assessment and metadata fields.\n\n"
-        "Below is the full set of interviews:\n"
-        f"{raw_json}\n\n"
-        "Your task:\n"
-        "1. Score the overall governance maturity of this portfolio across the following areas (0-100):\n"
-        "- TOGAF Compliance\n"
-        "- NORA Alignment\n"
-        "- Business-IT Alignment\n"
-        "- Digital Maturity\n"
-        "- Technical Debt (lower = better)\n"
-        "- Completeness\n\n"
-        "2. Provide a concise analysis using bullet points (not a paragraph) that:\n"
-        "- Highlights strengths with justifications\n"
-        "- Lists clear weaknesses or gaps and their likely impact\n"
-        "- Recommends specific improvements or actions\n"
-        "- Uses clear and formal bullet points with no introduction or conclusion\n\n"
-        "Return only a JSON object in this format:\n"
-        "{\n"
-        "  \"TOGAF Compliance\": 78,\n"
-        "  \"NORA Alignment\": 65,\n"
-        "  ...\n"
-        "  \"Justification\": \"- Bullet 1\\n- Bullet 2\\n- Bullet 3\"\n"
-        "}"
-    )
-
-    try:
-        response = client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3
-        )
-        return json.loads(response.choices[0].message.content)
-    except Exception as e:
-        return {"error": str(e)}
+def gpt_assess_portfolio(files: list, chunked=None, on_token=None):
+    # Auto-switches to map-reduce batches once the portfolio no longer fits one prompt
+    return assess_portfolio(files, chunked=chunked, on_token=on_token)
 
 # -------------------------------
 # Custom Progress Bar with Colors
@@ -94,12 +54,10 @@ def render_colored_bar(label, percent):
 # Heatmap
 # -------------------------------
 def show_heatmap(scores):
+    import pandas as pd
     df = pd.DataFrame([{k: v for k, v in scores.items() if isinstance(v, (int, float))}])
     st.markdown("### 🧭 Heatmap")
-    plt.figure(figsize=(10, 1.5))
-    sns.heatmap(df, annot=True, cmap="coolwarm", cbar=False, fmt="g", linewidths=.5)
-    st.pyplot(plt.gcf())
-    plt.clf()
+    render_heatmap(df, cmap="coolwarm", fmt="g", cbar=False, figsize=(10, 1.5), key="governance_heatmap")
 
 # -------------------------------
 # Streamlit Page Entry
@@ -118,21 +76,102 @@ def governance_page():
     st.info("🧠 Running governance_page()")
     st.write("📁 Scanning folder: `catalogues`")
 
-    files = load_all_json()
+    catalogue = load_all_json()
+    files = catalogue.all_data
     st.success(f"✅ Loaded {len(files)} JSON file(s).")
 
     if not files:
         st.warning("⚠️ No valid files found.")
         return
 
-    with st.spinner("🤖 GPT analyzing portfolio..."):
-        result = gpt_assess_portfolio(files)
+    # Portfolio at a glance, read from the pre-computed summary
+    summary = load_summary(catalogue)
+    roles = summary["counts"]["roles"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Application Owners", roles.get("application", 0))
+    col2.metric("Business Owners", roles.get("business", 0))
+    col3.metric("Integration Edges", edge_count(summary))
+    col4.metric("Answered Fields", f"{summary_completeness(summary)[0]:.0f}%")
+
+    # Exact data-quality scores straight from the interview JSON (no LLM)
+    quality_scores, quality_details = quality_report(catalogue.version, files)
+    st.markdown("### 🧮 Data Quality (computed locally)")
+    for k, v in quality_scores.items():
+        render_colored_bar(k, v)
+    with st.expander("🔍 Data quality details"):
+        for title, table in quality_details.items():
+            st.markdown(f"**{title}** ({len(table)})")
+            if not table.empty:
+                st.dataframe(table, use_container_width=True)
+
+    mode = st.radio(
+        "Assessment mode",
+        ["⚡ Incremental (only new or changed interviews)", "🌐 Full portfolio"],
+        horizontal=True,
+    )
+    incremental = mode.startswith("⚡")
+    chunked = not incremental and st.toggle(
+        "🧩 Chunked assessment (map-reduce for large portfolios)",
+        value=portfolio_tokens(files) > DEFAULT_BATCH_TOKENS
+    )
 
+    run_in_background = st.toggle("🕒 Run as a background job (survives page switches)")
+
+    if run_in_background:
+        if st.button("🚀 Submit assessment"):
+            st.session_state.governance_job = get_queue().submit(
+                "governance_assessment", {"chunked": chunked, "incremental": incremental}, title="Governance assessment"
+            )
+        # Pick up this session's job, or the latest one submitted from any session
+        job_id = st.session_state.get("governance_job")
+        job_record = get_queue().get(job_id) if job_id else None
+        if job_record is None:
+            recent = get_queue().recent(kind="governance_assessment", limit=1)
+            job_record = recent[0] if recent else None
+        if job_record is None:
+            st.info("No background assessment yet – submit one above.")
+            return
+
+        st.caption(f"Job `{job_record['id'][:8]}` · {job_record['status']} · {job_record['updated_at']}")
+        if job_record["status"] in ("queued", "running"):
+            st.progress(job_record["progress"], text=job_record["message"] or "")
+            if st.button("🔄 Refresh"):
+                st.rerun()
+            return
+        if job_record["status"] != "done":
+            st.error(f"❌ {job_record['error'] or job_record['message']}")
+            if st.button("▶️ Resume"):
+                get_queue().resume(job_record["id"])
+                st.rerun()
+            return
+        result = job_record["result"]
+    elif incremental:
+        with st.spinner("🤖 Scoring new or changed interviews..."):
+            result = assess_portfolio_incremental(files)
+    else:
+        stream_output = not chunked and st.toggle("📡 Stream GPT output as it is generated", value=True)
+
+        with st.spinner("🤖 GPT analyzing portfolio..."):
+            if stream_output:
+                live = st.empty()
+                result = gpt_assess_portfolio(files, chunked=False, on_token=lambda text: live.code(text, language="json"))
+                live.empty()
+            else:
+                result = gpt_assess_portfolio(files, chunked=chunked)
+
+    render_assessment(result, quality_scores)
+
+
+def render_assessment(result, quality_scores=None):
     if "error" in result:
         st.error(f"❌ GPT error: {result['error']}")
         return
 
     st.success("✅ GPT evaluation complete.")
+    if "Assessment" in result:
+        st.caption(f"♻️ {result['Assessment']}")
+    if "Batch Errors" in result:
+        st.warning(f"⚠️ {result['Batch Errors']}")
 
     # Render score bars
     for k, v in result.items():
@@ -141,7 +180,8 @@ def governance_page():
         if isinstance(v, (int, float)):
             render_colored_bar(k, v)
 
-    show_heatmap(result)
+    # LLM scores side by side with the locally measured ones
+    show_heatmap({**result, **(quality_scores or {})})
 
     # Show GPT justification in bullet format
     if "Justification" in result:
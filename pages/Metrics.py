@@ -0,0 +1,77 @@
+# streamlit_app_title: EA Metrics
+# ---
+# title: Metrics
+# icon: 📈
+# ---
+import streamlit as st
+import pandas as pd
+import metrics
+import llm_gateway
+from settings import METRICS_PAGE_ENABLED
+
+st.set_page_config(page_title="DevoteamAI² Metrics", layout="wide")
+st.title("📈 Performance Metrics – DevoteamAI²")
+
+if not METRICS_PAGE_ENABLED:
+    st.info("🔒 The metrics page is disabled (set EA_METRICS_PAGE=1 to enable it).")
+    st.stop()
+
+scope = st.radio("Scope", ["🌐 All sessions (this process)", "👤 This session"], horizontal=True)
+registry = metrics.registry if scope.startswith("🌐") else metrics.session_registry()
+
+if st.button("🔄 Refresh"):
+    st.rerun()
+
+# --- Latencies ---
+st.subheader("⏱️ Latencies (p50 / p95)")
+timer_rows = registry.timer_rows() if registry is not None else []
+if timer_rows:
+    st.dataframe(pd.DataFrame(timer_rows).round(2), use_container_width=True)
+else:
+    st.info("No timings recorded yet – use the interviewer, Builder or Governance pages first.")
+
+# --- Caches ---
+st.subheader("♻️ Cache Hit Rates")
+cache_rows = [
+    {"Metric": name, "Value": round(value, 3) if isinstance(value, float) else value}
+    for name, value, labels, kind in metrics.collected()
+]
+if cache_rows:
+    st.dataframe(pd.DataFrame(cache_rows), use_container_width=True)
+else:
+    st.info("No cache activity yet.")
+
+# --- Token spend ---
+st.subheader("🪙 LLM Token Spend")
+llm_rows = [
+    {
+        "Model": model,
+        "Calls": values["calls"],
+        "Prompt Tokens": values["prompt_tokens"],
+        "Completion Tokens": values["completion_tokens"],
+        "Avg Latency (s)": round(values["latency_avg"], 2),
+        "Retries": values["retries"],
+        "Coalesced": values["coalesced"],
+        "Errors": values["errors"],
+    }
+    for model, values in llm_gateway.get_gateway().metrics().items()
+]
+if llm_rows:
+    st.dataframe(pd.DataFrame(llm_rows), use_container_width=True)
+else:
+    st.info("No LLM calls made by this process yet.")
+
+# --- Counters ---
+counter_rows = registry.counter_rows() if registry is not None else []
+if counter_rows:
+    with st.expander("🔢 Counters"):
+        st.dataframe(pd.DataFrame(counter_rows), use_container_width=True)
+
+# --- Export ---
+st.download_button(
+    label="📥 Download Prometheus metrics",
+    data=metrics.prometheus_text(),
+    file_name="ea_metrics.prom",
+    mime="text/plain"
+)
+st.caption("Set EA_METRICS_PORT to expose the same metrics over HTTP for Prometheus scraping.")
@@ -0,0 +1,242 @@
+# --- Materialized portfolio summary ---
+# Counters the Builder and Governance pages need (interviews per role, apps per
+# LOB x category, capability frequency per LOB, integration edges, answered
+# fields per role) are kept in one JSON document next to the other caches.
+# Saving an interview adds that interview's contribution; a page load only
+# checks the catalogue snapshot version and, when files changed, hashes just
+# the records it has not seen. Edited or deleted interviews cannot be
+# subtracted safely, so they trigger one full rebuild.
+import os
+import json
+import threading
+from datetime import datetime
+
+import metrics
+from deliverable_cache import interview_hash
+from interview_persistence import locked
+from questions import ROLE_QUESTIONS, role_group
+from settings import PORTFOLIO_SUMMARY_PATH
+
+# Bumped whenever labels or counters change shape; an older summary is rebuilt
+SUMMARY_VERSION = 3
+
+COUNTERS = ("roles", "app_lob_category", "capabilities", "integration_edges", "field_filled")
+
+ROLE_FIELDS = {group: [q["field"] for q in questions] for group, questions in ROLE_QUESTIONS.items()}
+
+
+def _filled(value):
+    # A field counts as answered when it is a non-blank string or a non-empty list
+    if isinstance(value, (list, dict)):
+        return bool(value)
+    if isinstance(value, float) and value != value:  # NaN
+        return False
+    return value is not None and bool(str(value).strip())
+
+
+def _bump(tree, keys, value=1):
+    for key in keys[:-1]:
+        tree = tree.setdefault(key, {})
+    tree[keys[-1]] = tree.get(keys[-1], 0) + value
+
+
+def _merge(counts, contribution):
+    for counter, tree in contribution.items():
+        target = counts.setdefault(counter, {})
+        for outer, value in tree.items():
+            if isinstance(value, dict):
+                for inner, n in value.items():
+                    _bump(target, [outer, inner], n)
+            else:
+                _bump(target, [outer], value)
+
+
+def _count_fields(counts, group, data):
+    _bump(counts["roles"], [group])
+    for field in ROLE_FIELDS.get(group, []):
+        if _filled(data.get(field)):
+            _bump(counts["field_filled"], [group, field])
+
+
+def field_counts(interviews):
+    """Just the "roles" / "field_filled" counters for `interviews`, enough for completeness()."""
+    counts = {"roles": {}, "field_filled": {}}
+    for data in interviews:
+        _count_fields(counts, role_group(data.get("stakeholder_role")), data)
+    return {"counts": counts}
+
+
+def contribution(name, data):
+    """The counters one interview adds; labels are normalized the way capability_pipeline does."""
+    from capability_pipeline import LOB_FROM_FILENAME, lob_label
+    from catalogue_builders import clean_capability, split_lines
+    from name_index import get_index
+
+    group = role_group(data.get("stakeholder_role"))
+    counts = {counter: {} for counter in COUNTERS}
+    _count_fields(counts, group, data)
+
+    if group == "application":
+        lob = get_index("lob").canonical(lob_label(data.get("line_of_business", "N/A")))
+        category = str(data.get("category_type", "Unspecified")).strip().lower()
+        _bump(counts["app_lob_category"], [lob, category])
+
+        apps = get_index("application")
+        owner = data.get("application_name") or "Unknown"
+        for entry in data.get("integrations") or []:
+            if isinstance(entry, dict) and str(entry.get("Target App", "")).strip():
+                source = apps.canonical(str(entry.get("Source App") or owner).strip())
+                _bump(counts["integration_edges"], [source, apps.canonical(str(entry["Target App"]).strip())])
+
+    elif group == "business":
+        match = LOB_FROM_FILENAME.search(name)
+        lob = get_index("lob").canonical(lob_label(match.group(1) if match else ""))
+        capabilities = get_index("capability")
+        for cap in split_lines(data.get("capabilities")):
+            cap = clean_capability(cap)
+            if cap:
+                _bump(counts["capabilities"], [lob, capabilities.canonical(cap)])
+    return counts
+
+
+def _empty():
+    return {"version": SUMMARY_VERSION, "members": {}, "counts": {counter: {} for counter in COUNTERS}, "stale": False, "updated_at": None}
+
+
+class PortfolioSummary:
+    def __init__(self, path=PORTFOLIO_SUMMARY_PATH):
+        self.path = path
+        self.folder = os.path.dirname(path) or "."
+        self._lock = threading.Lock()
+        self._state = None
+        self._version = None
+        self._seen = {}  # name -> interview dict already reflected in the summary
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return _empty()
+
+    def _save(self, state):
+        from name_index import save_indexes
+
+        save_indexes()
+        state["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        tmp = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, self.path)
+
+    def record(self, name, data):
+        """Add one saved interview; called by interview_persistence after every save."""
+        digest = interview_hash(data)
+        with self._lock, locked(self.folder):
+            state = self._load()
+            previous = state["members"].get(name)
+            if previous == digest:
+                return
+            if previous is None:
+                _merge(state["counts"], contribution(name, data))
+            else:
+                state["stale"] = True
+            state["members"][name] = digest
+            self._save(state)
+            self._state = state
+            metrics.inc("portfolio_summary_updates", mode="save")
+
+    def sync(self, snapshot):
+        """Summary for a catalogue snapshot; O(1) while the snapshot version is unchanged."""
+        with self._lock:
+            if self._state is not None and snapshot.version == self._version:
+                return self._state
+            with locked(self.folder):
+                state = self._load()
+                members = state["members"]
+                stale = state.get("stale") or state.get("version") != SUMMARY_VERSION or any(name not in snapshot.records for name in members)
+                fresh = {}
+                for name, data in snapshot.records.items():
+                    if self._seen.get(name) is data:
+                        continue
+                    digest = interview_hash(data)
+                    if name not in members:
+                        fresh[name] = (digest, data)
+                    elif members[name] != digest:
+                        stale = True
+
+                if stale:
+                    state = self._rebuild(snapshot.records)
+                    metrics.inc("portfolio_summary_updates", mode="rebuild")
+                elif fresh:
+                    for name, (digest, data) in fresh.items():
+                        _merge(state["counts"], contribution(name, data))
+                        members[name] = digest
+                    metrics.inc("portfolio_summary_updates", len(fresh), mode="catch_up")
+                if stale or fresh:
+                    self._save(state)
+
+            self._seen = dict(snapshot.records)
+            self._state, self._version = state, snapshot.version
+            return state
+
+    def _rebuild(self, records):
+        with metrics.timer("portfolio_summary_rebuild"):
+            state = _empty()
+            for name, data in records.items():
+                _merge(state["counts"], contribution(name, data))
+                state["members"][name] = interview_hash(data)
+            return state
+
+
+_summaries = {}
+_summaries_lock = threading.Lock()
+
+
+def get_summary(path=PORTFOLIO_SUMMARY_PATH):
+    with _summaries_lock:
+        summary = _summaries.get(path)
+        if summary is None:
+            summary = _summaries[path] = PortfolioSummary(path)
+        return summary
+
+
+def load_summary(snapshot, path=PORTFOLIO_SUMMARY_PATH):
+    return get_summary(path).sync(snapshot)
+
+
+def record(name, data, path=PORTFOLIO_SUMMARY_PATH):
+    get_summary(path).record(name, data)
+
+
+# --- Read helpers for the pages ---
+
+def matrix(state, counter):
+    """Nested {row: {column: n}} counter as a rows x columns DataFrame (same shape as count_matrix)."""
+    import pandas as pd
+
+    counts = state["counts"].get(counter) or {}
+    if not counts:
+        return pd.DataFrame()
+    frame = pd.DataFrame.from_dict(counts, orient="index").fillna(0).astype(int)
+    return frame.sort_index().sort_index(axis=1)
+
+
+def edge_count(state):
+    return sum(sum(targets.values()) for targets in state["counts"]["integration_edges"].values())
+
+
+def completeness(state):
+    """Overall share of expected answers present plus per-field rows, from the counters."""
+    rows, answered, expected = [], 0, 0
+    for group, fields in ROLE_FIELDS.items():
+        total = state["counts"]["roles"].get(group, 0)
+        if not total:
+            continue
+        filled = state["counts"]["field_filled"].get(group, {})
+        for field in fields:
+            rows.append({"Role": group.title(), "Field": field, "Filled": filled.get(field, 0), "Interviews": total,
+                         "Fill Rate %": round(100 * filled.get(field, 0) / total, 1)})
+            answered += filled.get(field, 0)
+            expected += total
+    return (100 * answered / expected if expected else 0.0), rows
@@ -0,0 +1,146 @@
+# --- Prompt compaction for Builder and Governance LLM calls ---
+# Interviews used to be pasted into prompts as indented JSON, repeating every
+# key name (and every "Source App" / "Interface Type" of every integration) per
+# record. Here each deliverable only gets the fields it needs, interviews are
+# written as one header row plus one compact JSON array per interview (nested
+# integrations as a second table), and interviews that are identical after
+# projection, such as repeated re-submissions of the same app, are sent once.
+import json
+
+import metrics
+from questions import questions_app_owner, questions_business_owner
+
+
+NESTED_FIELDS = ("integrations",)
+
+_APP_FIELDS = [q["field"] for q in questions_app_owner]
+_BUSINESS_FIELDS = [q["field"] for q in questions_business_owner]
+
+# Fields each deliverable's prompt actually uses; None keeps every field
+DELIVERABLE_FIELDS = {
+    "📘 Build Application Catalogue": [
+        "application_name", "line_of_business", "category_type", "status", "technology", "stakeholder_role",
+    ],
+    "📘 Build Business Catalogue": ["business_domain", "capabilities", "pain_points"],
+    "⚠️ Build Gap Analysis": _APP_FIELDS,
+    "governance": ["stakeholder_role"] + _APP_FIELDS + _BUSINESS_FIELDS,
+}
+
+
+_encoding = None
+
+
+def _tokenizer():
+    # tiktoken is optional and slow to import, so it is only loaded on first use
+    global _encoding
+    if _encoding is None:
+        try:
+            import tiktoken
+            _encoding = tiktoken.get_encoding("cl100k_base")
+        except Exception:
+            _encoding = False
+    return _encoding
+
+
+def estimate_tokens(text):
+    if _tokenizer():
+        return len(_encoding.encode(text))
+    # ~4 characters per token for English/JSON text
+    return max(1, len(text) // 4)
+
+
+# Interview dicts are reused across reruns by the catalogue store, so the baseline
+# size of each one is measured once; the dict is kept so its id is not recycled
+_baseline_cache = {}
+BASELINE_CACHE_SIZE = 20000
+
+
+def baseline_tokens(interviews):
+    """Tokens the pages used to send for `interviews`: json.dumps(interviews, indent=2)."""
+    total = 2  # the enclosing brackets
+    for interview in interviews:
+        entry = _baseline_cache.get(id(interview))
+        if entry is None or entry[0] is not interview:
+            if len(_baseline_cache) >= BASELINE_CACHE_SIZE:
+                _baseline_cache.clear()
+            # As an element of the indented list: one level deeper, followed by ",\n"
+            text = "  " + json.dumps(interview, indent=2).replace("\n", "\n  ") + ",\n"
+            entry = _baseline_cache[id(interview)] = (interview, estimate_tokens(text))
+        total += entry[1]
+    return total
+
+
+def compact_json(data):
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def project(interview, fields=None):
+    """Keep only `fields` (in that order), dropping empty values."""
+    keys = fields if fields is not None else list(interview)
+    return {k: interview[k] for k in keys if interview.get(k) not in (None, "", [], {})}
+
+
+def dedupe(interviews):
+    seen, unique = set(), []
+    for interview in interviews:
+        key = compact_json(interview)
+        if key not in seen:
+            seen.add(key)
+            unique.append(interview)
+    return unique
+
+
+def _columns(records, skip=()):
+    columns = []
+    for record in records:
+        for key in record:
+            if key not in skip and key not in columns:
+                columns.append(key)
+    return columns
+
+
+def encode_table(interviews):
+    """Header row + one JSON array per interview; nested lists become their own table keyed by row number."""
+    columns = _columns(interviews, skip=NESTED_FIELDS)
+    lines = [
+        "Interviews – first line is the column header, then one JSON array per interview (# = row number):",
+        compact_json(["#"] + columns),
+    ]
+    nested = {field: [] for field in NESTED_FIELDS}
+    for row_no, interview in enumerate(interviews, start=1):
+        lines.append(compact_json([row_no] + [interview.get(c, "") for c in columns]))
+        for field in NESTED_FIELDS:
+            for entry in interview.get(field) or []:
+                if isinstance(entry, dict):
+                    nested[field].append((row_no, entry))
+
+    for field, entries in nested.items():
+        if not entries:
+            continue
+        nested_columns = _columns([entry for _, entry in entries])
+        lines.append(f"\n{field} – first line is the column header; # refers to the interview row:")
+        lines.append(compact_json(["#"] + nested_columns))
+        lines.extend(compact_json([row_no] + [entry.get(c, "") for c in nested_columns]) for row_no, entry in entries)
+    return "\n".join(lines)
+
+
+def compact_interviews(interviews, deliverable=None):
+    """Encode interviews for `deliverable`; returns {"text", "tokens_before", "tokens_after", "interviews", "unique"}."""
+    fields = DELIVERABLE_FIELDS.get(deliverable)
+    unique = dedupe([project(i, fields) for i in interviews])
+    text = encode_table(unique)
+    before = baseline_tokens(interviews)
+    after = estimate_tokens(text)
+    labels = {"deliverable": deliverable or "all"}
+    metrics.inc("prompt_tokens_before", before, **labels)
+    metrics.inc("prompt_tokens_after", after, **labels)
+    return {"text": text, "tokens_before": before, "tokens_after": after, "interviews": len(interviews), "unique": len(unique)}
+
+
+def describe(report):
+    saved = 1 - report["tokens_after"] / report["tokens_before"] if report["tokens_before"] else 0
+    duplicates = report["interviews"] - report["unique"]
+    return (
+        f"🪶 Prompt data: {report['tokens_before']:,} → {report['tokens_after']:,} tokens ({saved:.0%} smaller)"
+        + (f", {duplicates} duplicate interview(s) sent once" if duplicates else "")
+    )
@@ -0,0 +1,110 @@
+# --- Deterministic data-quality rules for the Governance page ---
+# Completeness and the other hygiene checks are exact functions of the interview
+# JSON, so they are computed locally in one vectorized pass instead of being
+# estimated by the LLM. Expected fields come from the interview question sets.
+import re
+
+from portfolio_summary import completeness as summary_completeness, field_counts
+from questions import ROLE_QUESTIONS, role_group
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def interview_frame(interviews):
+    import pandas as pd
+
+    df = pd.DataFrame.from_records(list(interviews)) if interviews else pd.DataFrame()
+    if df.empty:
+        return df
+    df["role_group"] = df.get("stakeholder_role", pd.Series(index=df.index, dtype="object")).map(role_group)
+    return df
+
+
+def completeness(interviews):
+    """Per-role field fill rates and the overall share of expected answers present.
+
+    Same counting as the portfolio summary's "Answered Fields", so both figures agree.
+    """
+    import pandas as pd
+
+    percent, rows = summary_completeness(field_counts(interviews))
+    return percent, pd.DataFrame(rows)
+
+
+def integration_frame(df):
+    import pandas as pd
+
+    if "integrations" not in df:
+        return pd.DataFrame(columns=["Owner App", "Source App", "Target App"])
+    apps = df[df["role_group"] == "application"]
+    exploded = apps[["application_name", "integrations"]].explode("integrations").dropna(subset=["integrations"])
+    exploded = exploded[exploded["integrations"].map(lambda v: isinstance(v, dict))]
+    if exploded.empty:
+        return pd.DataFrame(columns=["Owner App", "Source App", "Target App"])
+    details = pd.DataFrame(exploded["integrations"].tolist(), index=exploded.index)
+    return pd.DataFrame({
+        "Owner App": exploded["application_name"],
+        "Source App": details.get("Source App", pd.Series("", index=details.index)).fillna("").astype(str).str.strip(),
+        "Target App": details.get("Target App", pd.Series("", index=details.index)).fillna("").astype(str).str.strip(),
+    }).reset_index(drop=True)
+
+
+def closed_option_fields():
+    fields = {}
+    for questions in ROLE_QUESTIONS.values():
+        for q in questions:
+            if q.get("options"):
+                fields[q["field"]] = {o.lower() for o in q["options"]}
+    return fields
+
+
+def evaluate(interviews):
+    """Return (scores, details): 0-100 scores for the bars/heatmap plus detail tables."""
+    import pandas as pd
+
+    interviews = list(interviews)
+    df = interview_frame(interviews)
+    if df.empty:
+        return {}, {}
+
+    completeness_pct, fill_rates = completeness(interviews)
+
+    # Integrations with an empty Source or Target App
+    integrations = integration_frame(df)
+    orphan_mask = (integrations["Source App"] == "") | (integrations["Target App"] == "")
+    orphans = integrations[orphan_mask]
+
+    # Values outside the offered options (e.g. status "live" vs Active / Retired / ...)
+    inconsistent = []
+    checked = 0
+    for field, allowed in closed_option_fields().items():
+        if field not in df:
+            continue
+        values = df[field].dropna().astype(str).str.strip()
+        values = values[values != ""]
+        checked += len(values)
+        bad = values[~values.str.lower().isin(allowed)]
+        inconsistent.extend({"Field": field, "Value": v} for v in bad)
+    inconsistent = pd.DataFrame(inconsistent, columns=["Field", "Value"])
+
+    # The same entity (role + application / business domain) interviewed more than once
+    names = df.get("application_name", pd.Series(index=df.index, dtype="object"))
+    if "business_domain" in df:
+        names = names.fillna(df["business_domain"])
+    entity = df["role_group"] + "|" + names.fillna("").astype(str).str.lower().str.replace(_WHITESPACE, " ", regex=True).str.strip()
+    duplicates = entity[entity.duplicated(keep=False)].value_counts().rename_axis("Entity").reset_index(name="Interviews")
+    duplicate_extra = int(entity.duplicated().sum())
+
+    scores = {
+        "Completeness (measured)": round(completeness_pct),
+        "Integration Integrity": round(100 * (1 - len(orphans) / len(integrations))) if len(integrations) else 100,
+        "Option Consistency": round(100 * (1 - len(inconsistent) / checked)) if checked else 100,
+        "Entity Uniqueness": round(100 * (1 - duplicate_extra / len(df))),
+    }
+    details = {
+        "Field Fill Rates": fill_rates,
+        "Orphan Integrations": orphans,
+        "Inconsistent Values": inconsistent,
+        "Duplicate Entities": duplicates,
+    }
+    return scores, details
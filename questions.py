@@ -0,0 +1,42 @@
+# --- Interview question sets ---
+# Shared by the interviewer (app.py) and the data-quality rules on the Governance
+# page, which treat every field asked here as expected in a complete interview.
+# `example_phrases` are the help requests answered with the option examples.
+questions_app_owner = [
+    {"field": "application_name", "question": "What is the Application Name?", "options": []},
+    {"field": "category_type", "question": "What is the Application Category Type?", "options": ["Core System", "Supporting System", "Integration Layer", "BI/Reporting Tool", "Mobile App", "External Portal"]},
+    {"field": "line_of_business", "question": "Which Line of Business does it support?", "options": []},
+    {"field": "status", "question": "What is the current Application Status?", "options": ["Active", "Under Development", "Retired", "On Hold"]},
+    {"field": "technology", "question": "What is the Technology Stack (e.g., Java, .NET, Node.js, Python)?", "options": []},
+     # 🔽 Integration questions added here
+    {"field": "integrations", "question": "Let’s collect integration details for this application. Please use the form below to add integrations.", "type": "custom"}
+]
+
+questions_business_owner = [
+    {"field": "business_domain", "question": "What is your business domain or department?", "options": []},
+    {"field": "capabilities", "question": "List the key business capabilities in your domain.", "options": []},
+    {"field": "pain_points", "question": "What are the main pain points in current operations?", "options": []},
+    {"field": "kpis", "question": "What KPIs or performance metrics do you use to evaluate success?", "options": []},
+    {"field": "critical_systems", "question": "Which systems or applications are critical to your operations?", "options": []}
+]
+
+example_phrases = [
+    "give me example", "give me examples", "can you give me example", "can you give me examples",
+    "what are the options", "what are examples", "examples please", "show me example", "i need example"
+]
+
+
+ROLE_QUESTIONS = {
+    "application": questions_app_owner,
+    "business": questions_business_owner,
+}
+
+
+def role_group(role):
+    """"application", "business" or "other" for a stakeholder role such as "Application Owner"."""
+    role = str(role or "").lower()
+    return "application" if "application" in role else "business" if "business" in role else "other"
+
+
+def questions_for_role(role):
+    return ROLE_QUESTIONS.get(role_group(role), [])
@@ -0,0 +1,61 @@
+# --- Shared paths and switches for the interviewer app and its pages ---
+import os
+
+# Folder where every finished interview is persisted
+CATALOGUE_DIR = os.getenv("EA_CATALOGUE_DIR", "catalogues")
+
+# Scratch space for indexes, caches and other derived artefacts
+CACHE_DIR = os.getenv("EA_CACHE_DIR", ".ea_cache")
+
+# "json" keeps one file per interview only; "sqlite" also indexes every
+# interview in an embedded database that the Builder queries directly;
+# "jsonl" appends interviews to compact log segments instead of single files
+STORAGE_BACKEND = os.getenv("EA_STORAGE_BACKEND", "json").strip().lower()
+INTERVIEW_DB_PATH = os.getenv("EA_INTERVIEW_DB", os.path.join(CACHE_DIR, "interviews.db"))
+
+# Append-only interview log (segments live next to the JSON files)
+INTERVIEW_LOG_DIR = os.getenv("EA_INTERVIEW_LOG_DIR", os.path.join(CATALOGUE_DIR, "log"))
+LOG_SEGMENT_MAX_BYTES = int(os.getenv("EA_LOG_SEGMENT_MAX_BYTES", str(64 * 1024 * 1024)))
+LOG_COMPACT_AFTER_SEGMENTS = int(os.getenv("EA_LOG_COMPACT_AFTER_SEGMENTS", "8"))
+
+# Save receipts only guard against reruns/retries of the same save, so old ones are pruned
+RECEIPT_TTL_SECONDS = int(os.getenv("EA_RECEIPT_TTL", str(7 * 24 * 3600)))
+
+# Persistent cache for validate_answer verdicts
+VALIDATION_CACHE_PATH = os.getenv("EA_VALIDATION_CACHE", os.path.join(CACHE_DIR, "validation_cache.db"))
+VALIDATION_CACHE_MAX_ENTRIES = int(os.getenv("EA_VALIDATION_CACHE_MAX_ENTRIES", "5000"))
+VALIDATION_CACHE_TTL_SECONDS = int(os.getenv("EA_VALIDATION_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Generated deliverables kept on disk (least recently used entries go first)
+DELIVERABLE_CACHE_MAX_ENTRIES = int(os.getenv("EA_DELIVERABLE_CACHE_MAX_ENTRIES", "500"))
+DELIVERABLE_CACHE_TTL_SECONDS = int(os.getenv("EA_DELIVERABLE_CACHE_TTL", str(30 * 24 * 3600)))
+
+# Built export files (least recently downloaded go first)
+EXPORT_CACHE_MAX_BYTES = int(os.getenv("EA_EXPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+EXPORT_CACHE_TTL_SECONDS = int(os.getenv("EA_EXPORT_CACHE_TTL", str(7 * 24 * 3600)))
+
+# Shared LLM gateway limits (all pages and sessions of one process)
+LLM_MAX_WORKERS = int(os.getenv("EA_LLM_MAX_WORKERS", "8"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("EA_LLM_RPM", "60"))  # 0 = no client-side throttling
+LLM_BURST = int(os.getenv("EA_LLM_BURST", "10"))
+LLM_MAX_RETRIES = int(os.getenv("EA_LLM_MAX_RETRIES", "4"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("EA_LLM_TIMEOUT", "120"))
+
+# Background deliverable jobs
+JOB_DB_PATH = os.getenv("EA_JOB_DB", os.path.join(CACHE_DIR, "jobs.db"))
+JOB_MAX_WORKERS = int(os.getenv("EA_JOB_MAX_WORKERS", "2"))
+# Replicas sharing the job DB only reclaim jobs whose owner stopped heartbeating
+JOB_HEARTBEAT_SECONDS = float(os.getenv("EA_JOB_HEARTBEAT", "15"))
+JOB_STALE_SECONDS = float(os.getenv("EA_JOB_STALE_AFTER", "90"))
+JOB_RETENTION_SECONDS = int(os.getenv("EA_JOB_RETENTION", str(14 * 24 * 3600)))
+
+# Per-interview governance scores (re-assessed only when an interview changes)
+GOVERNANCE_DB_PATH = os.getenv("EA_GOVERNANCE_DB", os.path.join(CACHE_DIR, "governance.db"))
+
+# Materialized portfolio summary (counts the Builder and Governance pages read)
+PORTFOLIO_SUMMARY_PATH = os.getenv("EA_PORTFOLIO_SUMMARY", os.path.join(CACHE_DIR, "portfolio_summary.json"))
+
+# Instrumentation: the admin metrics page (off by default: it shows token spend
+# across every session) and an optional Prometheus scrape port
+METRICS_PAGE_ENABLED = os.getenv("EA_METRICS_PAGE", "0") == "1"
+METRICS_PORT = int(os.getenv("EA_METRICS_PORT", "0"))
@@ -0,0 +1,45 @@
+import pytest
+
+from fast_validators import ACCEPT, EXAMPLE, FastValidator
+from questions import example_phrases, questions_app_owner, questions_business_owner
+
+QUESTIONS = {q["field"]: q for q in questions_app_owner + questions_business_owner}
+
+
+@pytest.fixture
+def validator():
+    return FastValidator(example_phrases)
+
+
+@pytest.mark.parametrize("field, answer", [
+    ("application_name", "what do you mean?"),
+    ("application_name", "why do you need this"),
+    ("line_of_business", "what does that mean"),
+    ("capabilities", "I don't really know what to say"),
+    ("capabilities", "not really sure about that"),
+    ("pain_points", "I have no real idea"),
+    ("business_domain", "can you rephrase the question"),
+    ("application_name", "I think it is CRM"),
+    ("status", "Inactive"),
+    ("status", "not active"),
+    ("kpis", "yes it is"),
+])
+def test_non_answers_escalate(validator, field, answer):
+    assert validator.check(QUESTIONS[field], answer) == (None, answer)
+
+
+@pytest.mark.parametrize("field, answer, value", [
+    ("application_name", "Customer Portal", "Customer Portal"),
+    ("line_of_business", "Retail Banking", "Retail Banking"),
+    ("status", "active", "Active"),
+    ("category_type", "Core Sytem", "Core System"),
+    ("technology", "Java, Spring and Oracle", "Java, Spring and Oracle"),
+    ("capabilities", "Payroll, hiring and onboarding", "Payroll, hiring and onboarding"),
+    ("critical_systems", "SAP, Salesforce", "SAP, Salesforce"),
+])
+def test_decisive_answers_accepted(validator, field, answer, value):
+    assert validator.check(QUESTIONS[field], answer) == (ACCEPT, value)
+
+
+def test_help_request_gets_examples(validator):
+    assert validator.check(QUESTIONS["category_type"], "what are the options?")[0] == EXAMPLE
@@ -0,0 +1,48 @@
+import os
+import glob
+import importlib
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODULES = sorted(
+    os.path.splitext(os.path.basename(path))[0]
+    for path in glob.glob(os.path.join(ROOT, "*.py"))
+    if os.path.basename(path) != "app.py"
+)
+PAGES = [os.path.join(ROOT, "app.py")] + sorted(glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+@pytest.mark.parametrize("name", MODULES)
+def test_module_imports(name):
+    pytest.importorskip("pandas")
+    importlib.import_module(name)
+
+
+@pytest.mark.parametrize("path", PAGES, ids=os.path.basename)
+def test_page_runs(path, tmp_path, monkeypatch):
+    pytest.importorskip("pandas")
+    testing = pytest.importorskip("streamlit.testing.v1")
+    # settings uses relative default paths, so the page only sees an empty catalogue
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr("settings.METRICS_PAGE_ENABLED", True)
+    app = testing.AppTest.from_file(path, default_timeout=60).run()
+    assert not app.exception, [e.message for e in app.exception]
+
+
+@pytest.mark.parametrize("role, field", [("Application Owner", "application_name"), ("Business Owner", "business_domain")])
+def test_interview_starts_with_role_questions(role, field, tmp_path, monkeypatch):
+    pytest.importorskip("pandas")
+    testing = pytest.importorskip("streamlit.testing.v1")
+    from questions import questions_for_role
+
+    monkeypatch.chdir(tmp_path)
+    app = testing.AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    app.session_state["role_selected"] = True
+    app.session_state["role"] = role
+    app.session_state["user_name"] = "Sam"
+    app.run()
+    assert not app.exception
+    first = next(q for q in questions_for_role(role) if q["field"] == field)
+    assert app.session_state["messages"][0]["content"] == first["question"]
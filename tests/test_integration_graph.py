@@ -0,0 +1,36 @@
+from integration_graph import IntegrationGraph
+
+
+def _app(name, *targets, source=None):
+    return {
+        "application_name": name,
+        "integrations": [{"Source App": source or "", "Target App": target} for target in targets],
+    }
+
+
+def test_cycles_are_found():
+    graph = IntegrationGraph()
+    graph.sync({"a.json": _app("CRM", "ERP"), "b.json": _app("ERP", "Billing"), "c.json": _app("Billing", "crm")})
+    assert graph.cycles() == [["Billing", "CRM", "ERP"]]
+
+
+def test_self_loop_is_a_cycle_and_chains_are_not():
+    graph = IntegrationGraph()
+    graph.sync({"a.json": _app("Hub", "Hub"), "b.json": _app("CRM", "ERP")})
+    assert graph.cycles() == [["Hub"]]
+
+
+def test_long_chain_does_not_recurse():
+    graph = IntegrationGraph()
+    graph.sync({f"{i}.json": _app(f"App {i}", f"App {i + 1}") for i in range(5000)})
+    assert graph.cycles() == []
+    assert graph.downstream("App 4998") == [("App 4999", 1), ("App 5000", 2)]
+
+
+def test_removed_interview_drops_its_edges():
+    graph = IntegrationGraph()
+    graph.sync({"a.json": _app("CRM", "ERP"), "b.json": _app("ERP", "CRM")})
+    assert graph.cycles()
+    graph.sync({"a.json": _app("CRM", "ERP")})
+    assert graph.cycles() == []
+    assert graph.upstream("ERP") == [("CRM", 1)]
@@ -0,0 +1,52 @@
+import json
+
+import interview_db
+import interview_log
+
+
+def _write(folder, name, payload):
+    (folder / name).write_text(payload if isinstance(payload, str) else json.dumps(payload), encoding="utf-8")
+
+
+APP = {
+    "stakeholder_role": "Application Owner", "application_name": "CRM", "line_of_business": "Retail",
+    "integrations": [{"Target App": "ERP", "Protocol": "REST"}, {"Source App": "Billing", "Target App": "CRM"}, "bad"],
+}
+
+
+def test_import_skips_bad_files_and_keeps_edges(tmp_path):
+    folder = tmp_path / "catalogues"
+    folder.mkdir()
+    _write(folder, "a.json", APP)
+    _write(folder, "broken.json", "{not json")
+    db = str(tmp_path / "interviews.db")
+
+    imported, errors = interview_db.import_catalogues(str(folder), db)
+    assert imported == 1 and list(errors) == ["broken.json"]
+    assert [(r["Source App"], r["Target App"]) for r in interview_db.integration_rows(db_path=db)] == [
+        ("CRM", "ERP"), ("Billing", "CRM"),
+    ]
+    assert interview_db.app_heatmap_rows(db) == [
+        {"Application": "CRM", "Line of Business": "Retail", "Category": "Unspecified"},
+    ]
+
+
+def test_reimport_replaces_the_previous_row(tmp_path):
+    folder = tmp_path / "catalogues"
+    folder.mkdir()
+    _write(folder, "a.json", APP)
+    db = str(tmp_path / "interviews.db")
+    interview_db.import_catalogues(str(folder), db)
+    _write(folder, "a.json", {**APP, "integrations": []})
+    interview_db.import_catalogues(str(folder), db)
+    assert len(interview_db.app_heatmap_rows(db)) == 1
+    assert interview_db.integration_rows(db_path=db) == []
+
+
+def test_log_import_skips_bad_files(tmp_path):
+    folder = tmp_path / "catalogues"
+    folder.mkdir()
+    _write(folder, "a.json", APP)
+    _write(folder, "broken.json", "{not json")
+    imported, errors = interview_log.import_catalogues(str(folder), str(tmp_path / "log"))
+    assert imported == 1 and list(errors) == ["broken.json"]
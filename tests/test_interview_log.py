@@ -0,0 +1,38 @@
+import interview_log
+
+
+def _interview(name, status):
+    return {"stakeholder_role": "Application Owner", "application_name": name, "status": status}
+
+
+def test_reader_only_sees_new_lines(tmp_path):
+    folder = str(tmp_path)
+    reader = interview_log.LogReader(folder)
+    interview_log.append(_interview("CRM", "Active"), "a.json", folder)
+    records, changed = reader.refresh()
+    assert changed and list(records) == ["a.json"]
+
+    first = records["a.json"]
+    interview_log.append(_interview("ERP", "Active"), "b.json", folder)
+    records, changed = reader.refresh()
+    assert changed and list(records) == ["a.json", "b.json"]
+    assert records["a.json"] is first
+    assert reader.refresh()[1] is False
+
+
+def test_compaction_keeps_latest_per_entity(tmp_path):
+    folder = str(tmp_path)
+    interview_log.append(_interview("CRM", "Active"), "a.json", folder)
+    interview_log.append(_interview("ERP", "Active"), "b.json", folder)
+    interview_log.append(_interview("crm ", "Retired"), "c.json", folder)
+
+    assert interview_log.compact(folder) == 2
+    assert len(interview_log.list_segments(folder)) == 1
+    records, _ = interview_log.LogReader(folder).refresh()
+    assert list(records) == ["b.json", "c.json"]
+    assert records["c.json"]["status"] == "Retired"
+
+
+def test_append_reports_its_segment(tmp_path):
+    entry = interview_log.append(_interview("CRM", "Active"), "a.json", str(tmp_path))
+    assert entry["segment"] == interview_log.segment_path(1, str(tmp_path))
@@ -0,0 +1,86 @@
+import os
+import json
+import threading
+
+import pytest
+
+import interview_persistence
+
+
+@pytest.fixture(autouse=True)
+def no_summary(monkeypatch):
+    # The portfolio summary lives under the real cache folder; it is not under test here
+    monkeypatch.setattr("portfolio_summary.record", lambda name, data: None)
+
+
+INTERVIEW = {"stakeholder_role": "Application Owner", "application_name": "CRM / Sales"}
+
+
+def test_same_token_saves_once(tmp_path):
+    folder = str(tmp_path)
+    first = interview_persistence.save_interview(INTERVIEW, "token-1", backend="json", folder=folder)
+    again = interview_persistence.save_interview(INTERVIEW, "token-1", backend="json", folder=folder)
+    assert first["created"] and not again["created"]
+    assert again["id"] == first["id"]
+    assert [f for f in os.listdir(folder) if f.endswith(".json")] == [first["id"]]
+    with open(first["location"], encoding="utf-8") as f:
+        assert json.load(f) == INTERVIEW
+
+
+def test_concurrent_saves_with_one_token(tmp_path):
+    folder = str(tmp_path)
+    receipts = []
+    threads = [
+        threading.Thread(target=lambda: receipts.append(
+            interview_persistence.save_interview(INTERVIEW, "token-1", backend="json", folder=folder)
+        ))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sum(r["created"] for r in receipts) == 1
+    assert len({r["id"] for r in receipts}) == 1
+
+
+def test_ids_are_safe_file_names():
+    name = interview_persistence.interview_id(INTERVIEW)
+    assert name.startswith("ApplicationOwner_CRM_Sales__") and "/" not in name
+
+
+def test_old_receipts_are_pruned(tmp_path):
+    folder = str(tmp_path)
+    interview_persistence.save_interview(INTERVIEW, "old", backend="json", folder=folder)
+    interview_persistence.save_interview(INTERVIEW, "new", backend="json", folder=folder)
+    old = interview_persistence._receipt_path("old", folder)
+    os.utime(old, (0, 0))
+    assert interview_persistence.prune_receipts(folder, ttl=3600) == 1
+    assert interview_persistence.load_receipt("old", folder) is None
+    assert interview_persistence.load_receipt("new", folder) is not None
+
+
+def test_write_atomic_never_replaces(tmp_path):
+    path = str(tmp_path / "a.json")
+    interview_persistence.write_atomic(path, b"first")
+    with pytest.raises(FileExistsError):
+        interview_persistence.write_atomic(path, b"second")
+    with open(path, "rb") as f:
+        assert f.read() == b"first"
+    assert os.listdir(tmp_path) == ["a.json"]
+
+
+@pytest.mark.parametrize("errno_name", ["EOPNOTSUPP", "EXDEV", "EPERM"])
+def test_write_atomic_without_hard_links(tmp_path, monkeypatch, errno_name):
+    import errno
+
+    def no_link(src, dst):
+        raise OSError(getattr(errno, errno_name), "link not supported")
+
+    monkeypatch.setattr(os, "link", no_link)
+    path = str(tmp_path / "a.json")
+    interview_persistence.write_atomic(path, b"first")
+    with pytest.raises(FileExistsError):
+        interview_persistence.write_atomic(path, b"second")
+    with open(path, "rb") as f:
+        assert f.read() == b"first"
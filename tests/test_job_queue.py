@@ -0,0 +1,75 @@
+import time
+import threading
+
+import pytest
+
+import job_queue
+from job_queue import DONE, INTERRUPTED, RUNNING, JobQueue
+
+
+@pytest.fixture
+def release():
+    event = threading.Event()
+
+    @job_queue.job("test_wait")
+    def wait(params, report):
+        report(0.5, "waiting")
+        event.wait(5)
+        return {"value": params["value"]}
+
+    yield event
+    event.set()
+
+
+def _wait_for(queue, job_id, status):
+    for _ in range(200):
+        record = queue.get(job_id)
+        if record["status"] == status:
+            return record
+        time.sleep(0.01)
+    raise AssertionError(f"job stayed {record['status']}")
+
+
+def test_job_runs_to_done(tmp_path, release):
+    queue = JobQueue(str(tmp_path / "jobs.db"), heartbeat=0)
+    job_id = queue.submit("test_wait", {"value": 1})
+    release.set()
+    assert _wait_for(queue, job_id, DONE)["result"] == {"value": 1}
+
+
+def test_identical_active_job_is_reused(tmp_path, release):
+    queue = JobQueue(str(tmp_path / "jobs.db"), heartbeat=0)
+    assert queue.submit("test_wait", {"value": 1}) == queue.submit("test_wait", {"value": 1})
+
+
+def test_new_replica_leaves_live_jobs_alone(tmp_path, release):
+    path = str(tmp_path / "jobs.db")
+    first = JobQueue(path, heartbeat=0)
+    job_id = first.submit("test_wait", {"value": 1})
+    _wait_for(first, job_id, RUNNING)
+
+    second = JobQueue(path, heartbeat=0)
+    assert second.get(job_id)["status"] == RUNNING
+
+
+def test_stale_jobs_are_reclaimed(tmp_path, release):
+    path = str(tmp_path / "jobs.db")
+    first = JobQueue(path, heartbeat=0, stale_after=60)
+    job_id = first.submit("test_wait", {"value": 1})
+    _wait_for(first, job_id, RUNNING)
+
+    second = JobQueue(path, heartbeat=0, stale_after=60)
+    second.maintain(now=time.time() + 120)
+    assert second.get(job_id)["status"] == INTERRUPTED
+
+
+def test_old_finished_jobs_are_pruned(tmp_path, release):
+    queue = JobQueue(str(tmp_path / "jobs.db"), heartbeat=0, retention=3600)
+    job_id = queue.submit("test_wait", {"value": 1})
+    release.set()
+    _wait_for(queue, job_id, DONE)
+
+    queue.maintain()
+    assert queue.get(job_id) is not None
+    queue.maintain(now=time.time() + 7200)
+    assert queue.get(job_id) is None
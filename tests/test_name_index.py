@@ -0,0 +1,36 @@
+from name_index import NameIndex, edit_distance
+
+
+def test_single_typo_merges():
+    index = NameIndex("lob")
+    assert index.canonical("Social Development") == "Social Development"
+    assert index.canonical("Socail Development") == "Social Development"
+
+
+def test_different_words_stay_apart():
+    index = NameIndex("capability")
+    assert index.canonical("Customer onboarding") == "Customer onboarding"
+    assert index.canonical("Customer offboarding") == "Customer offboarding"
+    assert index.canonical("Custmer onboarding") == "Customer onboarding"
+
+
+def test_numbered_names_do_not_chain():
+    index = NameIndex("application")
+    names = [f"App {i:05d}" for i in range(50)]
+    assert index.canonicalize(names) == names
+
+
+def test_generic_app_words_are_ignored():
+    index = NameIndex("application")
+    assert index.canonical("CRM System") == "CRM System"
+    assert index.canonical("CRM") == "CRM System"
+
+
+def test_override_wins():
+    index = NameIndex("application", overrides={"XYZ CRM": "Customer Hub"})
+    assert index.canonical("xyz  crm") == "Customer Hub"
+
+
+def test_edit_distance_counts_swaps_once():
+    assert edit_distance("socail", "social") == 1
+    assert edit_distance("onboarding", "offboarding") == 2
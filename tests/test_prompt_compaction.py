@@ -0,0 +1,21 @@
+import json
+
+import prompt_compaction
+
+INTERVIEWS = [
+    {"stakeholder_role": "Application Owner", "application_name": f"App {i}", "status": "Active",
+     "integrations": [{"Target App": "ERP", "Protocol": "REST"}]}
+    for i in range(40)
+]
+
+
+def test_baseline_matches_indented_payload():
+    expected = prompt_compaction.estimate_tokens(json.dumps(INTERVIEWS, indent=2))
+    assert abs(prompt_compaction.baseline_tokens(INTERVIEWS) - expected) <= 0.02 * expected
+
+
+def test_duplicates_are_sent_once():
+    report = prompt_compaction.compact_interviews(INTERVIEWS + INTERVIEWS[:5], "⚠️ Build Gap Analysis")
+    assert report["interviews"] == 45
+    assert report["unique"] == 40
+    assert report["tokens_after"] < report["tokens_before"]
@@ -0,0 +1,42 @@
+import pytest
+
+pd = pytest.importorskip("pandas")
+
+import quality_rules
+
+
+def test_missing_fields_lower_completeness():
+    scores, details = quality_rules.evaluate([
+        {"stakeholder_role": "Application Owner", "application_name": "CRM"},
+    ])
+    assert scores["Completeness (measured)"] < 100
+    fill = details["Field Fill Rates"].set_index("Field")["Filled"]
+    assert fill["application_name"] == 1
+    assert fill["technology"] == 0
+
+
+def test_complete_interview_scores_100():
+    scores, _ = quality_rules.evaluate([
+        {
+            "stakeholder_role": "Business Owner",
+            "business_domain": "HR",
+            "capabilities": "Hiring",
+            "pain_points": "Manual payroll",
+            "kpis": "Time to hire",
+            "critical_systems": "SAP",
+        },
+    ])
+    assert scores["Completeness (measured)"] == 100
+
+
+def test_completeness_matches_portfolio_summary():
+    import portfolio_summary
+
+    interviews = [
+        {"stakeholder_role": "Application Owner", "application_name": "CRM", "status": " ", "integrations": []},
+        {"stakeholder_role": "Business Owner", "business_domain": "HR", "capabilities": ["Hiring"]},
+    ]
+    scores, details = quality_rules.evaluate(interviews)
+    percent, rows = portfolio_summary.completeness(portfolio_summary.field_counts(interviews))
+    assert scores["Completeness (measured)"] == round(percent)
+    assert details["Field Fill Rates"].to_dict("records") == rows
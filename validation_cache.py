@@ -0,0 +1,131 @@
+# --- Persistent cache for validate_answer verdicts ---
+# Identical (field, answer, options) triples get the same verdict from the model,
+# so they are stored in a small SQLite table with LRU + TTL eviction. Hit/miss
+# counters are kept per process for the metrics panel.
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from contextlib import closing
+
+import metrics
+from settings import VALIDATION_CACHE_PATH, VALIDATION_CACHE_MAX_ENTRIES, VALIDATION_CACHE_TTL_SECONDS
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(value):
+    return _WHITESPACE.sub(" ", str(value or "")).strip().lower()
+
+
+def make_key(field, user_input, options):
+    payload = [normalize_text(field), normalize_text(user_input), [normalize_text(o) for o in options or []]]
+    return hashlib.sha1(json.dumps(payload, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def match_option(user_input, options):
+    answer = normalize_text(user_input)
+    for option in options or []:
+        if normalize_text(option) == answer:
+            return option
+    return None
+
+
+class ValidationCache:
+    def __init__(self, path=VALIDATION_CACHE_PATH, max_entries=VALIDATION_CACHE_MAX_ENTRIES,
+                 ttl_seconds=VALIDATION_CACHE_TTL_SECONDS):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS verdicts ("
+                "key TEXT PRIMARY KEY, verdict TEXT NOT NULL, created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_verdicts_last_used ON verdicts(last_used)")
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key):
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT verdict, created_at FROM verdicts WHERE key = ?", (key,)).fetchone()
+            if row is not None and now - row[1] > self.ttl_seconds:
+                conn.execute("DELETE FROM verdicts WHERE key = ?", (key,))
+                self.evictions += 1
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            conn.execute("UPDATE verdicts SET last_used = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, key, verdict):
+        now = time.time()
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, verdict, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, verdict, now, now),
+            )
+            conn.execute("DELETE FROM verdicts WHERE created_at < ?", (now - self.ttl_seconds,))
+            size = conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+            overflow = size - self.max_entries
+            if overflow > 0:
+                conn.execute(
+                    "DELETE FROM verdicts WHERE key IN (SELECT key FROM verdicts ORDER BY last_used LIMIT ?)",
+                    (overflow,),
+                )
+                self.evictions += overflow
+
+    def clear(self):
+        with self._lock, closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM verdicts")
+
+    def stats(self):
+        with self._lock, closing(self._connect()) as conn:
+            size = conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": size,
+            "hit_rate": (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+@metrics.register_collector
+def _collect():
+    if _cache is None:
+        return []
+    stats = _cache.stats()
+    return [
+        ("validation_cache_hits", stats["hits"], {}, "counter"),
+        ("validation_cache_misses", stats["misses"], {}, "counter"),
+        ("validation_cache_hit_ratio", stats["hit_rate"], {}, "gauge"),
+        ("validation_cache_entries", stats["size"], {}, "gauge"),
+    ]
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ValidationCache()
+        return _cache